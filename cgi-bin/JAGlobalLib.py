@@ -26,17 +26,123 @@ def UTCDateForFileName():
 def UTCTime():
     return datetime.datetime.utcnow().strftime("%H:%M:%S")
 
+### time stamp formats parsed without datetime.strptime() by JAFastConvertStringTimeToTimeInMicrosec()
+###  format: length of date time string up to seconds
+JAFastTimeStampFormats = {
+    '%Y-%m-%dT%H:%M:%S.%f': 19, '%Y-%m-%d %H:%M:%S.%f': 19, '%Y-%m-%dT%H:%M:%S': 19, '%Y-%m-%d %H:%M:%S': 19,
+    '%d/%b/%Y:%H:%M:%S': 20 }
+JAMonthNumbers = {'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
+    'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12}
+
+### { format: { date time string up to seconds: time in seconds } }, consecutive log lines usually share date time up to seconds
+JATimeInSecondsCache = {}
+### time in micro seconds keyed by (date time string, format) for the formats parsed using datetime.strptime()
+JATimeInMicrosecCache = {}
+### caches are cleared when they reach this size
+JATimeCacheMaxEntries = 4096
+
+def JAConvertSecondsStringToTimeInSec( secondsString, format):
+    """
+    Convert date time string up to seconds in one of JAFastTimeStampFormats to time in seconds
+    Returns None if secondsString does not match the format
+    """
+    try:
+        if len(secondsString) == 19:
+            # 2022-06-05T12:48:00
+            # 0123456789012345678
+            if secondsString[4] != '-' or secondsString[7] != '-' or secondsString[10] != format[8] \
+                or secondsString[13] != ':' or secondsString[16] != ':':
+                return None
+            digits = secondsString[0:4] + secondsString[5:7] + secondsString[8:10] + \
+                secondsString[11:13] + secondsString[14:16] + secondsString[17:19]
+            if digits.isdigit() == False:
+                return None
+            datetime_obj = datetime.datetime( int(digits[0:4]), int(digits[4:6]), int(digits[6:8]),
+                int(digits[8:10]), int(digits[10:12]), int(digits[12:14]))
+        elif len(secondsString) == 20:
+            # 05/Jun/2022:12:48:00
+            # 01234567890123456789
+            if secondsString[2] != '/' or secondsString[6] != '/' or secondsString[11] != ':' \
+                or secondsString[14] != ':' or secondsString[17] != ':':
+                return None
+            digits = secondsString[0:2] + secondsString[7:11] + \
+                secondsString[12:14] + secondsString[15:17] + secondsString[18:20]
+            month = JAMonthNumbers.get(secondsString[3:6])
+            if digits.isdigit() == False or month == None:
+                return None
+            datetime_obj = datetime.datetime( int(digits[2:6]), month, int(digits[0:2]),
+                int(digits[6:8]), int(digits[8:10]), int(digits[10:12]))
+        else:
+            return None
+    except ValueError:
+        return None
+
+    if sys.version_info[0] < 3 or sys.version_info[1] < 4:
+        return time.mktime(datetime_obj.timetuple())
+    else:
+        return datetime_obj.timestamp()
+
+def JAFastConvertStringTimeToTimeInMicrosec( dateTimeString, format):
+    """
+    Convert ISO-8601 time stamp like 2022-06-05T12:48:00.123456 or 2022-06-05 12:48:00
+      and Apache time stamp like 05/Jun/2022:12:48:00 to time in micro seconds without using datetime.strptime()
+    Time in seconds of the date time up to seconds is cached per format
+    Returns None if format is not one of JAFastTimeStampFormats or dateTimeString does not match the format,
+      caller needs to use datetime.strptime() in that case
+    """
+    secondsLength = JAFastTimeStampFormats.get(format)
+    if secondsLength == None:
+        return None
+
+    ### %f accepts 1 to 6 digits, value is padded with 0 on right side to get micro seconds
+    fractionString = dateTimeString[secondsLength:]
+    if format[-3:] == '.%f':
+        if len(fractionString) < 2 or len(fractionString) > 7 or fractionString[0] != '.' or fractionString[1:].isdigit() == False:
+            return None
+        microSeconds = int(fractionString[1:].ljust(6, '0'))
+    elif len(fractionString) > 0:
+        return None
+    else:
+        microSeconds = 0
+
+    secondsString = dateTimeString[:secondsLength]
+    secondsCache = JATimeInSecondsCache.get(format)
+    if secondsCache == None:
+        secondsCache = JATimeInSecondsCache[format] = {}
+    timeInSeconds = secondsCache.get(secondsString)
+    if timeInSeconds == None:
+        timeInSeconds = JAConvertSecondsStringToTimeInSec( secondsString, format)
+        if timeInSeconds == None:
+            return None
+        if len(secondsCache) >= JATimeCacheMaxEntries:
+            secondsCache.clear()
+        secondsCache[secondsString] = timeInSeconds
+
+    return (timeInSeconds + microSeconds / 1000000.0) * 1000000
+
 def JAConvertStringTimeToTimeInMicrosec( dateTimeString, format):
     ### 2022-06-04 add logic to use timezone while converting time to UTC time ???
+    ### use fast path for ISO-8601 and Apache time stamps, strptime() for other formats
+    timeInMicroSeconds = JAFastConvertStringTimeToTimeInMicrosec( dateTimeString, format)
+    if timeInMicroSeconds != None:
+        return timeInMicroSeconds
+
+    cacheKey = (dateTimeString, format)
+    timeInMicroSeconds = JATimeInMicrosecCache.get(cacheKey)
+    if timeInMicroSeconds != None:
+        return timeInMicroSeconds
     try:
         datetime_obj = datetime.datetime.strptime(dateTimeString, format)
         if sys.version_info[0] < 3 or sys.version_info[1] < 4:
             timeInMicroSeconds =  time.mktime(datetime_obj.timetuple()) * 1000000
         else:
             timeInMicroSeconds = datetime_obj.timestamp() * 1000000
-        return timeInMicroSeconds
     except:
-        return 0
+        timeInMicroSeconds = 0
+    if len(JATimeInMicrosecCache) >= JATimeCacheMaxEntries:
+        JATimeInMicrosecCache.clear()
+    JATimeInMicrosecCache[cacheKey] = timeInMicroSeconds
+    return timeInMicroSeconds
 
 
 def JAParseDateTime( dateTimeString ):
@@ -16,6 +16,9 @@ Parameters passed are:
             default - get it from JAGatherLogStats.yml
 -L    processSingleLogFileName - process only this log file, skip the rest
             useful to debug single log file at a time to refine regular expression spec for services
+-B    benchmarkFileName - benchmark, process log files once from the start without posting to web server,
+            report lines/sec, MB/sec, peak RSS and per stage timings and exit
+            when file name is given, keys of log file given by -L are applied to this file, like corpus generated by JATest.py -B
 -D    debugLevel - 0, 1, 2, 3, 4
         default = 0
 
@@ -71,67 +74,75 @@ import time
 import subprocess
 import signal
 import datetime
+import zlib
+import select
+import struct
+import fnmatch
+import math
 
 from JAGlobalLib import LogMsg
 
 # Major 01, minor 31, buildId 03
 JAVersion = "01.31.03"
 
-### number of patterns that can be searched in log line per Service
-indexForPriority = 0
+### pattern kinds, used to identify the pattern matched while processing a log line
 indexForPatternPass = 1
 indexForPatternFail = 2
 indexForPatternCount = 3
 indexForPatternSum = 4
 indexForPatternAverage = 5
 indexForPatternDelta = 6
+indexForPatternHistogram = 8
 ## below patterns comes into play when pattern searched is Pattern Sum/Average/Delta
 indexForVariablePrefix = 7
-indexForVariablePrefixGroup = 8
 indexForPatternLog = 9
 indexForLabel = 10
-indexForLabelGroup = 11
 
-### skip posting stats or skip posting words in log line for below regex groups if dataMaskEnabled is set to True
-indexForSkipGroups = 12
-
-indexForDBDetails = 13
-indexForCSVVariableNames = 14
 # below are used for trace feature
 indexForTimeStamp   = 15
-indexForTimeStampGroup = 16
-
 indexForTraceId = 17
-indexForTraceIdGroup = 18
-
 indexForTraceLabel = 19
-indexForTraceLabelGroup = 20
-
 indexForDuration = 21
-indexForDurationGroup = 22
-
-indexForDurationMultiplier = 23
-indexForTimeStampFormat = 24
 indexForTraceBlockStart = 25
 indexForTraceBlockEnd = 26
-indexForTraceBlockInProgress = 27
 indexForSkip = 28
-indexForTraceSingleLine = 29
-indexForTraceIdPrefix = 30
 indexForTraceBlockContains = 31
-
-# index to indicate processing neeeded for a key in that category
-indexForLogProcessing = 32
-indexForTraceProcessing = 33
-indexForStatsProcessing = 34
-indexForTraceParentId   = 35
 indexForTraceStatus     = 36
-indexForTraceStatusGroup = 37
 indexForTraceBlockStatus  = 38
-indexForDebugLevel = 39
-### keep this one higher than patternIndex values above
-## it is used to initialize list later.
-maxPatternIndex = 40
+
+### actions on group values of trace patterns, see JAServiceSpec.traceGroupActions()
+traceActionTimeStamp = 1
+traceActionTraceId = 2
+traceActionStatus = 3
+traceActionLabel = 4
+traceActionDuration = 5
+traceActionSkip = 6
+
+### pattern specs in regular expression syntax, these are compiled once while reading the config file
+###   log line processing uses the compiled pattern instead of compiling/looking up the pattern for each line
+### key - pattern kind, value - JAServiceSpec attribute holding that pattern
+specForRegexPatterns = {
+    indexForPatternPass: 'patternPass',
+    indexForPatternFail: 'patternFail',
+    indexForPatternCount: 'patternCount',
+    indexForPatternSum: 'patternSum',
+    indexForPatternAverage: 'patternAverage',
+    indexForPatternDelta: 'patternDelta',
+    indexForPatternHistogram: 'patternHistogram',
+    indexForVariablePrefix: 'variablePrefix',
+    indexForPatternLog: 'patternLog',
+    indexForLabel: 'label',
+    indexForTimeStamp: 'timeStamp',
+    indexForTraceId: 'traceId',
+    indexForTraceLabel: 'traceLabel',
+    indexForDuration: 'duration',
+    indexForTraceBlockStart: 'traceBlockStart',
+    indexForTraceBlockEnd: 'traceBlockEnd',
+    indexForSkip: 'skip',
+    indexForTraceBlockContains: 'traceBlockContains',
+    indexForTraceStatus: 'traceStatus',
+    indexForTraceBlockStatus: 'traceBlockStatus'
+}
 
 ### while processing log line, process each line when index match to below list item
 ### this is to speed up the processing
@@ -142,37 +153,39 @@ statsPatternIndexsList = [
     indexForPatternSum,
     indexForPatternAverage,
     indexForPatternDelta,
+    indexForPatternHistogram,
 #    indexForTimeStamp,
-    indexForCSVVariableNames,
     indexForSkip
 ]
-### include any pattern spec associated with stats processing. DO NOT include TimeStamp here.
+### include any spec associated with stats processing. DO NOT include TimeStamp here.
 specForStatsProcessing = [
-    indexForPatternPass,
-    indexForPatternFail,
-    indexForPatternCount,
-    indexForPatternSum,
-    indexForPatternAverage,
-    indexForPatternDelta,
-    indexForCSVVariableNames,
+    'patternPass',
+    'patternFail',
+    'patternCount',
+    'patternSum',
+    'patternAverage',
+    'patternDelta',
+    'patternHistogram',
+    'CSVVariableNames',
+    'CSVColumns',
 ]
 
-### include any pattern spec associated with log processing. DO NOT include TimeStamp here.
+### include any spec associated with log processing. DO NOT include TimeStamp here.
 specForLogProcessing = [
-   indexForPatternLog
+   'patternLog'
 ]
 logPatternIndexsList = [
     indexForPatternLog,
     indexForSkip,
 #    indexForTimeStamp
 ]
-### include any pattern spec associated with trace processing. DO NOT include TimeStamp here.
+### include any spec associated with trace processing. DO NOT include TimeStamp here.
 # trace log line will be parsed if any of these are present for a key definition
 specForTraceProcessing = [
-    indexForTraceId,
-    indexForTraceBlockStart,
-    indexForTraceIdGroup,
-    indexForTraceSingleLine,
+    'traceId',
+    'traceBlockStart',
+    'traceIdGroup',
+    'traceSingleLine',
 ]
 
 ## include any patterns to be matched in trace line
@@ -187,6 +200,651 @@ tracePatternIndexsList = [
     indexForTraceBlockStatus
 ]
 
+### patterns combined into one prefilter per log file name, see JABuildLogFilePrefilter()
+###   a log line is processed further only if it matches to one of these patterns of any key of that log file
+prefilterPatternIndexsList = [
+    indexForPatternPass,
+    indexForPatternFail,
+    indexForPatternCount,
+    indexForPatternSum,
+    indexForPatternAverage,
+    indexForPatternDelta,
+    indexForPatternHistogram,
+    indexForSkip,
+    indexForPatternLog,
+    indexForVariablePrefix,
+    indexForLabel
+]
+
+### spec names of CSV extraction mode, value is column numbers of the fields to be aggregated as that pattern kind
+CSVColumnsSpecNames = {
+    indexForPatternSum: 'CSVSum',
+    indexForPatternAverage: 'CSVAverage',
+    indexForPatternDelta: 'CSVDelta'
+}
+
+### JAServiceStats attribute holding the count per label of lines matched to pass, fail, count pattern
+statsLabelCountAttributes = {
+    indexForPatternPass: 'passLabelCounts',
+    indexForPatternFail: 'failLabelCounts',
+    indexForPatternCount: 'countLabelCounts'
+}
+
+class JAServiceSpec(object):
+    """
+    Spec of one service (key) under LogFile section of config file
+    Attribute is None when that spec is not defined for the service
+
+    After all specs are read, setProcessingStages() prepares
+      statsProcessing, logProcessing, traceProcessing - True if that stage applies to this service
+      statsPatterns, logPatterns, tracePatterns - list of (pattern kind, compiled pattern) in search order,
+         only the patterns defined for this service are present so that log line processing
+         does not need to check every pattern kind for None
+      columnBuffering - True if values of PatternSum, PatternAverage map to fixed variable name per CSV column,
+         matched records are then buffered and aggregated per column, see JAServiceStats.reduceColumnBuffers()
+      traceActions - { pattern kind: { group number: [action1, action2,...]}} for the patterns in tracePatterns
+      traceFilter - tracePatterns combined as one pattern, line not matching it does not match any trace pattern
+      CSVDelimiter, CSVPrefix, CSVColumns - CSV extraction mode, values are taken from the fields of the line
+         instead of regex groups, CSVColumns is list of (pattern kind, [column number1, column number2,...])
+    """
+    __slots__ = (
+        'priority',
+        'patternPass', 'patternFail', 'patternCount', 'patternSum', 'patternAverage', 'patternDelta', 'patternHistogram',
+        'variablePrefix', 'variablePrefixGroup', 'patternLog', 'label', 'labelGroup',
+        'skipGroups', 'DBDetails', 'CSVVariableNames', 'CSVDelimiter', 'CSVPrefix', 'CSVColumns',
+        'timeStamp', 'timeStampGroup', 'timeStampFormat',
+        'traceId', 'traceIdGroup', 'traceLabel', 'traceLabelGroup',
+        'duration', 'durationGroup', 'durationMultiplier',
+        'traceBlockStart', 'traceBlockEnd', 'skip', 'traceSingleLine', 'traceIdPrefix',
+        'traceBlockContains', 'traceParentId', 'traceStatus', 'traceStatusGroup', 'traceBlockStatus',
+        'debugLevel', 'byteMode',
+        'logProcessing', 'traceProcessing', 'statsProcessing',
+        'statsPatterns', 'logPatterns', 'tracePatterns', 'traceActions', 'traceFilter', 'columnBuffering' )
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, None)
+        ## default priority 3, lowest
+        self.priority = 3
+        self.byteMode = False
+
+    def setProcessingStages(self):
+        self.logProcessing = self.traceProcessing = self.statsProcessing = False
+        ### set the LogProcessing needed flag if log processing related spec present for current key
+        for name in specForLogProcessing:
+            if getattr(self, name) != None:
+                self.logProcessing = True
+                break
+
+        ### set TraceProcessing needed flag if trace processing related spec present for current key
+        for name in specForTraceProcessing:
+            if getattr(self, name) != None:
+                self.traceProcessing = True
+                break
+
+        ### set stats processing needed if stats processing related spec present in current key
+        for name in specForStatsProcessing:
+            if getattr(self, name) != None:
+                self.statsProcessing = True
+                break
+
+        self.statsPatterns = self.definedPatterns( statsPatternIndexsList )
+        self.logPatterns = self.definedPatterns( logPatternIndexsList )
+        self.tracePatterns = self.definedPatterns( tracePatternIndexsList )
+        self.traceActions = self.traceGroupActions()
+        self.traceFilter = self.combinedPattern( self.tracePatterns )
+
+        ### variable name of CSV column depends on variable prefix, label and skipped groups of each line otherwise
+        self.columnBuffering = self.CSVVariableNames != None and self.variablePrefix == None and self.label == None and self.skipGroups == None
+
+    def definedPatterns(self, patternIndexsList):
+        tempPatterns = []
+        for index in patternIndexsList:
+            tempPattern = getattr(self, specForRegexPatterns[index])
+            if tempPattern != None:
+                tempPatterns.append( (index, tempPattern) )
+        return tempPatterns
+
+    def combinedPattern(self, patterns):
+        """
+        Returns patterns combined as alternation to find whether line matches any of those in one search,
+          None if there is no pattern or patterns can not be combined reliably
+        """
+        if len(patterns) == 0:
+            return None
+        if len(patterns) == 1:
+            return patterns[0][1]
+        patternStrings = []
+        for index, searchPattern in patterns:
+            if re.search(r'\\[1-9]|\(\?P=|\(\?[aiLmsux]+\)', searchPattern.pattern) != None:
+                return None
+            patternString = searchPattern.pattern
+            if patternString.startswith('.*') or patternString.startswith('(.*)'):
+                ### such pattern matches from the start of line if it matches anywhere in that line,
+                ###   anchored so that it is not tried again at every position of a line not matching it
+                patternString = '^' + patternString
+            patternStrings.append( '(?:{0})'.format(patternString) )
+        try:
+            return re.compile( '|'.join(patternStrings) )
+        except re.error:
+            return None
+
+    def traceGroupActions(self):
+        """
+        Returns actions to be taken on the group values when a trace pattern matches, so that JAProcessLineForTrace()
+          does not need to check the group number against every group spec for every group
+        Actions of a group are in the order those are to be applied to the group value
+        """
+        traceSingleLine = self.traceSingleLine == True
+        traceActions = {}
+        for index, searchPattern in self.tracePatterns:
+            groupActions = traceActions[index] = {}
+            ### group specs apply to the pattern of that kind, or to block start pattern when that pattern is not defined
+            blockStart = index == indexForTraceBlockStart
+            tempActions = []
+            if index == indexForTimeStamp or (self.timeStamp == None and blockStart):
+                tempActions.append( (self.timeStampGroup, traceActionTimeStamp) )
+            if traceSingleLine or index == indexForTraceId or (self.traceId == None and blockStart):
+                tempActions.append( (self.traceIdGroup, traceActionTraceId) )
+            if self.traceStatus != None and (traceSingleLine or index == indexForTraceBlockStatus or (self.traceBlockStatus == None and blockStart)):
+                tempActions.append( (self.traceStatusGroup, traceActionStatus) )
+            if traceSingleLine or index == indexForTraceLabel or (self.traceLabel == None and blockStart):
+                tempActions.append( (self.traceLabelGroup, traceActionLabel) )
+            if traceSingleLine or index == indexForDuration or (self.duration == None and blockStart):
+                tempActions.append( (self.durationGroup, traceActionDuration) )
+            if self.skipGroups != None and (traceSingleLine or index == indexForSkip or (self.skip == None and blockStart)):
+                for skipGroup in self.skipGroups:
+                    if skipGroup.isdigit() and str(int(skipGroup)) == skipGroup:
+                        tempActions.append( (int(skipGroup), traceActionSkip) )
+            for groupNumber, action in tempActions:
+                if groupNumber != None:
+                    groupActions.setdefault(groupNumber, []).append(action)
+        return traceActions
+
+    def __repr__(self):
+        return str( { name: getattr(self, name) for name in self.__slots__ if getattr(self, name) != None } )
+
+### quantiles posted for values matched to PatternHistogram, along with max value
+###   posted as <serviceName>_<variableName>_<postFix>
+histogramQuantiles = ( ('p50', 0.50), ('p90', 0.90), ('p99', 0.99) )
+### quantile returned by JAQuantileSketch is within this fraction of the actual value
+quantileRelativeAccuracy = 0.01
+### max buckets per sign in JAQuantileSketch, lowest buckets are collapsed beyond this to keep the memory bounded
+quantileMaxBuckets = 2048
+quantileGamma = (1 + quantileRelativeAccuracy) / (1 - quantileRelativeAccuracy)
+quantileLogGamma = math.log(quantileGamma)
+
+class JAQuantileSketch(object):
+    """
+    Distribution of values of one variable within a sampling interval, in DDSketch style
+    Values are counted in buckets whose size grows exponentially so that quantile returned
+      is within quantileRelativeAccuracy of the actual value, for any number of values added
+    Sketches of same variable gathered separately can be merged without loss of accuracy
+
+    positiveBuckets, negativeBuckets - { bucketIndex: count }, bucket of value v is ceil(log(|v|) / log(quantileGamma))
+    zeroCount - number of values equal to 0
+    count, minValue, maxValue - number of values added, min and max of those
+    """
+    __slots__ = ('positiveBuckets', 'negativeBuckets', 'zeroCount', 'count', 'minValue', 'maxValue')
+
+    def __init__(self):
+        self.positiveBuckets = {}
+        self.negativeBuckets = {}
+        self.zeroCount = self.count = 0
+        self.minValue = self.maxValue = None
+
+    def add(self, value):
+        if self.count == 0:
+            self.minValue = self.maxValue = value
+        elif value < self.minValue:
+            self.minValue = value
+        elif value > self.maxValue:
+            self.maxValue = value
+        self.count += 1
+
+        if value > 0:
+            buckets = self.positiveBuckets
+        elif value < 0:
+            buckets = self.negativeBuckets
+            value = -value
+        else:
+            self.zeroCount += 1
+            return
+        bucketIndex = int(math.ceil(math.log(value) / quantileLogGamma))
+        buckets[bucketIndex] = buckets.get(bucketIndex, 0) + 1
+        if len(buckets) > quantileMaxBuckets:
+            self.collapse(buckets)
+
+    def collapse(self, buckets):
+        ### merge lowest buckets to next lowest till number of buckets is within the limit
+        bucketIndexes = sorted(buckets.keys())
+        excessBuckets = len(bucketIndexes) - quantileMaxBuckets
+        for bucketIndex in bucketIndexes[:excessBuckets]:
+            buckets[bucketIndexes[excessBuckets]] += buckets.pop(bucketIndex)
+
+    def merge(self, otherSketch):
+        if otherSketch.count == 0:
+            return
+        for buckets, otherBuckets in ( (self.positiveBuckets, otherSketch.positiveBuckets), (self.negativeBuckets, otherSketch.negativeBuckets) ):
+            for bucketIndex, count in otherBuckets.items():
+                buckets[bucketIndex] = buckets.get(bucketIndex, 0) + count
+            if len(buckets) > quantileMaxBuckets:
+                self.collapse(buckets)
+        self.zeroCount += otherSketch.zeroCount
+        if self.count == 0 or otherSketch.minValue < self.minValue:
+            self.minValue = otherSketch.minValue
+        if self.count == 0 or otherSketch.maxValue > self.maxValue:
+            self.maxValue = otherSketch.maxValue
+        self.count += otherSketch.count
+
+    def quantile(self, quantile):
+        """
+        Returns value at given quantile, 0 to 1, None if no value is added
+        """
+        if self.count == 0:
+            return None
+        rank = quantile * (self.count - 1)
+        ### values in ascending order, negative values with larger magnitude first
+        countSoFar = 0
+        for bucketIndex in sorted(self.negativeBuckets.keys(), reverse=True):
+            countSoFar += self.negativeBuckets[bucketIndex]
+            if countSoFar > rank:
+                return max(-2 * quantileGamma ** bucketIndex / (quantileGamma + 1), self.minValue)
+        countSoFar += self.zeroCount
+        if countSoFar > rank:
+            return 0.0
+        for bucketIndex in sorted(self.positiveBuckets.keys()):
+            countSoFar += self.positiveBuckets[bucketIndex]
+            if countSoFar > rank:
+                return min(2 * quantileGamma ** bucketIndex / (quantileGamma + 1), self.maxValue)
+        return self.maxValue
+
+    def __repr__(self):
+        return str( { name: getattr(self, name) for name in self.__slots__ } )
+
+class JAServiceStats(object):
+    """
+    Stats of one service (key) collected within a sampling interval, posted to web server and reset by JAPostAllDataToWebServer()
+
+    passCount, failCount, countCount - number of lines matched to PatternPass, PatternFail, PatternCount
+    passPresent, failPresent, countPresent - True if that pattern is defined, value posted even when it is 0
+    passLabelCounts, failLabelCounts, countLabelCounts - { ':label1:': count1, ':label2:': count2,...}
+       count of lines matched to PatternPass, PatternFail, PatternCount when PatternLabel is defined
+    sumSampleCount, deltaSampleCount - number of lines matched to PatternSum, PatternDelta
+    sumValues, deltaValues, averageValues - { name1: value1, name2: value2,...}
+       numeric values are kept as float, non-numeric values as string
+    averageSampleCounts - { name1: sampleCount1, name2: sampleCount2,...}, sample count of each name in averageValues
+    histogramValues - { name1: JAQuantileSketch, name2: JAQuantileSketch,...}, distribution of values matched to PatternHistogram
+    columnBuffers - { indexForPatternSum: [record1, record2,...], indexForPatternAverage: [...]}, CSV records not yet
+       aggregated to sumValues, averageValues, record is the tuple of group values matched in a line
+    timeStamp - time in seconds of the last log line processed, used to post the data. None to use current time
+    timeStampFormat - format used to convert timeStamp to string while posting the data
+    """
+    __slots__ = (
+        'DBDetails', 'CSVVariableNames', 'timeStamp', 'timeStampFormat',
+        'passCount', 'passPresent', 'failCount', 'failPresent', 'countCount', 'countPresent',
+        'passLabelCounts', 'failLabelCounts', 'countLabelCounts',
+        'sumSampleCount', 'sumValues', 'deltaSampleCount', 'deltaValues',
+        'averageSampleCounts', 'averageValues', 'histogramValues', 'columnBuffers' )
+
+    def __init__(self, serviceSpec):
+        self.DBDetails = serviceSpec.DBDetails
+        self.CSVVariableNames = serviceSpec.CSVVariableNames
+        self.timeStamp = self.timeStampFormat = None
+        self.passPresent = serviceSpec.patternPass != None
+        self.failPresent = serviceSpec.patternFail != None
+        self.countPresent = serviceSpec.patternCount != None
+        self.passCount = self.failCount = self.countCount = 0
+        self.passLabelCounts = {}
+        self.failLabelCounts = {}
+        self.countLabelCounts = {}
+        self.sumSampleCount = self.deltaSampleCount = 0
+        self.sumValues = {}
+        self.deltaValues = {}
+        self.averageSampleCounts = {}
+        self.averageValues = {}
+        self.histogramValues = {}
+        self.columnBuffers = {}
+
+    def addColumnValues(self, index, record):
+        records = self.columnBuffers.get(index)
+        if records == None:
+            records = self.columnBuffers[index] = []
+        records.append(record)
+        if len(records) >= columnBufferMaxRecords:
+            self.reduceColumnBuffers()
+
+    def reduceColumnBuffers(self):
+        """
+        Aggregate buffered CSV records to sumValues, averageValues
+        When all values are numeric, each column is summed in one pass, using NumPy if available.
+        Otherwise, values are aggregated one at a time like JAProcessLogLine(), non-numeric values appended as string
+        """
+        for index, records in self.columnBuffers.items():
+            if len(records) == 0:
+                continue
+            self.columnBuffers[index] = []
+            if index == indexForPatternSum:
+                tempStats = self.sumValues
+                sampleCounts = None
+            else:
+                tempStats = self.averageValues
+                sampleCounts = self.averageSampleCounts
+
+            columnSums = JASumColumns( records )
+            if columnSums != None:
+                columnNames = [ JACSVVariableName( self.CSVVariableNames, groupNumber) for groupNumber in range(1, len(columnSums) + 1) ]
+                for name in columnNames:
+                    if not isinstance( tempStats.get(name, 0.0), float):
+                        ### string value present, append values in line order
+                        columnSums = None
+                        break
+            if columnSums != None:
+                for name, columnSum in zip( columnNames, columnSums):
+                    tempStats[name] = tempStats.get(name, 0.0) + columnSum
+                    if sampleCounts != None:
+                        sampleCounts[name] = sampleCounts.get(name, 0) + len(records)
+                continue
+
+            for record in records:
+                groupNumber = 0
+                for value in record:
+                    groupNumber += 1
+                    name = JACSVVariableName( self.CSVVariableNames, groupNumber)
+                    try:
+                        value = float(value)
+                        valueIsNumber = True
+                    except ValueError:
+                        valueIsNumber = False
+                    previousValue = tempStats.get(name)
+                    if previousValue == None:
+                        tempStats[name] = value
+                    elif valueIsNumber == True and isinstance(previousValue, float):
+                        tempStats[name] = previousValue + value
+                    else:
+                        tempStats[name] = '{0}{1}'.format(previousValue, value)
+                    if sampleCounts != None:
+                        sampleCounts[name] = sampleCounts.get(name, 0) + 1
+
+    def merge(self, otherStats):
+        """
+        Add stats of same service collected in another process (log file worker) to this object
+        Numeric values are added, non-numeric values are appended like values of multiple log lines
+        """
+        self.reduceColumnBuffers()
+        otherStats.reduceColumnBuffers()
+        self.passCount += otherStats.passCount
+        self.failCount += otherStats.failCount
+        self.countCount += otherStats.countCount
+        for labelCounts, otherLabelCounts in (
+                (self.passLabelCounts, otherStats.passLabelCounts),
+                (self.failLabelCounts, otherStats.failLabelCounts),
+                (self.countLabelCounts, otherStats.countLabelCounts)):
+            for label, count in otherLabelCounts.items():
+                labelCounts[label] = labelCounts.get(label, 0) + count
+
+        self.sumSampleCount += otherStats.sumSampleCount
+        self.deltaSampleCount += otherStats.deltaSampleCount
+        for values, otherValues in (
+                (self.sumValues, otherStats.sumValues),
+                (self.deltaValues, otherStats.deltaValues),
+                (self.averageValues, otherStats.averageValues)):
+            for name, value in otherValues.items():
+                prevValue = values.get(name)
+                if prevValue == None:
+                    values[name] = value
+                elif isinstance(prevValue, float) and isinstance(value, float):
+                    values[name] = prevValue + value
+                else:
+                    values[name] = '{0}{1}'.format(prevValue, value)
+        for name, sampleCount in otherStats.averageSampleCounts.items():
+            self.averageSampleCounts[name] = self.averageSampleCounts.get(name, 0) + sampleCount
+        for name, sketch in otherStats.histogramValues.items():
+            if name in self.histogramValues:
+                self.histogramValues[name].merge( sketch )
+            else:
+                self.histogramValues[name] = sketch
+
+        ### post with the time stamp of the latest log line processed
+        if otherStats.timeStamp != None and (self.timeStamp == None or otherStats.timeStamp >= self.timeStamp):
+            self.timeStamp = otherStats.timeStamp
+            self.timeStampFormat = otherStats.timeStampFormat
+
+    def __repr__(self):
+        return str( { name: getattr(self, name) for name in self.__slots__ } )
+
+
+### white space characters in variable name are replaced with '_'
+whiteSpaceChars = re.compile(r'\s')
+
+### max CSV records buffered per pattern of a service before those are aggregated, keeps the memory bounded
+columnBufferMaxRecords = 10000
+
+def JACSVVariableName( CSVVariableNames, groupNumber ):
+    """
+    Returns variable name of given group number, starting from 1, using the names of PatternCSVVariableNames
+    """
+    try:
+        if CSVVariableNames[groupNumber-1] != None:
+            return CSVVariableNames[groupNumber-1]
+        else:
+            return 'GroupNumber{0}'.format(groupNumber-1)
+    except:
+        return 'GroupNumber{0}'.format(groupNumber)
+
+def JASumColumns( records ):
+    """
+    Returns list of sum of each column of records, None if records differ in number of columns or
+      have non-numeric value
+    """
+    numColumns = len(records[0])
+    for record in records:
+        if len(record) != numColumns:
+            return None
+    try:
+        if numpyModulePresent == True:
+            ### values are converted from string and summed in numpy, without python object per value
+            return numpy.array( records, dtype=numpy.float64 ).sum(axis=0).tolist()
+        else:
+            return [ sum( map(float, column) ) for column in zip(*records) ]
+    except ValueError:
+        return None
+
+### log file is read in blocks of this size while tailing the log file
+logFileReadBlockSize = 1024 * 1024
+
+### self metrics of this program, posted as JAAgent series when postAgentStats is True, reset after posting
+###   linesRead, bytesRead - lines and bytes read from log files, including worker and catch up processes
+###   regexEvaluations - prefilter searched in lines read plus patterns of keys searched in lines matching prefilter,
+###     patterns of keys searched are counted in lines sampled by profiler, multiplied by profileSampleInterval
+agentStats = defaultdict(int)
+### key - post destination (stats, logs, traces), value - [post count, total seconds, max seconds] since last post
+agentPostLatency = {}
+### CPU seconds used by this program, including worker and catch up processes, since last post
+agentCPUSecondsUsed = 0
+### key - process id of worker process, value - resident set size of that worker last reported
+agentMemoryRSSWorkers = {}
+
+class JALogFileReader(object):
+    """
+    Reads log file in blocks of logFileReadBlockSize and returns complete lines
+    Byte offset of the next line to be processed is tracked in position so that
+      processing can resume from that line in next round
+    Partial line at the end of a block is kept in partialLine till rest of that line is written to the log file
+    readError is set to True if reading the file failed
+    """
+    __slots__ = ('fileName', 'file', 'position', 'partialLine', 'readError')
+
+    def __init__(self, fileName, position):
+        self.fileName = fileName
+        self.file = open(fileName, "rb")
+        self.file.seek(position)
+        self.position = position
+        self.partialLine = b''
+        self.readError = False
+
+    def readLines(self, decodeLines = True, endPosition = None):
+        """
+        Generator returning lines, with '\n' at the end, till end of file
+        Lines are decoded as utf-8, invalid bytes are replaced instead of raising exception
+        When decodeLines is False, lines are returned as bytes, caller needs to use JADecodeLogLine()
+        When endPosition is given, lines are returned till that byte offset, it needs to be at the start of a line
+        """
+        fileReopened = False
+        readSize = logFileReadBlockSize
+        while True:
+            if endPosition != None:
+                readSize = min(logFileReadBlockSize, endPosition - self.position - len(self.partialLine))
+                if readSize <= 0:
+                    return
+            try:
+                tempBlock = self.file.read(readSize)
+                if not tempBlock:
+                    ### if file has grown from last read and not able to read the file now using previous file pointer,
+                    ###    try closing the file, open the file and read from prev file position
+                    if fileReopened == False and os.path.getsize(self.fileName) > self.position + len(self.partialLine):
+                        if debugLevel > 1:
+                            print('DEBUG-2 JALogFileReader() closing the file and reopening the file:{0}, position:{1}'.format(
+                                self.fileName, self.position))
+                        fileReopened = True
+                        self.file.close()
+                        self.file = open(self.fileName, "rb")
+                        self.file.seek(self.position + len(self.partialLine))
+                        continue
+                    return
+            except OSError as err:
+                errorMsg = 'ERROR - JALogFileReader() error reading logFile:|' + \
+                    self.fileName + '|' + "OS error: {0}".format(err) + '\n'
+                print(errorMsg)
+                LogMsg(errorMsg, statsLogFileName, True)
+                self.readError = True
+                return
+
+            tempBlock = self.partialLine + tempBlock
+            lastNewLine = tempBlock.rfind(b'\n')
+            if lastNewLine < 0:
+                ### no complete line yet
+                self.partialLine = tempBlock
+                continue
+            self.partialLine = tempBlock[lastNewLine+1:]
+            self.position += lastNewLine + 1
+            agentStats['linesRead'] += tempBlock.count(b'\n')
+            agentStats['bytesRead'] += lastNewLine + 1
+
+            ### split on new line only, splitlines() also splits on form feed, NEL, lone carriage return etc
+            if decodeLines == False:
+                for tempLine in tempBlock[:lastNewLine].split(b'\n'):
+                    yield tempLine + b'\n'
+                continue
+
+            tempLines = tempBlock[:lastNewLine+1].decode('utf-8', 'replace')
+            if '\r' in tempLines:
+                tempLines = tempLines.replace('\r\n', '\n')
+            for tempLine in tempLines[:-1].split('\n'):
+                yield tempLine + '\n'
+
+    def seek(self, position):
+        self.file.seek(position)
+        self.position = position
+        self.partialLine = b''
+
+    def seekToEnd(self):
+        self.file.seek(0, 2)
+        self.position = self.file.tell()
+        self.partialLine = b''
+
+    def close(self):
+        self.file.close()
+
+"""
+JADecodeLogLine( logLine )
+Decode log line returned by JALogFileReader in byte mode to string, the same way the reader decodes lines in text mode
+"""
+def JADecodeLogLine( logLine ):
+    tempLine = logLine.decode('utf-8', 'replace')
+    if tempLine.endswith('\r\n'):
+        tempLine = tempLine[:-2] + '\n'
+    return tempLine
+
+class JALogFileWatcher(object):
+    """
+    Watches directories of log files using Linux inotify, accessed via ctypes
+    waitForChange() returns LogFileName specs having a matching file created, modified or moved into the watched directory
+    enabled is False if inotify can not be used (non-Linux OS, wildcard in directory name, inotify call failed),
+      caller needs to sleep instead of waiting for change
+    """
+    __slots__ = ('fd', 'enabled', 'watchedLogFileNames')
+
+    # IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+    watchMask = 0x002 | 0x008 | 0x080 | 0x100
+
+    def __init__(self, logFileNames):
+        self.fd = None
+        self.enabled = False
+        ### { watchDescriptor: [ (logFileName, fileNamePattern), ...] }
+        self.watchedLogFileNames = defaultdict(list)
+        if OSType != 'Linux':
+            return
+        try:
+            import ctypes, ctypes.util
+            libc = ctypes.CDLL( ctypes.util.find_library('c'), use_errno=True)
+            self.fd = libc.inotify_init1( os.O_NONBLOCK )
+            if self.fd < 0:
+                raise OSError( ctypes.get_errno(), os.strerror(ctypes.get_errno()))
+            for logFileName in logFileNames:
+                dirName, fileNamePattern = os.path.split( logFileName )
+                if dirName == '':
+                    dirName = '.'
+                if re.search(r'[\*\?\[]', dirName) != None:
+                    raise OSError( 0, 'wildcard in directory name:|{0}|, can not watch'.format(dirName))
+                fileNamePattern = fileNamePattern.replace('{HOSTNAME}', thisHostName)
+                watchDescriptor = libc.inotify_add_watch( self.fd, dirName.encode(), self.watchMask)
+                if watchDescriptor < 0:
+                    raise OSError( ctypes.get_errno(), os.strerror(ctypes.get_errno()))
+                self.watchedLogFileNames[watchDescriptor].append( (logFileName, fileNamePattern) )
+            self.enabled = True
+
+        except (OSError, AttributeError, ImportError, TypeError) as err:
+            errorMsg = 'INFO - JALogFileWatcher() can not watch log files, error:{0}, log files will be processed once every DataPostIntervalInSec'.format(err)
+            print(errorMsg)
+            LogMsg(errorMsg, statsLogFileName, True)
+            self.close()
+
+    def waitForChange(self, timeoutInSec):
+        """
+        Wait up to timeoutInSec for change in watched directories
+        Returns set of LogFileName specs with change, empty set if timed out
+        """
+        changedLogFileNames = set()
+        try:
+            readyList = select.select( [self.fd], [], [], timeoutInSec)[0]
+            if len(readyList) == 0:
+                return changedLogFileNames
+            tempEvents = os.read( self.fd, 65536)
+        except (OSError, select.error):
+            ### interrupted by signal or no event to read
+            return changedLogFileNames
+
+        ### struct inotify_event { int wd; uint32_t mask; uint32_t cookie; uint32_t len; char name[len]; }
+        tempOffset = 0
+        while tempOffset + 16 <= len(tempEvents):
+            watchDescriptor, mask, cookie, nameLength = struct.unpack_from( 'iIII', tempEvents, tempOffset)
+            tempFileName = tempEvents[tempOffset+16:tempOffset+16+nameLength].split(b'\0', 1)[0].decode('utf-8', 'replace')
+            tempOffset += 16 + nameLength
+            for logFileName, fileNamePattern in self.watchedLogFileNames.get( watchDescriptor, []):
+                if fnmatch.fnmatch( tempFileName, fileNamePattern):
+                    changedLogFileNames.add( logFileName )
+        return changedLogFileNames
+
+    def close(self):
+        if self.fd != None and self.fd >= 0:
+            os.close(self.fd)
+        self.fd = None
+        self.enabled = False
+
+### characters removed from trace id before posting trace id
+traceIdCharsToRemove = re.compile(r'-|_|[g-zG-Z]')
+
 ### index used while processing Execute command spec
 indexForCommand = 0
 indexForIntervalInSec = 1
@@ -254,6 +912,9 @@ disableWarnings = None
 verifyCertificate = None
 cacheLogFileName = None
 processSingleLogFileName = None
+### set to True by -B, log files are processed once for benchmark, see JARunBenchmark()
+benchmarkMode = False
+benchmarkFileName = None
 saveLogsOnWebServer = None
 ### retry disabled by default
 retryDurationInHours = None
@@ -280,6 +941,20 @@ DBDetails['DBType'] = "Prometheus"
 ###  when log lines exceed this count, from 11th line till last line withing the sampling interval,
 ###    lines will be counted and reported as "..... XXX more lines...."
 maxLogLines = None
+### max bytes of log lines collected per service, per sampling interval, lines are not collected beyond this size
+maxLogBytes = None
+### when True, similar log lines (differing only in numbers, hex values, IP addresses) are posted once
+###   with count of similar lines seen within the sampling interval
+logLineDedup = None
+
+### when non-zero, every Nth log line is profiled, time taken by each pattern of each key is recorded
+###   and written to profile file every DataPostIntervalInSec
+profileSampleInterval = None
+### when True, estimated time taken by each key per sampling interval is posted as JAProfile series
+profilePostStats = None
+
+### when True, throughput and health of this program is posted as JAAgent series every sampling interval
+postAgentStats = None
 
 ### by default, mask data in log lines while posting to web server
 dataMaskEnabled = None
@@ -293,6 +968,37 @@ maxTraceLines = None
 ###   loki can identify trace id in timestamp line and link to trace record.
 traceIdPrefix = None
 
+### run till terminated instead of exiting after DataCollectDurationInSec
+daemonMode = None
+
+### process log files as they change, using inotify on Linux, instead of processing all log files once every DataPostIntervalInSec
+watchLogFiles = None
+### while watching log files, changes within this interval are processed together
+watchIntervalInSec = None
+
+### number of worker processes to process log files in parallel, log files are assigned to workers in round robin way
+###   0 or 1 to process all log files in this process
+maxWorkerProcesses = None
+
+### when backlog of a log file to process exceeds this size, like after downtime, backlog is split into shards
+###   and processed in parallel by catchUpProcesses processes. Stats are bucketed per DataPostIntervalInSec using line timestamps
+###   0 to process backlog in this process
+catchUpThresholdInMB = None
+catchUpProcesses = None
+
+### trace block in progress is discarded when it has more than maxTraceBlockLines lines or maxTraceBlockBytes bytes,
+###   or when block end is not seen within traceBlockTimeoutInSec. This is to bound the memory used when block end is missed
+maxTraceBlockLines = None
+maxTraceBlockBytes = None
+traceBlockTimeoutInSec = None
+
+### when True, stats are gathered in windows of DataPostIntervalInSec using the timestamp of log lines
+###   and each window is posted with its own timestamp after it is closed.
+### window is closed when log lines with timestamp maxLatenessInSec after window end are seen
+###   or when window is open for DataPostIntervalInSec plus maxLatenessInSec
+intervalBucketing = None
+maxLatenessInSec = None
+
 ### global timestamp format specification. if individual key does not have the spec, global definition will be used
 timeStampFormat = None
 timeStampGroup = None
@@ -307,12 +1013,68 @@ maxCPUUsageForEvents = [0, 0, 0, 0]
 maxCPUUsageLevels = logEventPriorityLevel = 4
 
 
-# current average CPU usage - average over last 10 samples at dataPostIntervalInSec interval
+# current CPU usage of the host - average since previous sample, sampled every dataPostIntervalInSec
 averageCPUUsage = 0
 
+### CPU governor, keys with priority above allowedPriorityLevel are deferred
+###   log files with all keys deferred are not read, lines are processed in later round from the saved position
+allowedPriorityLevel = maxCPUUsageLevels - 1
+### CPU seconds this program (including worker processes) can use per dataPostIntervalInSec, 0 to disable budget
+maxCPUSecondsPerInterval = None
+### CPU seconds available for next interval, refilled by maxCPUSecondsPerInterval every interval up to maxCPUSecondsPerInterval
+###   goes negative when more CPU is used than the budget, keys are deferred till the excess is paid back
+cpuSecondsAvailable = 0
+### share of budget to be available to process keys of priority 1, 2, 3
+cpuBudgetShareForPriority = [0, 0, 0.25, 0.5]
+### previous sample of /proc/stat - [idle time, total time], None till first sample is taken
+hostCPUTimesPrev = None
+### CPU seconds used by this program at previous sample, CPU seconds reported by worker processes
+agentCPUSecondsPrev = 0
+agentCPUSecondsWorkers = 0
+### in worker process, CPU seconds reported to parent process so far
+workerCPUSecondsReported = 0
+### key - log file name spec, value - start time of the round when the log file was deferred first
+logFileDeferredSince = {}
+
+### byte ranges of log files skipped when processing time exceeds MaxProcessingTimeForAllEvents or keys are deferred
+###   by CPU governor, lines of these ranges are processed later when all keys are allowed and processing time permits
+### key1 - log file name spec, key2 - file name, value - list of [startPosition, endPosition, processedPriorityLevel, fileId]
+###   keys with priority up to processedPriorityLevel are processed already for lines of the range, 0 if none processed
+###   fileId is [device, inode] of the file, range is discarded if the file name refers to another file later
+### pending ranges are saved in cache file by JAWriteFileInfo() so that these are processed after restart
+logFilePendingRanges = defaultdict(dict)
+### in parent process, pending ranges of log files processed by worker processes, as reported in last reply of worker
+logFilePendingRangesWorkers = {}
+### set in the process catching up pending range, keys with priority up to this level are not processed again
+processedPriorityLevel = 0
+### pending bytes reported by worker processes, pending bytes posted last time
+logPendingBytesWorkers = 0
+logPendingBytesPosted = 0
+
 # contains current stats
-# key1 - serviceName
-logStats = defaultdict(dict)
+# key1 - serviceName, value - JAServiceStats
+logStats = {}
+
+# contains stats of previous intervals gathered while catching up with backlog of log files
+#   or windows closed when stats are bucketed using line timestamp, posted with timestamp of that interval
+# key1 - interval start time in seconds, key2 - serviceName, value - JAServiceStats
+logStatsBackfill = {}
+
+# when intervalBucketing is True, contains stats of windows still open to add stats of log lines
+# key1 - window start time in seconds, key2 - serviceName, value - JAServiceStats
+logStatsWindows = {}
+# key - window start time, value - time in seconds when the window is opened
+logStatsWindowOpenTime = {}
+# key - logFileName, value - start time of the window where stats of current lines of that log file are gathered
+logStatsCurrentWindow = {}
+# service names whose stats are gathered in windows, these are posted when window is closed
+logStatsWindowKeys = set()
+# latest timestamp seen in log lines, window is closed when this exceeds window end time plus maxLatenessInSec
+logStatsWatermark = 0
+# start time of last window closed, lines of this window or earlier window are counted in next window
+lastClosedWindowStartTime = 0
+# number of lines counted in next window since their window was closed
+lateLineCount = 0
 
 # contains log lines to be sent to web server
 # key1 = serviceName (similar to key1 of logStats)
@@ -347,6 +1109,8 @@ parser.add_argument(
 parser.add_argument("-l", help="log file name, including path name")
 parser.add_argument(
     "-L", help="process single log file name, including path name, skip rest")
+parser.add_argument(
+    "-B", nargs='?', const='', help="benchmark, process log files once and report throughput, optional file name to apply keys of log file given by -L")
 
 args = parser.parse_args()
 if args.D:
@@ -384,6 +1148,14 @@ if args.l:
 if args.L:
     processSingleLogFileName = args.L
 
+if args.B != None:
+    benchmarkMode = True
+    if args.B != '':
+        if processSingleLogFileName == None:
+            print('ERROR -B {0} needs log file name given by -L, keys of that log file are applied to {0}'.format(args.B))
+            sys.exit()
+        benchmarkFileName = args.B
+
 if debugLevel > 0:
     print('DEBUG-1 Parameters passed configFile: {0}, WebServerURL: {1}, dataPostIntervalInSec: {2}, dataCollectDurationInSec: {3}, debugLevel: {4}, componentName: {5}, platformName: {6}, siteName: {7}, environment: {8}, processSingleLogFileName: {9}\n'.format(
         configFile, webServerURL, dataPostIntervalInSec, dataCollectDurationInSec, debugLevel, componentName, platformName, siteName, environment, processSingleLogFileName))
@@ -394,14 +1166,27 @@ def JASignalHandler(sig, frame):
 
 signal.signal(signal.SIGINT, JASignalHandler)
 
+### set upon SIGHUP, config file is reloaded after current round of log file processing
+reloadConfigRequested = False
+
+def JAReloadSignalHandler(sig, frame):
+    global reloadConfigRequested
+    reloadConfigRequested = True
+
+if hasattr(signal, 'SIGHUP'):
+    signal.signal(signal.SIGHUP, JAReloadSignalHandler)
 
-def JAStatsExit(reason):
+
+def JAStatsExit(reason, resetPrevStartTime=True):
     print(reason)
     JAStatsDurationInSec = statsEndTimeInSec - statsStartTimeInSec
     LogMsg('{0} processing duration: {1} sec\n'.format(
         reason, JAStatsDurationInSec), statsLogFileName, True)
     ### write prev start time of 0 so that next time process will run
-    JAGlobalLib.JAWriteTimeStamp("JAGatherLogStats.PrevStartTime", 0)
+    ###   not done when exiting because another instance is running, in DaemonMode, that instance
+    ###   refreshes the time stamp once per interval and next instance started by cron needs to see it
+    if resetPrevStartTime == True:
+        JAGlobalLib.JAWriteTimeStamp("JAGatherLogStats.PrevStartTime", 0)
     sys.exit()
 
 
@@ -456,9 +1241,12 @@ def JAGatherEnvironmentSpecs(key, values):
 
     # declare global variables
     global dataPostIntervalInSec, dataCollectDurationInSec, maxCPUUsageForEvents, maxProcessingTimeForAllEvents
-    global webServerURL, disableWarnings, verifyCertificate, debugLevel, maxLogLines, saveLogsOnWebServer
-    global DBDetails, retryDurationInHours, retryLogStatsBatchSize, maxTraceLines, dataMaskEnabled
+    global webServerURL, disableWarnings, verifyCertificate, debugLevel, maxLogLines, maxLogBytes, saveLogsOnWebServer
+    global logLineDedup, DBDetails, retryDurationInHours, retryLogStatsBatchSize, maxTraceLines, dataMaskEnabled
+    global maxCPUSecondsPerInterval, profileSampleInterval, profilePostStats, postAgentStats
     global timeStampFormat, timeStampGroup, traceIdPrefix, traceId, traceParentId, patternTimeStamp
+    global watchLogFiles, watchIntervalInSec, daemonMode, maxWorkerProcesses, catchUpThresholdInMB, catchUpProcesses
+    global intervalBucketing, maxLatenessInSec, maxTraceBlockLines, maxTraceBlockBytes, traceBlockTimeoutInSec
 
     for myKey, myValue in values.items():
         if debugLevel > 1:
@@ -499,6 +1287,11 @@ def JAGatherEnvironmentSpecs(key, values):
                 if myValue != None:
                     maxCPUUsageForEvents[3] = int(myValue)
 
+        elif myKey == 'MaxCPUSecondsPerInterval':
+            if maxCPUSecondsPerInterval == None:
+                if myValue != None:
+                    maxCPUSecondsPerInterval = float(myValue)
+
         elif myKey == 'DebugLevel':
             if debugLevel == 0:
                 if myValue != None:
@@ -508,6 +1301,35 @@ def JAGatherEnvironmentSpecs(key, values):
             if maxLogLines == 0 or maxLogLines == None :
                 if myValue != None:
                     maxLogLines = int(myValue)
+        elif myKey == 'MaxLogBytes':
+            if maxLogBytes == None:
+                if myValue != None:
+                    maxLogBytes = int(myValue)
+        elif myKey == 'ProfileSampleInterval':
+            if profileSampleInterval == None:
+                if myValue != None:
+                    profileSampleInterval = int(myValue)
+        elif myKey == 'ProfilePostStats':
+            if profilePostStats == None:
+                if myValue != None:
+                    if myValue == 'False' or myValue == False:
+                        profilePostStats = False
+                    if myValue == 'True' or myValue == True:
+                        profilePostStats = True
+        elif myKey == 'PostAgentStats':
+            if postAgentStats == None:
+                if myValue != None:
+                    if myValue == 'False' or myValue == False:
+                        postAgentStats = False
+                    if myValue == 'True' or myValue == True:
+                        postAgentStats = True
+        elif myKey == 'LogLineDedup':
+            if logLineDedup == None:
+                if myValue != None:
+                    if myValue == 'False' or myValue == False:
+                        logLineDedup = False
+                    if myValue == 'True' or myValue == True:
+                        logLineDedup = True
         elif myKey == 'maxTraceLines':
             if maxTraceLines == 0 or maxTraceLines == None:
                 if myValue != None:
@@ -520,6 +1342,70 @@ def JAGatherEnvironmentSpecs(key, values):
                     if myValue == 'True' or myValue == True:
                         dataMaskEnabled = True
 
+        elif myKey == 'DaemonMode':
+            if daemonMode == None:
+                if myValue != None:
+                    if myValue == 'False' or myValue == False:
+                        daemonMode = False
+                    if myValue == 'True' or myValue == True:
+                        daemonMode = True
+
+        elif myKey == 'WatchLogFiles':
+            if watchLogFiles == None:
+                if myValue != None:
+                    if myValue == 'False' or myValue == False:
+                        watchLogFiles = False
+                    if myValue == 'True' or myValue == True:
+                        watchLogFiles = True
+
+        elif myKey == 'WatchIntervalInSec':
+            if watchIntervalInSec == None:
+                if myValue != None:
+                    watchIntervalInSec = float(myValue)
+
+        elif myKey == 'MaxWorkerProcesses':
+            if maxWorkerProcesses == None:
+                if myValue != None:
+                    maxWorkerProcesses = int(myValue)
+
+        elif myKey == 'CatchUpThresholdInMB':
+            if catchUpThresholdInMB == None:
+                if myValue != None:
+                    catchUpThresholdInMB = float(myValue)
+
+        elif myKey == 'CatchUpProcesses':
+            if catchUpProcesses == None:
+                if myValue != None:
+                    catchUpProcesses = int(myValue)
+
+        elif myKey == 'IntervalBucketing':
+            if intervalBucketing == None:
+                if myValue != None:
+                    if myValue == 'False' or myValue == False:
+                        intervalBucketing = False
+                    if myValue == 'True' or myValue == True:
+                        intervalBucketing = True
+
+        elif myKey == 'MaxLatenessInSec':
+            if maxLatenessInSec == None:
+                if myValue != None:
+                    maxLatenessInSec = float(myValue)
+
+        elif myKey == 'MaxTraceBlockLines':
+            if maxTraceBlockLines == None:
+                if myValue != None:
+                    maxTraceBlockLines = int(myValue)
+
+        elif myKey == 'MaxTraceBlockBytes':
+            if maxTraceBlockBytes == None:
+                if myValue != None:
+                    maxTraceBlockBytes = int(myValue)
+
+        elif myKey == 'TraceBlockTimeoutInSec':
+            if traceBlockTimeoutInSec == None:
+                if myValue != None:
+                    traceBlockTimeoutInSec = float(myValue)
+
         elif myKey == 'RetryDurationInHours':
             if retryDurationInHours == None:
                 if myValue != None:
@@ -616,6 +1502,101 @@ def JAGatherEnvironmentSpecs(key, values):
         print('DEBUG-1 Parameters after reading configFile: {0}, WebServerURL: {1},  DataPostIntervalInSec: {2}, DataCollectDurationInSec: {3}, maxCPUUsageForEvents: {4}, maxProcessingTimeForAllEvents: {5}, DebugLevel: {6}'.format(
             configFile, webServerURL, dataPostIntervalInSec, dataCollectDurationInSec, maxCPUUsageForEvents, maxProcessingTimeForAllEvents, debugLevel))
 
+"""
+JACompilePattern( key, patternString )
+Compile the pattern spec of a service once while reading the config file
+If pattern is invalid, error is logged and None is returned so that the pattern is not searched in log lines
+
+Parameters passed
+  key - service name, used in error message
+  patternString - pattern in regular expression syntax
+
+Return value
+  compiled pattern or None
+"""
+def JACompilePattern( key, patternString ):
+    try:
+        return re.compile( patternString )
+    except re.error as err:
+        errorMsg = "ERROR invalid pattern:|{0}|, key:|{1}|, regular expression error:|{2}|, SKIPed this pattern".format(patternString, key, err)
+        print(errorMsg)
+        LogMsg(errorMsg, statsLogFileName, True)
+        return None
+
+"""
+JABuildLogFilePrefilter( logFileName, keySpecs )
+Prepare one combined pattern per log file name from the patterns of all keys sharing that log file
+Log line that does not match this combined pattern can not match any of the per key patterns,
+  per key processing is skipped for such line
+
+Patterns of stats, log, variable prefix and label are combined as alternation, each pattern wrapped in non-capturing group.
+CSVPrefix of the keys using CSV extraction mode is combined as literal text.
+Prefilter is not used (None returned) when
+  - any key of this log file has trace processing spec, trace block processing needs to see every line
+  - any key of this log file uses CSV extraction mode without CSVPrefix
+  - any pattern has back reference or inline flags, these can not be combined reliably
+  - combined pattern fails to compile
+
+If any key of this log file has ByteMode set, combined pattern is compiled as bytes pattern so that
+  log lines can be searched without decoding. Byte mode is not used if any pattern has non-ASCII character.
+  Note that \w, \d, \s match ASCII characters only in byte mode.
+
+Parameters passed
+  logFileName - log file name, used in debug message
+  keySpecs - JAStatsSpec[logFileName]
+
+Return value
+  compiled combined pattern or None, True if combined pattern is compiled as bytes pattern
+    byte mode is returned explicitly, on python 2, bytes is str and can not be found from the pattern type
+"""
+def JABuildLogFilePrefilter( logFileName, keySpecs ):
+    patternStrings = {}
+    byteMode = False
+    for key, values in keySpecs.items():
+        if values.traceProcessing == True:
+            return None, False
+        if values.byteMode == True:
+            byteMode = True
+        if values.CSVColumns != None:
+            if values.CSVPrefix == None:
+                ### every line needs to be split to find the CSV values
+                return None, False
+            patternStrings[re.escape(values.CSVPrefix)] = True
+        for index in prefilterPatternIndexsList:
+            tempPattern = getattr(values, specForRegexPatterns[index])
+            if tempPattern == None:
+                continue
+            patternString = tempPattern.pattern
+            if re.search(r'\\[1-9]|\(\?P=|\(\?[aiLmsux]+\)', patternString) != None:
+                if debugLevel > 1:
+                    print("DEBUG-2 JABuildLogFilePrefilter() logFileName:{0}, key:{1}, pattern:{2} can not be combined, prefilter not used".format(
+                        logFileName, key, patternString))
+                return None, False
+            patternStrings[patternString] = True
+
+    if len(patternStrings) == 0:
+        return None, False
+
+    combinedPatternString = '|'.join( '(?:{0})'.format(patternString) for patternString in patternStrings )
+    if byteMode == True:
+        try:
+            combinedPatternString = combinedPatternString.encode('ascii')
+        except UnicodeEncodeError:
+            errorMsg = "INFO - JABuildLogFilePrefilter() logFileName:{0}, pattern has non-ASCII character, ByteMode not used".format(logFileName)
+            print(errorMsg)
+            LogMsg(errorMsg, statsLogFileName, True)
+            byteMode = False
+    try:
+        combinedPattern = re.compile( combinedPatternString )
+    except re.error as err:
+        if debugLevel > 1:
+            print("DEBUG-2 JABuildLogFilePrefilter() logFileName:{0}, combined pattern error:{1}, prefilter not used".format(logFileName, err))
+        return None, False
+
+    if debugLevel > 1:
+        print("DEBUG-2 JABuildLogFilePrefilter() logFileName:{0}, prefilter:{1}".format(logFileName, combinedPatternString))
+    return combinedPattern, byteMode
+
 
 # check whether yaml module is present
 yamlModulePresent = False
@@ -639,15 +1620,33 @@ try:
                 psutilModulePresent = False
         except ImportError:
             psutilModulePresent = False
+
+        try:
+            if util.find_spec("numpy") != None:
+                numpyModulePresent = True
+            else:
+                numpyModulePresent = False
+        except ImportError:
+            numpyModulePresent = False
     else:
         yamlModulePresent = False
         psutilModulePresent = False
+        numpyModulePresent = False
 except:
     yamlModulePresent = False
     psutilModulePresent = False
+    numpyModulePresent = False
 
-# read default parameters and OS Stats collection spec
-try:
+### numpy is used to aggregate values of CSV records, pure python is used when it is not present
+if numpyModulePresent == True:
+    import numpy
+
+"""
+JAReadConfigFile()
+Read config file using yaml module if present, else using limited yaml reader
+Returns content of config file in dictionary form
+"""
+def JAReadConfigFile():
     with open(configFile, "r") as file:
         # uncomment below to test local parsing of yaml file where pythin 3 is not present
         # yamlModulePresent = False
@@ -656,521 +1655,466 @@ try:
         if yamlModulePresent == True:
             try:
                 import yaml
-                JAStats = yaml.load(file, Loader=yaml.FullLoader)
+                tempStats = yaml.load(file, Loader=yaml.FullLoader)
                 file.close()
             except:
-                JAStats = JAGlobalLib.JAYamlLoad(configFile)
+                tempStats = JAGlobalLib.JAYamlLoad(configFile)
         else:
-            JAStats = JAGlobalLib.JAYamlLoad(configFile)
-
-        if debugLevel > 1:
-            print(
-                'DEBUG-2 Content of config file: {0}, read to JAStats: {1}'.format(configFile, JAStats))
-
-        if statsLogFileName == None:
-            if JAStats['GatherLogStatsLogFile'] != None:
-                statsLogFileName = JAStats['GatherLogStatsLogFile']
-            else:
-                statsLogFileName = 'JAGatherLogStats.log'
+            tempStats = JAGlobalLib.JAYamlLoad(configFile)
 
-        if cacheLogFileName == None:
-            if JAStats['GatherLogStatsCacheFile'] != None:
-                cacheLogFileName = JAStats['GatherLogStatsCacheFile']
-            else:
-                cacheLogFileName = 'JAGatherLogStats.cache'
-
-        for key, value in JAStats['Environment'].items():
-            if key == 'All':
-                # if parameters are not yet defined, read the values from this section
-                # values in this section work as default if params are defined for
-                # specific environment
-                JAGatherEnvironmentSpecs(key, value)
+    if debugLevel > 1:
+        print(
+            'DEBUG-2 Content of config file: {0}, read to JAStats: {1}'.format(configFile, tempStats))
+    return tempStats
 
-            if value.get('HostName') != None:
-                if re.match(value['HostName'], thisHostName):
-                    # current hostname match the hostname specified for this environment
-                    # read all parameters defined for this environment
-                    JAGatherEnvironmentSpecs(key, value)
-                    myEnvironment = key
-
-        # if conig file does not have values for below, assign default values
-        if dataPostIntervalInSec == 0:
-            # 60 seconds
-            dataPostIntervalInSec = 60
-        if maxProcessingTimeForAllEvents == 0:
-           maxProcessingTimeForAllEvents = dataPostIntervalInSec / 2 
-        if dataCollectDurationInSec == 0:
-            # close to one hour
-            dataCollectDurationInSec = 3540
-        if disableWarnings == None:
-            disableWarnings = True
-        if verifyCertificate == None:
-            verifyCertificate = False
-        if maxCPUUsageForEvents[0] == 0:
-            # SKIP processing log files when CPU usage exceeds 80%
-            maxCPUUsageForEvents[0] = 80
-        if maxCPUUsageForEvents[1] == 0:
-            # SKIP processing priority 1 events of log files when CPU usage exceeds 70%
-            maxCPUUsageForEvents[1] = 70
-        if maxCPUUsageForEvents[2] == 0:
-            # SKIP processing priority 2 events of log files when CPU usage exceeds 60%
-            maxCPUUsageForEvents[2] = 60
-        if maxCPUUsageForEvents[3] == 0:
-            # SKIP processing priority 3 events of log files when CPU usage exceeds 50%
-            maxCPUUsageForEvents[3] = 50
-        if maxLogLines == None:
-            maxLogLines = 10
-        if maxTraceLines == None:
-            maxTraceLines = 100
+"""
+JAGatherLogFileSpecs( logFileSpecs )
+Parse the spec of each key in LogFile section of config file, patterns are compiled
+Returns spec of keys per log file name, { logFileName: { key: JAServiceSpec } }
+"""
+def JAGatherLogFileSpecs( logFileSpecs ):
+    tempStatsSpec = defaultdict(dict)
+
+    # read spec for each log file
+    # LogFile:
+    # Name: <fileName>
+    # Service:
+    ###         Name: name
+    # PatternPass: string containing regular expression
+    # PatternFail: string containing regular expression
+    # PatternCount: string containing regular expression
+    # PatternSum: leading text key1 dummy value1 dummy key2 dummy value2 dummy....
+    # PatternAverage: leading text key1 dummy value1 dummy key2 dummy value2 dummy....
+    # PatternVariablePrefix: text variable text
+    for key, value in logFileSpecs.items():
         
-        if statsLogFileName == None:
-            statsLogFileName = "JAGatherLogStats.log"
-        if cacheLogFileName == None:
-            cacheLogFileName = "JAGatherLogStats.cache"
-
-        if traceParentId == None:
-            ### use self-id as parent id
-            traceParentId =  traceId
-
-        dateTimeFormatType = None
-        # read spec for each log file
-        # LogFile:
-        # Name: <fileName>
-        # Service:
-        ###         Name: name
-        # PatternPass: string containing regular expression
-        # PatternFail: string containing regular expression
-        # PatternCount: string containing regular expression
-        # PatternSum: leading text key1 dummy value1 dummy key2 dummy value2 dummy....
-        # PatternAverage: leading text key1 dummy value1 dummy key2 dummy value2 dummy....
-        # PatternVariablePrefix: text variable text
-        for key, value in JAStats['LogFile'].items():
-            
-            tempPatternList = [ None] * (maxPatternIndex)
-            tempPatternPresent = [False] * (maxPatternIndex)
-            
-            ## default priority 3, lowest
-            tempPatternList[indexForPriority] = 3
-            tempPatternPresent[indexForPriority] = True
+        ### default priority 3, lowest, is set while creating the spec
+        tempSpec = JAServiceSpec()
 
-            if value.get('LogFileName') != None:
-                logFileName = str(value.get('LogFileName')).strip()
+        if value.get('LogFileName') != None:
+            logFileName = str(value.get('LogFileName')).strip()
 
-            if processSingleLogFileName != None:
-                # need to process single log file, skip rest
-                if logFileName != processSingleLogFileName:
-                    continue
-
-            if value.get('PatternPass') != None:
-                tempPatternList[indexForPatternPass] = str(value.get('PatternPass')).strip()
-                tempPatternPresent[indexForPatternPass] = True
+        if processSingleLogFileName != None:
+            # need to process single log file, skip rest
+            if logFileName != processSingleLogFileName:
+                continue
+            ### in benchmark mode, keys of this log file are applied to benchmark file
+            if benchmarkFileName != None:
+                logFileName = benchmarkFileName
 
-            if value.get('PatternFail') != None:
-                tempPatternList[indexForPatternFail] = str(value.get('PatternFail')).strip()
-                tempPatternPresent[indexForPatternFail] = True
-                
-            if value.get('PatternCount') != None:
-                tempPatternList[indexForPatternCount] = str(value.get('PatternCount')).strip()
-                tempPatternPresent[indexForPatternCount] = True
+        if value.get('PatternPass') != None:
+            tempSpec.patternPass = str(value.get('PatternPass')).strip()
 
-            if value.get('PatternSum') != None:
-                tempPatternList[indexForPatternSum] = str(value.get('PatternSum')).strip()
-                tempPatternPresent[indexForPatternSum] = True
+        if value.get('PatternFail') != None:
+            tempSpec.patternFail = str(value.get('PatternFail')).strip()
+            
+        if value.get('PatternCount') != None:
+            tempSpec.patternCount = str(value.get('PatternCount')).strip()
+
+        if value.get('PatternSum') != None:
+            tempSpec.patternSum = str(value.get('PatternSum')).strip()
+
+        if value.get('PatternAverage') != None:
+            tempSpec.patternAverage = str(value.get('PatternAverage')).strip()
+
+        if value.get('PatternDelta') != None:
+            tempSpec.patternDelta = str(value.get('PatternDelta')).strip()
+
+        if value.get('PatternHistogram') != None:
+            tempSpec.patternHistogram = str(value.get('PatternHistogram')).strip()
+
+        if value.get('Priority') != None:
+            tempSpec.priority = int(value.get('Priority'))
+
+        if value.get('PatternLog') != None:
+            tempSpec.patternLog = str(value.get('PatternLog')).strip()
+
+        if value.get('PatternVariablePrefix') != None:
+            tempSpec.variablePrefix = str(value.get('PatternVariablePrefix')).strip()
+
+        if value.get('VariablePrefixGroup') != None:
+            tempSpec.variablePrefixGroup = int(str(value.get('VariablePrefixGroup')).strip())
+        ## remove below three lines once all spec is using variablePrefixGroup name
+        if value.get('PatternVariablePrefixGroup') != None:
+            tempSpec.variablePrefixGroup = int(str(value.get('PatternVariablePrefixGroup')).strip())
+
+        if value.get('PatternLabel') != None:
+            tempSpec.label = str(value.get('PatternLabel')).strip()
+
+        if value.get('LabelGroup') != None:
+            tempSpec.labelGroup = int(str(value.get('LabelGroup')).strip())
+        ## remove below three lines once all spec is using LabelGroup name
+        if value.get('PatternLabelGroup') != None:
+            tempSpec.labelGroup = int(str(value.get('PatternLabelGroup')).strip())
+
+        if value.get('PatternSkip') != None:
+            tempSpec.skip = str(value.get('PatternSkip')).strip()
+
+        if value.get('SkipGroups') != None:
+            ## DO NOT post values of these regex groups
+            tempCSVString = str(value.get('SkipGroups')).strip()
+            tempSpec.skipGroups = list(tempCSVString.split(","))
+        ## remove below lines once all spec is using LabelGroup name
+        if value.get('PatternSkipGroups') != None:
+            ## DO NOT post values of these regex groups
+            tempCSVString = str(value.get('PatternSkipGroups')).strip()
+            tempSpec.skipGroups = list(tempCSVString.split(","))
+
+        if value.get('PatternCSVVariableNames') != None:
+            ## the value is in CSV format, with one or more values
+            tempCSVString = str(value.get('PatternCSVVariableNames')).strip()
+            tempSpec.CSVVariableNames = list(tempCSVString.split(","))
+
+        ### CSV extraction mode, fields of the line are split by CSVDelimiter instead of matching regex groups
+        ###   column numbers start from 1, counted from CSVPrefix when it is defined
+        for index, name in CSVColumnsSpecNames.items():
+            if value.get(name) != None:
+                tempCSVString = str(value.get(name)).strip()
+                try:
+                    tempColumns = [ int(column) for column in tempCSVString.split(",") ]
+                except ValueError:
+                    errorMsg = "ERROR invalid column number in {0}:|{1}|, key:|{2}|, expected format:3,4,5, SKIPed this spec".format(name, tempCSVString, key)
+                    print(errorMsg)
+                    LogMsg(errorMsg, statsLogFileName, True)
+                    continue
+                if tempSpec.CSVColumns == None:
+                    tempSpec.CSVColumns = []
+                tempSpec.CSVColumns.append( (index, tempColumns) )
+        if tempSpec.CSVColumns != None:
+            if value.get('CSVDelimiter') != None and len(str(value.get('CSVDelimiter'))) > 0:
+                ### not stripped so that space or tab can be used as delimiter
+                tempSpec.CSVDelimiter = str(value.get('CSVDelimiter'))
+            else:
+                tempSpec.CSVDelimiter = ','
+            if value.get('CSVPrefix') != None:
+                tempSpec.CSVPrefix = str(value.get('CSVPrefix')).strip()
+
+        if value.get('PatternTraceId') != None:
+            ## need to send current log line with trace data
+            tempSpec.traceId = str(value.get('PatternTraceId')).strip()
+
+        if value.get('TraceIdGroup') != None:
+            ## need to send current log line with trace data
+            tempSpec.traceIdGroup = int(str(value.get('TraceIdGroup')).strip())
+
+        if value.get('PatternTraceLabel') != None:
+            ## need to send current log line with trace data
+            tempSpec.traceLabel = str(value.get('PatternTraceLabel')).strip()
+
+        if value.get('TraceLabelGroup') != None:
+            ## need to send current log line with trace data
+            tempSpec.traceLabelGroup = int(str(value.get('TraceLabelGroup')).strip())
+        ### remove below lines once TraceLabelGroup is used in all spec files
+        if value.get('PatternTraceLabelGroup') != None:
+            ## need to send current log line with trace data
+            tempSpec.traceLabelGroup = int(str(value.get('PatternTraceLabelGroup')).strip())
+
+        if value.get('PatternDuration') != None:
+            ## need to send current log line with trace data
+            tempSpec.duration = str(value.get('PatternDuration')).strip()
+
+        if value.get('DurationGroup') != None:
+            ## need to send current log line with trace data
+            tempSpec.durationGroup = int(str(value.get('DurationGroup')).strip())
+
+        if value.get('DurationMultiplier') != None:
+            ## need to send current log line with trace data
+            tempSpec.durationMultiplier = int(str(value.get('DurationMultiplier')).strip())
+
+        if value.get('PatternTimeStamp') != None:
+            ## need to send current log line with trace data
+            tempSpec.timeStamp = str(value.get('PatternTimeStamp')).strip()
+        elif tempSpec.patternLog != None:
+            ### for pattern log, use global patternTimeStamp
+            tempSpec.timeStamp = patternTimeStamp
+
+        if value.get('TimeStampGroup') == None:
+            if timeStampGroup != None:
+                tempSpec.timeStampGroup  = timeStampGroup
+        else:
+            ## need to send current log line with trace data
+            tempSpec.timeStampGroup = int(str(value.get('TimeStampGroup')).strip())
+        
+        if value.get('TimeStampFormat') == None:
+            if timeStampFormat != None:
+                tempSpec.timeStampFormat  = timeStampFormat
+        else:
+            ## need to send current log line with trace data
+            tempSpec.timeStampFormat = str(value.get('TimeStampFormat')).strip()
 
-            if value.get('PatternAverage') != None:
-                tempPatternList[indexForPatternAverage] = str(value.get('PatternAverage')).strip()
-                tempPatternPresent[indexForPatternAverage] = True
+        if value.get('PatternTraceBlockStart') != None:
+            ## need to send current log line with trace data
+            tempSpec.traceBlockStart = str(value.get('PatternTraceBlockStart')).strip()
 
-            if value.get('PatternDelta') != None:
-                tempPatternList[indexForPatternDelta] = str(value.get('PatternDelta')).strip()
-                tempPatternPresent[indexForPatternDelta] = True
+        if value.get('PatternTraceBlockEnd') != None:
+            ## need to send current log line with trace data
+            tempSpec.traceBlockEnd = str(value.get('PatternTraceBlockEnd')).strip()
 
-            if value.get('Priority') != None:
-                tempPatternList[indexForPriority] = int(value.get('Priority'))
-
-            if value.get('PatternLog') != None:
-                tempPatternList[indexForPatternLog] = str(value.get('PatternLog')).strip()
-                tempPatternPresent[indexForPatternLog] = True
-
-            if value.get('PatternVariablePrefix') != None:
-                tempPatternList[indexForVariablePrefix] = str(value.get('PatternVariablePrefix')).strip()
-                tempPatternPresent[indexForVariablePrefix] = True
-
-            if value.get('VariablePrefixGroup') != None:
-                tempPatternList[indexForVariablePrefixGroup] = int(str(value.get('VariablePrefixGroup')).strip())
-                tempPatternPresent[indexForVariablePrefixGroup] = True
-            ## remove below three lines once all spec is using variablePrefixGroup name
-            if value.get('PatternVariablePrefixGroup') != None:
-                tempPatternList[indexForVariablePrefixGroup] = int(str(value.get('PatternVariablePrefixGroup')).strip())
-                tempPatternPresent[indexForVariablePrefixGroup] = True
-
-            if value.get('PatternLabel') != None:
-                tempPatternList[indexForLabel] = str(value.get('PatternLabel')).strip()
-                tempPatternPresent[indexForLabel] = True
-
-            if value.get('LabelGroup') != None:
-                tempPatternList[indexForLabelGroup] = int(str(value.get('LabelGroup')).strip())
-                tempPatternPresent[indexForLabelGroup] = True
-            ## remove below three lines once all spec is using LabelGroup name
-            if value.get('PatternLabelGroup') != None:
-                tempPatternList[indexForLabelGroup] = int(str(value.get('PatternLabelGroup')).strip())
-                tempPatternPresent[indexForLabelGroup] = True
-
-            if value.get('PatternSkip') != None:
-                tempPatternList[indexForSkip] = str(value.get('PatternSkip')).strip()
-                tempPatternPresent[indexForSkip] = True
-
-            if value.get('SkipGroups') != None:
-                ## DO NOT post values of these regex groups
-                tempCSVString = str(value.get('SkipGroups')).strip()
-                tempPatternList[indexForSkipGroups] = list(tempCSVString.split(","))
-                tempPatternPresent[indexForSkipGroups] = True
-            ## remove below lines once all spec is using LabelGroup name
-            if value.get('PatternSkipGroups') != None:
-                ## DO NOT post values of these regex groups
-                tempCSVString = str(value.get('PatternSkipGroups')).strip()
-                tempPatternList[indexForSkipGroups] = list(tempCSVString.split(","))
-                tempPatternPresent[indexForSkipGroups] = True
-
-            if value.get('PatternCSVVariableNames') != None:
-                ## the value is in CSV format, with one or more values
-                tempCSVString = str(value.get('PatternCSVVariableNames')).strip()
-                tempPatternList[indexForCSVVariableNames] = list(tempCSVString.split(","))
-                tempPatternPresent[indexForCSVVariableNames] = True
-
-            if value.get('PatternTraceId') != None:
-                ## need to send current log line with trace data
-                tempPatternList[indexForTraceId] = str(value.get('PatternTraceId')).strip()
-                tempPatternPresent[indexForTraceId] = True
-
-            if value.get('TraceIdGroup') != None:
-                ## need to send current log line with trace data
-                tempPatternList[indexForTraceIdGroup] = int(str(value.get('TraceIdGroup')).strip())
-                tempPatternPresent[indexForTraceIdGroup] = True
-
-            if value.get('PatternTraceLabel') != None:
-                ## need to send current log line with trace data
-                tempPatternList[indexForTraceLabel] = str(value.get('PatternTraceLabel')).strip()
-                tempPatternPresent[indexForTraceLabel] = True
-
-            if value.get('TraceLabelGroup') != None:
-                ## need to send current log line with trace data
-                tempPatternList[indexForTraceLabelGroup] = int(str(value.get('TraceLabelGroup')).strip())
-                tempPatternPresent[indexForTraceLabelGroup] = True
-            ### remove below lines once TraceLabelGroup is used in all spec files
-            if value.get('PatternTraceLabelGroup') != None:
-                ## need to send current log line with trace data
-                tempPatternList[indexForTraceLabelGroup] = int(str(value.get('PatternTraceLabelGroup')).strip())
-                tempPatternPresent[indexForTraceLabelGroup] = True
-
-            if value.get('PatternDuration') != None:
-                ## need to send current log line with trace data
-                tempPatternList[indexForDuration] = str(value.get('PatternDuration')).strip()
-                tempPatternPresent[indexForDuration] = True
-
-            if value.get('DurationGroup') != None:
-                ## need to send current log line with trace data
-                tempPatternList[indexForDurationGroup] = int(str(value.get('DurationGroup')).strip())
-                tempPatternPresent[indexForDurationGroup] = True
-
-            if value.get('DurationMultiplier') != None:
-                ## need to send current log line with trace data
-                tempPatternList[indexForDurationMultiplier] = int(str(value.get('DurationMultiplier')).strip())
-                tempPatternPresent[indexForDurationMultiplier] = True
-
-            if value.get('PatternTimeStamp') != None:
-                ## need to send current log line with trace data
-                tempPatternList[indexForTimeStamp] = str(value.get('PatternTimeStamp')).strip()
-                tempPatternPresent[indexForTimeStamp] = True
-            elif tempPatternList[indexForPatternLog] != None:
-                ### for pattern log, use global patternTimeStamp
-                tempPatternList[indexForTimeStamp] = patternTimeStamp
-                tempPatternPresent[indexForTimeStamp] = True
-
-            if value.get('TimeStampGroup') == None:
-                if timeStampGroup != None:
-                    tempPatternList[indexForTimeStampGroup]  = timeStampGroup
-                    tempPatternPresent[indexForTimeStampGroup] = True
+        if value.get('TraceSingleLine') != None:
+            ## need to send current log line with trace data
+            if str(value.get('TraceSingleLine')).strip() == 'True' or str(value.get('TraceSingleLine')).strip() == 'true':
+                tempSpec.traceSingleLine = True
             else:
-                ## need to send current log line with trace data
-                tempPatternList[indexForTimeStampGroup] = int(str(value.get('TimeStampGroup')).strip())
-                tempPatternPresent[indexForTimeStampGroup] = True
+                tempSpec.traceSingleLine = False
+
+        if value.get('TraceIdPrefix') == None:
+            ### no spec available for current key, use the gloabl definition if one present
+            if traceIdPrefix != None:
+                tempSpec.traceIdPrefix = traceIdPrefix 
+        else:
+            ## need to send current log line with trace data
+            tempSpec.traceIdPrefix = str(value.get('TraceIdPrefix')).strip()
             
-            if value.get('TimeStampFormat') == None:
-                if timeStampFormat != None:
-                    tempPatternList[indexForTimeStampFormat]  = timeStampFormat
-                    tempPatternPresent[indexForTimeStampFormat] = True
-            else:
-                ## need to send current log line with trace data
-                tempPatternList[indexForTimeStampFormat] = str(value.get('TimeStampFormat')).strip()
-                tempPatternPresent[indexForTimeStampFormat] = True
-
-            if value.get('PatternTraceBlockStart') != None:
-                ## need to send current log line with trace data
-                tempPatternList[indexForTraceBlockStart] = str(value.get('PatternTraceBlockStart')).strip()
-                tempPatternPresent[indexForTraceBlockStart] = True
-
-            if value.get('PatternTraceBlockEnd') != None:
-                ## need to send current log line with trace data
-                tempPatternList[indexForTraceBlockEnd] = str(value.get('PatternTraceBlockEnd')).strip()
-                tempPatternPresent[indexForTraceBlockEnd] = True
-
-            if value.get('TraceSingleLine') != None:
-                ## need to send current log line with trace data
-                if str(value.get('TraceSingleLine')).strip() == 'True' or str(value.get('TraceSingleLine')).strip() == 'true':
-                    tempPatternList[indexForTraceSingleLine] = True
+        if value.get('PatternTraceBlockContains') != None:
+            ## need to send current log line with trace data
+            tempSpec.traceBlockContains = str(value.get('PatternTraceBlockContains')).strip()
+
+        if value.get('TraceParentId') != None:
+            ## need to send current log line with trace data
+            tempSpec.traceParentId = str(value.get('TraceParentId')).strip()
+        else:
+            ### NO parent id available, put global parent id as parent id
+            tempSpec.traceParentId = traceParentId
+
+        if value.get('TraceStatusGroup') != None:
+            ## status group id in regex groups, where status field is present
+            tempSpec.traceStatusGroup = int(str(value.get('TraceStatusGroup')).strip())
+
+        if value.get('PatternTraceStatus') != None:
+            ## if status value match to this regex spec, collect the trace log
+            # this is to skip trace line with success status codes and focus on failure traces
+            tempSpec.traceStatus = str(value.get('PatternTraceStatus')).strip()
+
+        if value.get('PatternTraceBlockStatus') != None:
+            ## if status value match to this regex spec, collect the trace log
+            # this is to skip trace line with success status codes and focus on failure traces
+            tempSpec.traceBlockStatus = str(value.get('PatternTraceBlockStatus')).strip()
+
+        if value.get('ByteMode') != None:
+            ### process lines of this log file as bytes, decode only the lines that match prefilter
+            if str(value.get('ByteMode')).strip().lower() == 'true':
+                tempSpec.byteMode = True
+
+        if value.get('DebugLevel') != None:
+            # per key debug level
+            tempSpec.debugLevel = int(str(value.get('DebugLevel')).strip())
+        else:
+            ### use global debug level
+            tempSpec.debugLevel = debugLevel
+
+        ### if DBDetails available per service definition, store that.
+        if value.get('DBDetails') != None:
+            ### initialize it with default DBDetails. This is to inherit any value that is not specified locally.
+            tempSpec.DBDetails = defaultdict(dict)
+            tempValue = str(value.get('DBDetails')).strip()
+            tempDBDetailsArray = tempValue.split(',')
+            if len(tempDBDetailsArray) == 0 :
+                errorMsg = "ERROR invalid format in DBDetails spec:|{1}|, expected format:DBType=influxdb,influxdbBucket=bucket,influxdbOrg=org".format(keyValuePair, tempValue)
+                print(errorMsg)
+                LogMsg(errorMsg, statsLogFileName, True)
+                continue
+            for keyValuePair in tempDBDetailsArray:
+                fieldArray = keyValuePair.split('=')
+                if len(fieldArray) > 0:
+                    tempSpec.DBDetails[fieldArray[0]]= fieldArray[1]
                 else:
-                    tempPatternList[indexForTraceSingleLine] = False
-                tempPatternPresent[indexForTraceSingleLine] = True
-
-            if value.get('TraceIdPrefix') == None:
-                ### no spec available for current key, use the gloabl definition if one present
-                if traceIdPrefix != None:
-                    tempPatternList[indexForTraceIdPrefix] = traceIdPrefix 
-                    tempPatternPresent[indexForTraceIdPrefix] = True   
-            else:
-                ## need to send current log line with trace data
-                tempPatternList[indexForTraceIdPrefix] = str(value.get('TraceIdPrefix')).strip()
-                tempPatternPresent[indexForTraceIdPrefix] = True
-                
-            if value.get('PatternTraceBlockContains') != None:
-                ## need to send current log line with trace data
-                tempPatternList[indexForTraceBlockContains] = str(value.get('PatternTraceBlockContains')).strip()
-                tempPatternPresent[indexForTraceBlockContains] = True
-
-            if value.get('TraceParentId') != None:
-                ## need to send current log line with trace data
-                tempPatternList[indexForTraceParentId] = str(value.get('TraceParentId')).strip()
-                tempPatternPresent[indexForTraceParentId] = True
-            else:
-                ### NO parent id available, put global parent id as parent id
-                tempPatternList[indexForTraceParentId] = traceParentId
-                tempPatternPresent[indexForTraceParentId] = True
-
-            if value.get('TraceStatusGroup') != None:
-                ## status group id in regex groups, where status field is present
-                tempPatternList[indexForTraceStatusGroup] = int(str(value.get('TraceStatusGroup')).strip())
-                tempPatternPresent[indexForTraceStatusGroup] = True
-
-            if value.get('PatternTraceStatus') != None:
-                ## if status value match to this regex spec, collect the trace log
-                # this is to skip trace line with success status codes and focus on failure traces
-                tempPatternList[indexForTraceStatus] = str(value.get('PatternTraceStatus')).strip()
-                tempPatternPresent[indexForTraceStatus] = True
-
-            if value.get('PatternTraceBlockStatus') != None:
-                ## if status value match to this regex spec, collect the trace log
-                # this is to skip trace line with success status codes and focus on failure traces
-                tempPatternList[indexForTraceBlockStatus] = str(value.get('PatternTraceBlockStatus')).strip()
-                tempPatternPresent[indexForTraceBlockStatus] = True
-
-            if value.get('DebugLevel') != None:
-                # per key debug level
-                tempPatternList[indexForDebugLevel] = int(str(value.get('DebugLevel')).strip())
-                tempPatternPresent[indexForDebugLevel] = True
-            else:
-                ### use global debug level
-                tempPatternList[indexForDebugLevel] = debugLevel
-                tempPatternPresent[indexForDebugLevel] = True
-
-            ### if DBDetails available per service definition, store that.
-            if value.get('DBDetails') != None:
-                ### initialize it with default DBDetails. This is to inherit any value that is not specified locally.
-                tempPatternList[indexForDBDetails] = defaultdict(dict)
-                tempValue = str(value.get('DBDetails')).strip()
-                tempDBDetailsArray = tempValue.split(',')
-                if len(tempDBDetailsArray) == 0 :
-                    errorMsg = "ERROR invalid format in DBDetails spec:|{1}|, expected format:DBType=influxdb,influxdbBucket=bucket,influxdbOrg=org".format(keyValuePair, tempValue)
+                    errorMsg = "ERROR invalid format in DB spec:|{0}|, DBDetails:|{1}|".format(keyValuePair, tempValue)
                     print(errorMsg)
                     LogMsg(errorMsg, statsLogFileName, True)
                     continue
-                for keyValuePair in tempDBDetailsArray:
-                    fieldArray = keyValuePair.split('=')
-                    if len(fieldArray) > 0:
-                        tempPatternList[indexForDBDetails][fieldArray[0]]= fieldArray[1]
-                    else:
-                        errorMsg = "ERROR invalid format in DB spec:|{0}|, DBDetails:|{1}|".format(keyValuePair, tempValue)
-                        print(errorMsg)
-                        LogMsg(errorMsg, statsLogFileName, True)
-                        continue
-                tempPatternPresent[indexForDBDetails] = True
-
-            elif DBDetails['DBType'] != None:
-                ### if DBDetails available at environment level, store that.
-                tempPatternList[indexForDBDetails ] = DBDetails
-                tempPatternPresent[indexForDBDetails] = True
-
-            if logFileName != None:     
-                ### set the LogProcessing needed flag if log processing related spec present for current key
-                for index in specForLogProcessing:
-                    if tempPatternList[index] != None:
-                        tempPatternList[indexForLogProcessing] = True
-                        break
 
-                ### set TraceProcessing needed flag if trace processing related spec present for current key
-                for index in specForTraceProcessing:
-                    if tempPatternList[index] != None:
-                        tempPatternList[indexForTraceProcessing] = True
-                        break
-
-                ### set stats processing needed if stats processing related spec present in current key
-                for index in specForStatsProcessing:
-                    if tempPatternList[index] != None:
-                        tempPatternList[indexForStatsProcessing] = True
-                        break
-                
-                ### store the current key spec
-                JAStatsSpec[logFileName][key] = list(tempPatternList)
-                                      
-                if debugLevel > 1:
-                    print('DEBUG-2 key: {0}, value: {1}, pass, fail, count search strings: {2}'.format(
-                        key, value, JAStatsSpec[logFileName][key]))
+        elif DBDetails['DBType'] != None:
+            ### if DBDetails available at environment level, store that.
+            tempSpec.DBDetails = DBDetails
 
-            # initialize counts to 0
-            # set present flag if that count is to be posted to web server
-            logStats[key][indexForPatternPass*2] = 0
-            logStats[key][indexForPatternPass*2+1] = tempPatternPresent[indexForPatternPass]
-            logStats[key][indexForPatternFail*2] = 0
-            logStats[key][indexForPatternFail*2+1] = tempPatternPresent[indexForPatternFail]
-            logStats[key][indexForPatternCount*2] = 0
-            logStats[key][indexForPatternCount*2+1] = tempPatternPresent[indexForPatternCount]
-            ### data to be posted may have multiple values, initialize it to be a list
-            logStats[key][indexForPatternSum*2] = 0
-            ### for sum, data is posted if sample count is non=zero, no pattern present flag used
-            logStats[key][indexForPatternSum*2+1] = []
-            ### data to be posted may have multiple values, initialize it to be a list
-            logStats[key][indexForPatternAverage*2] = []
-            ### for average, data is posted if sample count is non=zero, no pattern present flag used
-            logStats[key][indexForPatternAverage*2+1] = []
-            logStats[key][indexForPatternDelta*2] = 0
-            ### for delta, data is posted if sample count is non=zero, no pattern present flag used
-            logStats[key][indexForPatternDelta*2+1] = []
+        ### compile patterns once, invalid patterns are discarded here instead of while processing log lines
+        for index, name in specForRegexPatterns.items():
+            if getattr(tempSpec, name) != None:
+                setattr(tempSpec, name, JACompilePattern( key, getattr(tempSpec, name)))
 
-            logStats[key][indexForCSVVariableNames*2] = tempPatternList[indexForCSVVariableNames]
-            logStats[key][indexForCSVVariableNames*2+1] = tempPatternPresent[indexForCSVVariableNames]
+        if logFileName != None:
+            ### set processing needed flags and list of patterns defined for current key
+            tempSpec.setProcessingStages()
 
-            ### set to None, it will be set to proper value later before posting to web server
-            logStats[key][indexForVariablePrefix*2] = None
-            logStats[key][indexForVariablePrefix*2+1] = tempPatternPresent[indexForVariablePrefix]
-            ### set to None, it will be set to proper value later before posting to web server
-            logStats[key][indexForVariablePrefixGroup*2] = None
-            logStats[key][indexForVariablePrefixGroup*2+1] = tempPatternPresent[indexForVariablePrefixGroup]
+            ### store the current key spec
+            tempStatsSpec[logFileName][key] = tempSpec
+                                  
+            if debugLevel > 1:
+                print('DEBUG-2 key: {0}, value: {1}, pass, fail, count search strings: {2}'.format(
+                    key, value, tempStatsSpec[logFileName][key]))
 
-            ### set to None, it will be set to proper value later before posting to web server
-            logStats[key][indexForLabel*2] = None
-            logStats[key][indexForLabel*2+1] = tempPatternPresent[indexForLabel]
-            ### set to None, it will be set to proper value later before posting to web server
-            logStats[key][indexForLabelGroup*2] = None
-            logStats[key][indexForLabelGroup*2+1] = tempPatternPresent[indexForLabelGroup]
+    return tempStatsSpec
 
-            logStats[key][indexForSkip*2] = tempPatternList[indexForSkip]
-            logStats[key][indexForSkip*2+1] = tempPatternPresent[indexForSkip]
+"""
+JAGatherExecuteCommandSpecs( configStats )
+Parse the spec of each command in Execute section of config file
+Returns { key: { indexForCommand: command in list form, indexForIntervalInSec: , indexForLastExecutionTime: , indexForCommandPriority: } }
+"""
+def JAGatherExecuteCommandSpecs( configStats ):
+    tempExecuteCommandSpec = defaultdict(dict)
 
-            logStats[key][indexForSkipGroups*2] = tempPatternList[indexForSkipGroups]
-            logStats[key][indexForSkipGroups*2+1] = tempPatternPresent[indexForSkipGroups]
+    try:
+        ### process execute command section
+        ### Execute:
+        ###    Health:
+        ###    #execute below command to gather application stats, output to log file
+        ###    Command: ps -ef |grep JATest.py |grep -v grep |wc -l > Health.log
+        ###    IntervalInSec: 60
+        ###    Priority: 2
+        for key, value in configStats['Execute'].items():
+
+            if value.get('Command') != None:
+                ## store the command as list so that it can be passed to run function later
+                tempCommand = str(value.get('Command')).strip()
+                tempExecuteCommandSpec[key][indexForCommand] = tempCommand.split()
+
+            if value.get('IntervalInSec') != None:
+                tempExecuteCommandSpec[key][indexForIntervalInSec] = int(value.get('IntervalInSec'))
+                tempExecuteCommandSpec[key][indexForLastExecutionTime] = None            
 
-            ### store DBDetails spec in logStats[key] so that it can be referred in JAPostAllDataToWebServer()
-            logStats[key][indexForDBDetails*2] = tempPatternList[indexForDBDetails ]
-            logStats[key][indexForDBDetails*2+1] = tempPatternPresent[indexForDBDetails]
+            if value.get('Priority') != None:
+                tempExecuteCommandSpec[key][indexForCommandPriority] = str(value.get('Priority')).strip()
+            else:
+                tempExecuteCommandSpec[key][indexForCommandPriority] = 3
+    except:
+        if debugLevel > 1 :
+            print("DEBUG-2 No execute command to process")
+    return tempExecuteCommandSpec
 
-            logStats[key][indexForTraceId*2] = None
-            logStats[key][indexForTraceId*2+1] = tempPatternPresent[indexForTraceId]
+# read default parameters and OS Stats collection spec
+try:
+    JAStats = JAReadConfigFile()
 
-            logStats[key][indexForTraceIdGroup*2] = None
-            logStats[key][indexForTraceIdGroup*2+1] = tempPatternPresent[indexForTraceIdGroup]
+    if statsLogFileName == None:
+        if JAStats['GatherLogStatsLogFile'] != None:
+            statsLogFileName = JAStats['GatherLogStatsLogFile']
+        else:
+            statsLogFileName = 'JAGatherLogStats.log'
 
-            logStats[key][indexForTraceLabel*2] = None
-            logStats[key][indexForTraceLabel*2+1] = tempPatternPresent[indexForTraceLabel]
+    if cacheLogFileName == None:
+        if JAStats['GatherLogStatsCacheFile'] != None:
+            cacheLogFileName = JAStats['GatherLogStatsCacheFile']
+        else:
+            cacheLogFileName = 'JAGatherLogStats.cache'
+
+    for key, value in JAStats['Environment'].items():
+        if key == 'All':
+            # if parameters are not yet defined, read the values from this section
+            # values in this section work as default if params are defined for
+            # specific environment
+            JAGatherEnvironmentSpecs(key, value)
+
+        if value.get('HostName') != None:
+            if re.match(value['HostName'], thisHostName):
+                # current hostname match the hostname specified for this environment
+                # read all parameters defined for this environment
+                JAGatherEnvironmentSpecs(key, value)
+                myEnvironment = key
+
+    # if conig file does not have values for below, assign default values
+    if dataPostIntervalInSec == 0:
+        # 60 seconds
+        dataPostIntervalInSec = 60
+    if maxProcessingTimeForAllEvents == 0:
+       maxProcessingTimeForAllEvents = dataPostIntervalInSec / 2 
+    if dataCollectDurationInSec == 0:
+        # close to one hour
+        dataCollectDurationInSec = 3540
+    if disableWarnings == None:
+        disableWarnings = True
+    if verifyCertificate == None:
+        verifyCertificate = False
+    if maxCPUUsageForEvents[0] == 0:
+        # SKIP processing log files when CPU usage exceeds 80%
+        maxCPUUsageForEvents[0] = 80
+    if maxCPUUsageForEvents[1] == 0:
+        # SKIP processing priority 1 events of log files when CPU usage exceeds 70%
+        maxCPUUsageForEvents[1] = 70
+    if maxCPUUsageForEvents[2] == 0:
+        # SKIP processing priority 2 events of log files when CPU usage exceeds 60%
+        maxCPUUsageForEvents[2] = 60
+    if maxCPUUsageForEvents[3] == 0:
+        # SKIP processing priority 3 events of log files when CPU usage exceeds 50%
+        maxCPUUsageForEvents[3] = 50
+    if maxCPUSecondsPerInterval == None:
+        ### 10% of one CPU
+        maxCPUSecondsPerInterval = dataPostIntervalInSec * 0.1
+    if maxLogLines == None:
+        maxLogLines = 10
+    if maxLogBytes == None:
+        maxLogBytes = 1048576
+    if logLineDedup == None:
+        logLineDedup = False
+    if profileSampleInterval == None:
+        profileSampleInterval = 0
+    if profilePostStats == None:
+        profilePostStats = False
+    if postAgentStats == None:
+        postAgentStats = True
+    if maxTraceLines == None:
+        maxTraceLines = 100
+    if watchLogFiles == None:
+        watchLogFiles = False
+    if daemonMode == None:
+        daemonMode = False
+    if watchIntervalInSec == None:
+        watchIntervalInSec = 1
+    if maxWorkerProcesses == None:
+        maxWorkerProcesses = 0
+    if catchUpThresholdInMB == None:
+        catchUpThresholdInMB = 0
+    if catchUpProcesses == None:
+        catchUpProcesses = 4
+    if intervalBucketing == None:
+        intervalBucketing = False
+    if maxLatenessInSec == None:
+        maxLatenessInSec = dataPostIntervalInSec
+    if maxTraceBlockLines == None:
+        maxTraceBlockLines = 1000
+    if maxTraceBlockBytes == None:
+        maxTraceBlockBytes = 1048576
+    if traceBlockTimeoutInSec == None:
+        traceBlockTimeoutInSec = dataPostIntervalInSec * 2
+    
+    if statsLogFileName == None:
+        statsLogFileName = "JAGatherLogStats.log"
+    if cacheLogFileName == None:
+        cacheLogFileName = "JAGatherLogStats.cache"
+
+    if traceParentId == None:
+        ### use self-id as parent id
+        traceParentId =  traceId
+
+    JAStatsSpec = JAGatherLogFileSpecs( JAStats['LogFile'] )
+    for logFileName, keySpecs in JAStatsSpec.items():
+        for key, tempSpec in keySpecs.items():
+            # initialize counts to 0
+            # set present flag if that count is to be posted to web server
+            logStats[key] = JAServiceStats(tempSpec)
 
-            logStats[key][indexForTraceLabelGroup*2] = None
-            logStats[key][indexForTraceLabelGroup*2+1] = tempPatternPresent[indexForTraceLabelGroup]
+            ### initialize logLines[key] list to empty list
+            logLines[key] = []
+            # initialize logTraces[key] list to empty list
+            logTraces[key] = []
 
-            logStats[key][indexForDuration*2] = None
-            logStats[key][indexForDuration*2+1] = tempPatternPresent[indexForDuration]
+    JAExecuteCommandSpec = JAGatherExecuteCommandSpecs( JAStats )
 
-            logStats[key][indexForDurationGroup*2] = None
-            logStats[key][indexForDurationGroup*2+1] = tempPatternPresent[indexForDurationGroup]
+except OSError as err:
+    JAStatsExit('ERROR - Can not open configFile:|' +
+                configFile + '|' + "OS error: {0}".format(err) + '\n')
 
-            logStats[key][indexForDurationMultiplier*2] = None
-            logStats[key][indexForDurationMultiplier*2+1] = tempPatternPresent[indexForDurationMultiplier]
+### combined prefilter per log file name, used to skip lines that can not match any pattern of any key
+logFilePrefilter = {}
+### True if lines of the log file name are searched without decoding, prefilter is bytes pattern
+logFileByteMode = {}
+for logFileName in JAStatsSpec:
+    logFilePrefilter[logFileName], logFileByteMode[logFileName] = JABuildLogFilePrefilter( logFileName, JAStatsSpec[logFileName])
 
-            logStats[key][indexForTimeStampGroup*2] = None
-            logStats[key][indexForTimeStampGroup*2+1] = tempPatternPresent[indexForTimeStampGroup]
-
-            logStats[key][indexForTimeStampFormat*2] = None
-            logStats[key][indexForTimeStampFormat*2+1] = tempPatternPresent[indexForTimeStampFormat]
-
-            logStats[key][indexForTraceBlockStart*2] = None
-            logStats[key][indexForTraceBlockStart*2+1] = tempPatternPresent[indexForTraceBlockStart]
-
-            logStats[key][indexForTraceBlockEnd*2] = None
-            logStats[key][indexForTraceBlockEnd*2+1] = tempPatternPresent[indexForTraceBlockEnd]
-
-            logStats[key][indexForTraceSingleLine*2] = None
-            logStats[key][indexForTraceSingleLine*2+1] = tempPatternPresent[indexForTraceSingleLine]
-
-            logStats[key][indexForTraceIdPrefix*2] = None
-            logStats[key][indexForTraceIdPrefix*2+1] = tempPatternPresent[indexForTraceSingleLine]
-
-            logStats[key][indexForTraceBlockContains*2] = None
-            logStats[key][indexForTraceBlockContains*2+1] = tempPatternPresent[indexForTraceBlockContains]
-
-            logStats[key][indexForTraceParentId*2] = None
-            logStats[key][indexForTraceParentId*2+1] = tempPatternPresent[indexForTraceParentId]
-
-            logStats[key][indexForTraceStatus*2] = None
-            logStats[key][indexForTraceStatus*2+1] = tempPatternPresent[indexForTraceStatus]
-
-            logStats[key][indexForTraceStatusGroup*2] = None
-            logStats[key][indexForTraceStatusGroup*2+1] = tempPatternPresent[indexForTraceStatusGroup]
-
-            logStats[key][indexForTraceBlockStatus*2] = None
-            logStats[key][indexForTraceBlockStatus*2+1] = tempPatternPresent[indexForTraceBlockStatus]
-
-            logStats[key][indexForDebugLevel*2] = None
-            logStats[key][indexForDebugLevel*2+1] = tempPatternPresent[indexForDebugLevel]
-
-            ### initialize logLines[key] list to empty list
-            logLines[key] = []
-            # initialize logTraces[key] list to empty list
-            logTraces[key] = []
-
-        try:
-            ### process execute command section
-            ### Execute:
-            ###    Health:
-            ###    #execute below command to gather application stats, output to log file
-            ###    Command: ps -ef |grep JATest.py |grep -v grep |wc -l > Health.log
-            ###    IntervalInSec: 60
-            ###    Priority: 2
-            for key, value in JAStats['Execute'].items():
-
-                if value.get('Command') != None:
-                    ## store the command as list so that it can be passed to run function later
-                    tempCommand = str(value.get('Command')).strip()
-                    JAExecuteCommandSpec[key][indexForCommand] = tempCommand.split()
-
-                if value.get('IntervalInSec') != None:
-                    JAExecuteCommandSpec[key][indexForIntervalInSec] = int(value.get('IntervalInSec'))
-                    JAExecuteCommandSpec[key][indexForLastExecutionTime] = None            
-
-                if value.get('Priority') != None:
-                    JAExecuteCommandSpec[key][indexForCommandPriority] = str(value.get('Priority')).strip()
-                else:
-                    JAExecuteCommandSpec[key][indexForCommandPriority] = 3
-        except:
-            if debugLevel > 1 :
-                print("DEBUG-2 No execute command to process")
-
-except OSError as err:
-    JAStatsExit('ERROR - Can not open configFile:|' +
-                configFile + '|' + "OS error: {0}".format(err) + '\n')
-
-print('INFO  DataPostIntervalInSec:{0}, DataCollectDurationInSec: {1}, DisableWarnings: {2}, VerifyCertificate: {3}, WebServerURL: {4}, maxCPUUsageForEvents: {5}, maxProcessingTimeForAllEvents: {6}, DebugLevel: {7}, Version: {8}'.format(
-    dataPostIntervalInSec, dataCollectDurationInSec, disableWarnings, verifyCertificate, webServerURL, maxCPUUsageForEvents, maxProcessingTimeForAllEvents, debugLevel, JAVersion))
-if debugLevel > 0:
-    for key, spec in JAStatsSpec.items():
-        print('DEBUG-1 Name: {0}, Fields: {1}'.format(key, spec))
+print('INFO  DataPostIntervalInSec:{0}, DataCollectDurationInSec: {1}, DisableWarnings: {2}, VerifyCertificate: {3}, WebServerURL: {4}, maxCPUUsageForEvents: {5}, maxProcessingTimeForAllEvents: {6}, DebugLevel: {7}, Version: {8}'.format(
+    dataPostIntervalInSec, dataCollectDurationInSec, disableWarnings, verifyCertificate, webServerURL, maxCPUUsageForEvents, maxProcessingTimeForAllEvents, debugLevel, JAVersion))
+if debugLevel > 0:
+    for key, spec in JAStatsSpec.items():
+        print('DEBUG-1 Name: {0}, Fields: {1}'.format(key, spec))
 
 # get current time in seconds since 1970 jan 1
 programStartTime = loopStartTimeInSec = time.time()
@@ -1179,7 +2123,8 @@ statsEndTimeInSec = loopStartTimeInSec + dataCollectDurationInSec
 ### wait for twice the data collection duration for any prev instance to complete
 waitTime = dataCollectDurationInSec * 2
 OSUptime = JAGlobalLib.JAGetUptime(OSType)
-while waitTime > 0:
+### benchmark runs along with the instance gathering stats
+while waitTime > 0 and benchmarkMode == False:
     ### read the last time this process was started, 
     ###   if the time elapsed is less than dataCollectDurationInSec, 
     ###   prev instance is still running, get out
@@ -1205,10 +2150,11 @@ while waitTime > 0:
         break
 
 if waitTime <= 0:
-    JAStatsExit('ERROR - another instance of this program is running, exceeded max wait time:{0}, exiting'.format(dataCollectDurationInSec * 2))
+    JAStatsExit('ERROR - another instance of this program is running, exceeded max wait time:{0}, exiting'.format(dataCollectDurationInSec * 2), False)
 
 ### Create a file with current time stamp
-JAGlobalLib.JAWriteTimeStamp("JAGatherLogStats.PrevStartTime")
+if benchmarkMode == False:
+    JAGlobalLib.JAWriteTimeStamp("JAGatherLogStats.PrevStartTime")
 
 if retryDurationInHours == None:
     retryDurationInHours = 0
@@ -1237,6 +2183,31 @@ previousSampleValuesPresent = defaultdict(dict)
 
 ### contains number of log lines collected per key, key is derived as <serviceName>
 logLinesCount = defaultdict(int)
+### contains size of log lines collected per key, log lines are not collected once it exceeds maxLogBytes
+logLinesBytes = defaultdict(int)
+### contains fingerprints of log lines collected per key when logLineDedup is True
+###   fingerprint is the log line with numbers, hex values and IP addresses masked, used as hash key
+###   value is [position of exemplar line in logLines[key], count of lines with this fingerprint]
+###   up to maxLogLines fingerprints are kept per key, per sampling interval
+logLineFingerprints = defaultdict(dict)
+### IP addresses, hex values and numbers masked to derive fingerprint of a log line
+logLineMaskPattern = re.compile(r'(?:\d{1,3}\.){3}\d{1,3}|0[xX][0-9a-fA-F]+|[0-9a-fA-F]*\d[0-9a-fA-F]*')
+
+"""
+JAAddLogLineCounts( key )
+Add count of similar lines to the exemplar line of each fingerprint of given key
+Clear fingerprints so that next sampling interval starts with empty table
+"""
+def JAAddLogLineCounts( key ):
+    fingerprints = logLineFingerprints.get(key)
+    if not fingerprints:
+        return
+    lines = logLines[key]
+    for position, count in fingerprints.values():
+        if count > 1 and position < len(lines):
+            ### exemplar line ends with __NEWLINE__, insert count before it
+            lines[position] = "{0} ..... {1} similar lines .....__NEWLINE__".format( lines[position][:-11], count )
+    fingerprints.clear()
 
 ### contains number of log traces collected per key, key is derived as <serviceName>
 logTracesCount = defaultdict(int)
@@ -1317,6 +2288,20 @@ except:
 ### ??? remove this later
 # useRequests = False
 
+"""
+JARecordPostLatency( destination, latencyInSec )
+Record time taken to post data to destination (stats, logs, traces), posted in JAAgent series
+"""
+def JARecordPostLatency( destination, latencyInSec ):
+    if destination in agentPostLatency:
+        postLatency = agentPostLatency[destination]
+        postLatency[0] += 1
+        postLatency[1] += latencyInSec
+        if latencyInSec > postLatency[2]:
+            postLatency[2] = latencyInSec
+    else:
+        agentPostLatency[destination] = [1, latencyInSec, latencyInSec]
+
 def JAPostDataToWebServer(tempLogStatsToPost, useRequests, storeUponFailure):
     global requestSession
     """
@@ -1331,6 +2316,7 @@ def JAPostDataToWebServer(tempLogStatsToPost, useRequests, storeUponFailure):
         print('DEBUG-2 JAPostDataToWebServer() tempLogStatsToPost: {0}'.format(tempLogStatsToPost))
     if debugLevel > 0:
         print('DEBUG-1 JAPostDataToWebServer() size of tempLogStatsToPost: {0}'.format(sys.getsizeof(tempLogStatsToPost)))
+    postStartTime = time.time()
     if useRequests == True:
         try:
             # post interval elapsed, post the data to web server
@@ -1348,6 +2334,7 @@ def JAPostDataToWebServer(tempLogStatsToPost, useRequests, storeUponFailure):
         except Exception as err:
             resultText = "<Response [500]> subprocess.run(curl) Error posting data to web server {0}, exception raised, error:{1}".format(webServerURL, err)
             logStatsPostSuccess = False
+    JARecordPostLatency( 'stats', time.time() - postStartTime )
 
     resultLength = len(resultText)
     if resultLength > 1 :
@@ -1370,7 +2357,13 @@ def JAPostDataToWebServer(tempLogStatsToPost, useRequests, storeUponFailure):
         print(resultText)
         if resultLength > 1 :
             LogMsg(resultText[resultLength-1], statsLogFileName, True)
-        if retryLogStatsFileHandleCurrent != None and storeUponFailure == True:
+        if retryDurationInHours > 0 and storeUponFailure == True:
+            ### retry stats are kept in daily file, switch to new file when date changes
+            if fileNameRetryStatsPost != retryLogStatsFileNamePartial + JAGlobalLib.UTCDateForFileName():
+                fileNameRetryStatsPost = retryLogStatsFileNamePartial + JAGlobalLib.UTCDateForFileName()
+                if retryLogStatsFileHandleCurrent != None :
+                    retryLogStatsFileHandleCurrent.close()
+                    retryLogStatsFileHandleCurrent = None
             if retryLogStatsFileHandleCurrent == None :
                 try:
                     retryLogStatsFileHandleCurrent = open( fileNameRetryStatsPost,"a")
@@ -1397,64 +2390,6 @@ def JAPostDataToWebServer(tempLogStatsToPost, useRequests, storeUponFailure):
 
     return logStatsPostSuccess
 
-"""
-   Params passed: serviceName, postFix, index to the logStats[key][] where value is present
-   Values are passed as tempValue, and tempValues
-   If tempValues (list) is present,
-      Take the name value pair in list like [ name1,value1,name2,value2,....]
-      Prepare the data in a format used to post them to web server in the form
-         <serviceName>_<nameN>_postFix=<valueX>
-         Here, nameN has : on either side like :nameN: so that web server can separate it later
-            and post it as label to database
-   else, 
-         <serviceName>_postFix=<value>
-
-"""
-def JAPrepareStatsToPost(key, indexToLogStats, postFix, tempValue, tempValues ):
-    global logStats, debugLevel, dataPostIntervalInSec
-    returnResult = ''
-
-    floatDataPostIntervalInSec = float(dataPostIntervalInSec)
-
-    ### list is NOT empty, process list values
-
-    if tempValues :
-        
-        index = 0
-        paramName = ''
-        while index < len(tempValues):
-            tempResult = tempValues[index]
-            if ( debugLevel > 3) :
-                print("DEBUG-4 JAPrepareVariableValue() listVarIndex:[{0}], listVar:{1}".format(index, tempResult+1))
-            if index % 2 > 0:
-                try:
-                    ### divide the valueX with sampling interval to get tps value
-                    tempResulttps = float(tempResult) / floatDataPostIntervalInSec
-                    ### Prepare the data in a format used to post them to web server in the form
-                    ###     <serviceName>_<nameN>_postFix=<valueX>
-                    ###     expect <nameN> to have : on either side
-                    ### resulting variable <serviceName>_:nameX:_postFix=<valueX>
-
-                    returnResult += ",{0}_{1}_{2}={3:.2f}".format( key, paramName, postFix, tempResulttps)                        
-                except:
-                    returnResult += ",{0}_{1}_{2}={3}".format( key, paramName, postFix, tempResult)
-            else:
-                ### current index has param name
-                paramName = tempResult
-            index += 1
-    else:
-        ### individual value, not a list
-        returnResult = ",{0}_{1}={2}".format( key, postFix, (float)(tempValue) / floatDataPostIntervalInSec ) 
-    ### reset count and param list
-    logStats[key][indexToLogStats*2] = 0
-    logStats[key][indexToLogStats*2+1] = []
-
-    if ( debugLevel > 2) :
-        print("DEBUG-4 JAPrepareVariableValue() key:{0}, postFix:{1}, tempValue:{2}, tempValues:{3}, returnResult:{4}".format(key,postFix,tempValue, tempValues,returnResult))
-
-    return returnResult
-
-
 def JAPostLogLinesToWebServer(key, tempLogLinesToPost, useRequests):
     global debugLevel, logLinesCount, maxLogLines, logLines
     global webServerURL, verifyCertificate, logLinesToPost, logEventPriorityLevel
@@ -1475,6 +2410,7 @@ def JAPostLogLinesToWebServer(key, tempLogLinesToPost, useRequests):
 
     data = json.dumps(tempLogLinesToPost)
 
+    postStartTime = time.time()
     if useRequests == True:
         try:
             # post interval elapsed, post the data to web server
@@ -1494,6 +2430,7 @@ def JAPostLogLinesToWebServer(key, tempLogLinesToPost, useRequests):
         except Exception as err:
             resultText = "<Response [500]> subprocess.run() Error posting logs to web server, exception raised, error:{0}".format(err)
             logStatsPostSuccess = False
+    JARecordPostLatency( 'logs', time.time() - postStartTime )
 
     logStatsPostSuccess = True
     resultLength = len(resultText)
@@ -1531,6 +2468,7 @@ def JAPostTraceLinesToWebServer(tempLogTracesToPost, useRequests):
 
     data = json.dumps(tempLogTracesToPost)
 
+    postStartTime = time.time()
     if useRequests == True:
         try:
             # post interval elapsed, post the data to web server
@@ -1549,6 +2487,7 @@ def JAPostTraceLinesToWebServer(tempLogTracesToPost, useRequests):
         except Exception as err:
             resultText = "<Response [500]> subprocess.run() Error posting trace to web server, exception raised, error:{0}".format(err)
             logStatsPostSuccess = False 
+    JARecordPostLatency( 'traces', time.time() - postStartTime )
     logStatsPostSuccess = True
     resultLength = len(resultText)
     if resultLength > 1 :
@@ -1578,25 +2517,61 @@ def JAPostTraceLinesToWebServer(tempLogTracesToPost, useRequests):
     return logStatsPostSuccess
 
 """
-def JAPostAllDataToWebServer()
-This function posts all data to web server
-Uses below global variables
-    global logStats
-    global webServerURL, verifyCertificate, logStatsToPost
-
-Return values:
-    None
-
+JAGetAgentStats( timeStamp )
+Return self metrics of this program in the form 'timeStamp=<timeStamp>,JAAgent_<name>=<value>,...' and reset them
+Lag of a log file is the bytes after the position processed so far and seconds since the file was processed last time,
+  seconds are 0 when the file is processed till the end
 """
+def JAGetAgentStats( timeStamp ):
+    global agentCPUSecondsUsed
+    currentTime = time.time()
+    tempStatsParts = [ 'timeStamp=' + timeStamp ]
+    for name in ('linesRead', 'bytesRead', 'regexEvaluations'):
+        tempStatsParts.append( ',JAAgent_{0}={1}'.format( name, agentStats[name] ) )
+    agentStats.clear()
+
+    for fileName, fileInfo in logFileInfo.items():
+        filePosition = fileInfo.get('filePosition')
+        if not isinstance( filePosition, int ):
+            continue
+        try:
+            lagBytes = max( os.path.getsize(fileName) - filePosition, 0 )
+        except OSError:
+            continue
+        lagSec = 0
+        if lagBytes > 0 and fileInfo.get('prevTime') != None:
+            lagSec = max( currentTime - fileInfo['prevTime'], 0 )
+        tempFileName = re.sub( r'[^A-Za-z0-9]+', '_', fileName ).strip('_')
+        tempStatsParts.append( ',JAAgent_lagBytes_{0}={1},JAAgent_lagSec_{0}={2:.0f}'.format( tempFileName, lagBytes, lagSec ) )
+
+    for destination, postLatency in agentPostLatency.items():
+        tempStatsParts.append( ',JAAgent_{0}PostLatencyMSec_average={1:.2f},JAAgent_{0}PostLatencyMSec_max={2:.2f}'.format(
+            destination, postLatency[1] * 1000 / postLatency[0], postLatency[2] * 1000 ) )
+    agentPostLatency.clear()
+
+    if retryDurationInHours > 0:
+        retryQueueRecords, retryQueueBytes = JAGlobalLib.JAGetRetryQueueDepth(
+            retryLogStatsFileNamePartial, currentTime - retryDurationInHours * 3600, debugLevel, thisHostName, OSType )
+        tempStatsParts.append( ',JAAgent_retryQueueRecords={0},JAAgent_retryQueueBytes={1}'.format( retryQueueRecords, retryQueueBytes ) )
+
+    ### resident set size of this process and worker processes
+    memoryRSS = JAGlobalLib.JAGetProcessRSS() + sum( agentMemoryRSSWorkers.values() )
+    agentMemoryRSSWorkers.clear()
+    tempStatsParts.append( ',JAAgent_memoryRSS={0},JAAgent_cpuSeconds={1:.3f}'.format( memoryRSS, agentCPUSecondsUsed ) )
+    agentCPUSecondsUsed = 0
+    return ''.join( tempStatsParts )
 
-def JAPostAllDataToWebServer():
-    global logStats, debugLevel, useRequests
-    global webServerURL, verifyCertificate, logStatsToPost, logLinesToPost, logTracesToPost, logEventPriorityLevel
-    timeStamp = JAGlobalLib.UTCDateTime()
-    if debugLevel > 1:
-        print('DEBUG-2 JAPostAllDataToWebServer() ' +
-              timeStamp + ' Posting the stats collected')
+"""
+JAPostLogStatsToWebServer( serviceStats, timeStamp, postLogEventPriorityLevel )
+Post stats in serviceStats, { serviceName: JAServiceStats }, to web server and reset the stats
+Stats of keys with different DBDetails are posted separately
+timeStamp is used for keys whose stats do not have their own timestamp
 
+Return values:
+    number of postings done
+"""
+def JAPostLogStatsToWebServer( serviceStats, timeStamp, postLogEventPriorityLevel ):
+    global logPendingBytesPosted
     numPostings = 0
     # use temporary buffer for each posting
     tempLogStatsToPost = logStatsToPost.copy()
@@ -1615,27 +2590,45 @@ def JAPostAllDataToWebServer():
     floatDataPostIntervalInSec = float(dataPostIntervalInSec)
 
     ### post logEventPriorityLevel with environment specific DBDetails.
-    tempLogStatsToPost['logEventPriorityLevel'] = 'timeStamp={0},logEventPriorityLevel={1}'.format(timeStamp, logEventPriorityLevel)
+    if postLogEventPriorityLevel == True:
+        tempLogStatsToPost['logEventPriorityLevel'] = 'timeStamp={0},logEventPriorityLevel={1}'.format(timeStamp, logEventPriorityLevel)
+
+        ### post bytes of log files yet to be processed, till it is 0 after catch up
+        logPendingBytes = JAGetPendingBytes() + logPendingBytesWorkers
+        if logPendingBytes > 0 or logPendingBytesPosted > 0:
+            tempLogStatsToPost['logPendingBytes'] = 'timeStamp={0},logPendingBytes={1}'.format(timeStamp, logPendingBytes)
+            errorMsg = "INFO JAPostLogStatsToWebServer() log file bytes pending to be processed:{0}".format(logPendingBytes)
+            print(errorMsg)
+            LogMsg(errorMsg, statsLogFileName, True)
+        logPendingBytesPosted = logPendingBytes
+
+        ### post estimated time taken by each stage of each key in this interval
+        if profilePostStats == True and len(profileIntervalStats) > 0:
+            tempLogStatsToPost['JAProfile'] = 'timeStamp={0}'.format(timeStamp)
+            for profileKey, elapsedTime in profileIntervalStats.items():
+                tempLogStatsToPost['JAProfile'] += ',{0}_{1}_usec={2:.0f}'.format( profileKey[0], profileKey[1], elapsedTime * profileSampleInterval / 1000 )
+            profileIntervalStats.clear()
+
+        if postAgentStats == True:
+            tempLogStatsToPost['JAAgent'] = JAGetAgentStats( timeStamp )
 
     # sampling interval elapsed
     # push current sample stats to the data to be posted to the web server
     # key - service name
-    # values -  value1, presentFlag1, value2, presentFlag2,....
-    # { 'AlarmCRIT': [ 0, False, 0, False, 2, True, 0, False],
-    #   'ApacheICDR': [ 2, True, 0, False, 0, False, 0, False]}
-    #                    pass      fail     count     stats
-    for key, values in logStats.items():
-        if logStats[key][indexForDBDetails*2+1] == True:
+    # values - JAServiceStats, pass, fail, count, sum, delta, average stats of that service
+    for key, values in serviceStats.items():
+        values.reduceColumnBuffers()
+        if values.DBDetails != None:
             tempInfluxDBBucketName = None
             try:
-                if logStats[key][indexForDBDetails*2]['InfluxdbBucket'] != None:
-                    tempInfluxDBBucketName = logStats[key][indexForDBDetails*2]['InfluxdbBucket']
+                if values.DBDetails['InfluxdbBucket'] != None:
+                    tempInfluxDBBucketName = values.DBDetails['InfluxdbBucket']
             except:
                 if prevDBType != 'Prometheus' :
                     if debugLevel > 0:
-                        print("DEBUG-1 Better to add other DBDetails for :|{0}|".format(logStats[key][indexForDBDetails*2]))
+                        print("DEBUG-1 Better to add other DBDetails for :|{0}|".format(values.DBDetails))
 
-            if logStats[key][indexForDBDetails*2]['DBType'] != prevDBType or ( logStats[key][indexForDBDetails*2]['DBType'] == 'Influxdb' and tempInfluxDBBucketName != prevDBBucket ):
+            if values.DBDetails['DBType'] != prevDBType or ( values.DBDetails['DBType'] == 'Influxdb' and tempInfluxDBBucketName != prevDBBucket ):
                 ### current key's DBDetails differ from prevDBType
                 ###   post the data aggregated so far in tempLogStatsToPost
                 if postData == True :
@@ -1647,178 +2640,118 @@ def JAPostAllDataToWebServer():
                     if JAPostDataToWebServer(tempLogStatsToPost, useRequests, storeUponFailure) == True:
                         ### successful posting, increment count
                         numPostings += 1
-                        print('INFO JAPostAllDataToWebServer() DBType:|{0}|, posted data to web server:|{1}|'.format(prevDBType, webServerURL))
+                        print('INFO JAPostLogStatsToWebServer() DBType:|{0}|, posted data to web server:|{1}|'.format(prevDBType, webServerURL))
                     
                     postData = False
                 ### prepare tempLogStatsToPost with fixed data for next posting
                 tempLogStatsToPost = logStatsToPost.copy()
 
-                prevDBType = tempLogStatsToPost['DBType'] = logStats[key][indexForDBDetails*2]['DBType']
+                prevDBType = tempLogStatsToPost['DBType'] = values.DBDetails['DBType']
                 try:
-                    if logStats[key][indexForDBDetails*2]['InfluxdbBucket'] != None:
-                        tempLogStatsToPost['InfluxdbBucket'] = logStats[key][indexForDBDetails*2]['InfluxdbBucket']
-                    if logStats[key][indexForDBDetails*2]['InfluxdbOrg'] != None:
-                        tempLogStatsToPost['InfluxdbOrg'] = logStats[key][indexForDBDetails*2]['InfluxdbOrg']
+                    if values.DBDetails['InfluxdbBucket'] != None:
+                        tempLogStatsToPost['InfluxdbBucket'] = values.DBDetails['InfluxdbBucket']
+                    if values.DBDetails['InfluxdbOrg'] != None:
+                        tempLogStatsToPost['InfluxdbOrg'] = values.DBDetails['InfluxdbOrg']
                 except:
                     if prevDBType != 'Prometheus' :
                         if debugLevel > 0:
-                            print("DEBUG-1 Better to add other DBDetails for :|{0}|".format(logStats[key][indexForDBDetails*2]))
-
-        timeStampAdded = False
-        
-        if values[indexForTimeStampFormat*2+1] == True:
-            if values[indexForTimeStampFormat*2] != None:
-                # if the sample has it's own timestamp, use it to post the data to web
-                timeStamp = values[indexForTimeStampFormat*2]
-
-        # 2022-03-27 JAPrepareStatsToPost() debug this later           
-        if values[indexForPatternPass*2+1] == True:
-            if timeStampAdded == False:
-                tempLogStatsToPost[key] = 'timeStamp=' + timeStamp
-                timeStampAdded = True
-
-            tempLogStatsToPost[key] += ",{0}_pass={1:.2f}".format(key,float(values[indexForPatternPass*2]) / floatDataPostIntervalInSec)
-            logStats[key][indexForPatternPass*2] = 0
-            postData = True
-        if values[indexForPatternFail*2+1] == True:
-            if timeStampAdded == False:
-                tempLogStatsToPost[key] = 'timeStamp=' + timeStamp
-                timeStampAdded = True
-            tempLogStatsToPost[key] += ",{0}_fail={1:.2f}".format(key,float(values[indexForPatternFail*2]) / floatDataPostIntervalInSec)
-            logStats[key][indexForPatternFail*2] = 0
-            postData = True
-        if values[indexForPatternCount*2+1] == True:
-            if timeStampAdded == False:
-                tempLogStatsToPost[key] = 'timeStamp=' + timeStamp
-                timeStampAdded = True
-            tempLogStatsToPost[key] += ",{0}_count={1:.2f}".format(key, float(values[indexForPatternCount*2])/ floatDataPostIntervalInSec)
-            logStats[key][indexForPatternCount*2] = 0
-            postData = True
-
-        if values[indexForPatternSum*2] > 0 :
-            if timeStampAdded == False:
-                tempLogStatsToPost[key] = 'timeStamp=' + timeStamp
-                timeStampAdded = True
-            postData = True
+                            print("DEBUG-1 Better to add other DBDetails for :|{0}|".format(values.DBDetails))
+
+        if values.timeStamp != None:
+            # if the sample has it's own timestamp, use it to post the data to web
+            timeStamp = datetime.datetime.fromtimestamp(values.timeStamp).strftime(values.timeStampFormat)
+
+        ### stats of current key are collected in tempStatsParts and joined once to prepare the data to post
+        tempStatsParts = []
+
+        if values.passPresent == True:
+            tempStatsParts.append(",{0}_pass={1:.2f}".format(key,float(values.passCount) / floatDataPostIntervalInSec))
+            values.passCount = 0
+        if values.failPresent == True:
+            tempStatsParts.append(",{0}_fail={1:.2f}".format(key,float(values.failCount) / floatDataPostIntervalInSec))
+            values.failCount = 0
+        if values.countPresent == True:
+            tempStatsParts.append(",{0}_count={1:.2f}".format(key, float(values.countCount)/ floatDataPostIntervalInSec))
+            values.countCount = 0
+
+        ### counts per label are posted as <serviceName>_:<label>:_<postFix>
+        for postFix, labelCounts in ( ('pass', values.passLabelCounts), ('fail', values.failLabelCounts), ('count', values.countLabelCounts) ):
+            if len(labelCounts) > 0:
+                for paramName, tempResult in labelCounts.items():
+                    tempStatsParts.append(",{0}_{1}_{2}={3:.2f}".format( key, paramName, postFix, float(tempResult) / floatDataPostIntervalInSec))
+                labelCounts.clear()
+
+        if values.sumSampleCount > 0 :
             ### sample count is non-zero, stats has value to post
-            tempResults = list(values[indexForPatternSum*2+1])
-
             if debugLevel > 3:
-                print("DEBUG-4 JAPostAllDataToWebServer() PatternSum:{0}".format(tempResults))
+                print("DEBUG-4 JAPostLogStatsToWebServer() PatternSum:{0}".format(values.sumValues))
 
-            ### tempResults is in the form: [ name1, value1, name, value2,....]
+            ### sumValues is in the form: { name1: value1, name2: value2,....}
             ### divide the valueX with sampling interval to get tps value
-            index = 0
-            paramName = ''
-            
-            while index < len(tempResults):
-                tempResult = tempResults[index]
-                if debugLevel > 3:
-                    print("DEBUG-4 JAPostAllDataToWebServer() tempResults[{0}]:|{1}|".format(index,tempResult))
-                if index % 2 > 0:
-                    try:
-                        ### divide the valueX with sampling interval to get tps value
-                        tempResultSum = float(tempResult) / floatDataPostIntervalInSec
-                        tempString = ",{0}_{1}_sum={2:.2f}".format( key, paramName, tempResultSum)                        
-                    except:
-                        tempString = ",{0}_{1}_sum={2}".format( key, paramName, tempResult)
+            for paramName, tempResult in values.sumValues.items():
+                if isinstance(tempResult, float):
+                    tempStatsParts.append(",{0}_{1}_sum={2:.2f}".format( key, paramName, tempResult / floatDataPostIntervalInSec))
+                else:
+                    tempStatsParts.append(",{0}_{1}_sum={2}".format( key, paramName, tempResult))
 
-                    tempLogStatsToPost[key] = "{0}{1}".format(tempLogStatsToPost[key], tempString)
+            ### reset count and values
+            values.sumSampleCount = 0
+            values.sumValues = {}
 
-                else:
-                    ### current index has param name
-                    paramName = tempResult
-                index += 1
-            ### reset count and param list
-            logStats[key][indexForPatternSum*2] = 0
-            logStats[key][indexForPatternSum*2+1] = []
-
-        if values[indexForPatternDelta*2] > 0 :
-            if timeStampAdded == False:
-                tempLogStatsToPost[key] = 'timeStamp=' + timeStamp
-                timeStampAdded = True
-            postData = True
+        if values.deltaSampleCount > 0 :
             ### sample count is non-zero, stats has value to post
-            tempResults = list(values[indexForPatternDelta*2+1])
-
             if debugLevel > 3:
-                print("DEBUG-4 JAPostAllDataToWebServer() PatternDelta:{0}".format(tempResults))
+                print("DEBUG-4 JAPostLogStatsToWebServer() PatternDelta:{0}".format(values.deltaValues))
 
-            ### tempResults is in the form: [ name1, value1, name, value2,....]
+            ### deltaValues is in the form: { name1: value1, name2: value2,....}
             # prev sample value is subracted from current sample to find the change or delta value.
             # these delta values are summed over the sampling interval and divided by sampling intervall to get tps
-            index = 0
-            paramName = ''
-            while index < len(tempResults):
-                tempResult = tempResults[index]
-                if debugLevel > 3:
-                    print("DEBUG-4 JAPostAllDataToWebServer() tempResults[{0}]:|{1}|".format(index,tempResult))
-                if index % 2 > 0:
-                    ### current index has value
-                    try:
-                        ### divide the valueX with sampling interval to get tps value
-                        tempResultDelta = float(tempResult) / floatDataPostIntervalInSec
-                        tempString = ",{0}_{1}_delta={2:.2f}".format( key, paramName, tempResultDelta)
-                    except:
-                        ### not a numeric value, store it as is
-                        tempString = ",{0}_{1}_delta={2}".format( tempLogStatsToPost[key], key, paramName, tempResult)
-                    
-                    tempLogStatsToPost[key] = "{0}{1}".format(tempLogStatsToPost[key], tempString)
-
+            for paramName, tempResult in values.deltaValues.items():
+                if isinstance(tempResult, float):
+                    tempStatsParts.append(",{0}_{1}_delta={2:.2f}".format( key, paramName, tempResult / floatDataPostIntervalInSec))
                 else:
-                    ### current index has param name
-                    paramName = tempResult
-                index += 1
-            ### reset count and param list
-            logStats[key][indexForPatternDelta*2] = 0
-            logStats[key][indexForPatternDelta*2+1] = []
+                    ### not a numeric value, post it as is
+                    tempStatsParts.append(",{0}_{1}_delta={2}".format( key, paramName, tempResult))
+
+            ### reset count and values
+            values.deltaSampleCount = 0
+            values.deltaValues = {}
 
         ### for average type of metrics, need to use sample count of individual key so that for metrics with prefixGroup, 
         ###    average computation uses corresponding sample count
-        ### sampleCountList is of type [2,2,2,2,5,5,5,5] where 
-        ###      first 2 keys/values, the sample count is 2
-        ###      next 2 keys/values, the sample count is 5
-        ### relative position of these sample count map to same position in values[indexForPatternAverage*2+1]
-        sampleCountList = list( values[indexForPatternAverage*2])               
-        if len(sampleCountList) > 0 :
-            if timeStampAdded == False:
-                tempLogStatsToPost[key] = 'timeStamp=' + timeStamp
-                timeStampAdded = True
-            postData = True
+        ### averageSampleCounts has the sample count of the same name in averageValues
+        if len(values.averageSampleCounts) > 0 :
             ### sample count is non-zero, stats has value to post
-            tempResults = list(values[indexForPatternAverage*2+1])
-
             if debugLevel > 3:
-                print("DEBUG-4 JAPostAllDataToWebServer() PatternAverage:{0}, sampleCountList:{1}".format(tempResults, sampleCountList))
+                print("DEBUG-4 JAPostLogStatsToWebServer() PatternAverage:{0}, sampleCounts:{1}".format(values.averageValues, values.averageSampleCounts))
 
-            ### tempResults is in the form: [ name1, value1, name, value2,....]
-            ### divide the valueX with sample count in sampleCountList to get average value
-            index = 0
-            paramName = ''
-            while index < len(tempResults):
-                tempResult = tempResults[index]
-                if debugLevel > 3:
-                    print("DEBUG-4 JAPostAllDataToWebServer() tempResults[{0}]:|{1}|".format(index,tempResult))
-                if index % 2 > 0:
-                    ### current index has value
-                    try:
-                        ### numeric value, compute average
-                        tempResultAverage = float(tempResult) / float(sampleCountList[index])
-                        tempString = ",{0}_{1}_average={2:.2f}".format( key, paramName, tempResultAverage)
-                    except:
-                        ### not a numeric value, store it as is
-                        tempString = ",{0}_{1}_average={2}".format( tempLogStatsToPost[key], key, paramName, tempResult)
+            ### divide the valueX with sample count of that name to get average value
+            for paramName, tempResult in values.averageValues.items():
+                if isinstance(tempResult, float):
+                    tempStatsParts.append(",{0}_{1}_average={2:.2f}".format( key, paramName, tempResult / values.averageSampleCounts[paramName]))
+                else:
+                    ### not a numeric value, post it as is
+                    tempStatsParts.append(",{0}_{1}_average={2}".format( key, paramName, tempResult))
 
-                    tempLogStatsToPost[key] = "{0}{1}".format(tempLogStatsToPost[key], tempString)
+            ### empty both
+            values.averageSampleCounts = {}
+            values.averageValues = {}
 
-                else:
-                    ### current index has param name
-                    paramName = tempResult
-                index += 1
-            ### empty both lists
-            logStats[key][indexForPatternAverage*2] = []
-            logStats[key][indexForPatternAverage*2+1] = []
+        ### for histogram type of metrics, quantiles and max value of each variable are posted
+        if len(values.histogramValues) > 0 :
+            if debugLevel > 3:
+                print("DEBUG-4 JAPostLogStatsToWebServer() PatternHistogram:{0}".format(values.histogramValues))
 
+            for paramName, sketch in values.histogramValues.items():
+                for postFix, quantile in histogramQuantiles:
+                    tempStatsParts.append(",{0}_{1}_{2}={3:.2f}".format( key, paramName, postFix, sketch.quantile(quantile)))
+                tempStatsParts.append(",{0}_{1}_max={2:.2f}".format( key, paramName, sketch.maxValue))
+
+            values.histogramValues = {}
+
+        if len(tempStatsParts) > 0:
+            tempLogStatsToPost[key] = 'timeStamp=' + timeStamp + ''.join(tempStatsParts)
+            postData = True
     
     if postData == True :
         if prevDBType == 'Influxdb' :
@@ -1829,16 +2762,68 @@ def JAPostAllDataToWebServer():
         if JAPostDataToWebServer(tempLogStatsToPost, useRequests, storeUponFailure) == True:
             ### successful posting, increment count
             numPostings += 1
-            print('INFO JAPostAllDataToWebServer() DBType:|{0}|, posted data to web server:|{1}|'.format(prevDBType, webServerURL))
+            print('INFO JAPostLogStatsToWebServer() DBType:|{0}|, posted data to web server:|{1}|'.format(prevDBType, webServerURL))
 
     else:
         if debugLevel > 1:
             print(
-                'DEBUG-2 JAPostAllDataToWebServer() No data to post for the key:{0}\n'.format(key))
+                'DEBUG-2 JAPostLogStatsToWebServer() No data to post\n')
 
-    LogMsg('INFO JAPostAllDataToWebServer() timeStamp: ' + timeStamp +
+    LogMsg('INFO JAPostLogStatsToWebServer() timeStamp: ' + timeStamp +
                        ' Number of stats posted: ' + str(numPostings) + '\n', statsLogFileName, True)
 
+    return numPostings
+
+"""
+JAPostLogStatsBackfill( timeStamp )
+Post stats of previous intervals in logStatsBackfill in the order of interval start time
+"""
+def JAPostLogStatsBackfill( timeStamp ):
+    for intervalStartTime in sorted(logStatsBackfill.keys()):
+        JAPostLogStatsToWebServer( logStatsBackfill[intervalStartTime], timeStamp, False )
+    logStatsBackfill.clear()
+
+"""
+JAPostOpenLogStatsWindows()
+Close all windows still open and post their stats, called before this program exits
+"""
+def JAPostOpenLogStatsWindows():
+    if intervalBucketing == True and len(logStatsWindows) > 0:
+        JACloseLogStatsWindows( True )
+        JAPostLogStatsBackfill( JAGlobalLib.UTCDateTime() )
+
+"""
+def JAPostAllDataToWebServer()
+This function posts all data to web server
+Uses below global variables
+    global logStats
+    global webServerURL, verifyCertificate, logStatsToPost
+
+Return values:
+    None
+
+"""
+
+def JAPostAllDataToWebServer():
+    global logStats, debugLevel, useRequests
+    global webServerURL, verifyCertificate, logStatsToPost, logLinesToPost, logTracesToPost, logEventPriorityLevel
+    timeStamp = JAGlobalLib.UTCDateTime()
+    if debugLevel > 1:
+        print('DEBUG-2 JAPostAllDataToWebServer() ' +
+              timeStamp + ' Posting the stats collected')
+
+    if intervalBucketing == True:
+        JACloseLogStatsWindows()
+
+    ### post stats gathered for previous intervals while catching up with backlog of log files and windows closed
+    JAPostLogStatsBackfill( timeStamp )
+
+    if profileSampleInterval > 0:
+        JAWriteProfile()
+
+    ### stats gathered in windows are posted when the window is closed
+    JAPostLogStatsToWebServer( { key: values for key, values in logStats.items() if key not in logStatsWindowKeys }, timeStamp, True )
+
     numPostings = 0
 
     if maxLogLines > 0:
@@ -1850,16 +2835,15 @@ def JAPostAllDataToWebServer():
             if len(lines) == 0:
                 continue
 
+            ### add count of similar lines to exemplar lines
+            JAAddLogLineCounts(key)
+
             # use temporary buffer for each posting
             tempLogLinesToPost = logLinesToPost.copy()
 
             # tempLogLinesToPost[key] = 'timeStamp=' + timeStamp
-            tempLogLinesToPost[key] = ''
-            
-            ### values has log files in list
-            for line in lines:
-                # line = line.rstrip('\n')
-                tempLogLinesToPost[key] += line
+            ### values has log files in list, joined once
+            tempLogLinesToPost[key] = ''.join(lines)
                 
             if JAPostLogLinesToWebServer(key, tempLogLinesToPost, useRequests) == True:
                 ### successful posting, increment count
@@ -1867,6 +2851,7 @@ def JAPostAllDataToWebServer():
             else:
                 break
             logLinesCount[key] = 0
+            logLinesBytes[key] = 0
 
         ### print result
         errorMsg = "INFO JAPostAllDataToWebServer() DBType:|Loki|, posted {0} log lines to web server: {1}\n".format(numPostings, webServerURL)
@@ -1888,11 +2873,7 @@ def JAPostAllDataToWebServer():
             # use temporary buffer for each posting
             tempLogTracesToPost = logTracesToPost.copy()
 
-            tempLogTracesToPost[key] = ''
-
-            for trace in traces:
-                # line = line.rstrip('\n')
-                tempLogTracesToPost[key] += trace
+            tempLogTracesToPost[key] = ''.join(traces)
 
             logTracesCount[key] = 0
             ### empty the list
@@ -1906,6 +2887,13 @@ def JAPostAllDataToWebServer():
         print(errorMsg)
         LogMsg(errorMsg, statsLogFileName, True)
 
+        if len(traceBlocksEvicted) > 0:
+            errorMsg = "WARN JAPostAllDataToWebServer() trace blocks evicted per key:{0}, block exceeded MaxTraceBlockLines:{1}, MaxTraceBlockBytes:{2} or TraceBlockTimeoutInSec:{3}".format(
+                dict(traceBlocksEvicted), maxTraceBlockLines, maxTraceBlockBytes, traceBlockTimeoutInSec)
+            print(errorMsg)
+            LogMsg(errorMsg, statsLogFileName, True)
+            traceBlocksEvicted.clear()
+
     return True
 
 
@@ -1921,69 +2909,199 @@ If resuming the processing after sleep, resume processing from prev position
 logFileInfo = defaultdict(dict)
 
 
+### checkpoint saved by previous run, { (device, inode): { 'fileName':, 'filePosition':, 'prevTime':, 'fingerprint':, 'fingerprintLength': } }
+logFileCheckpoints = {}
+### number of bytes from the beginning of log file used to derive fingerprint of the log file
+logFileFingerprintLength = 1024
+
 """
-def JAWriteFileInfo()
-Save log file name, file pointer position so that processing can resume from this position next time
+def JAGetLogFileFingerprint( fileName, fingerprintLength )
+Returns crc32 of first fingerprintLength bytes of the log file and number of bytes used
+Along with device and inode, this identifies the log file even if the log file is renamed,
+  and detects new log file created with inode of a deleted log file
 """
+def JAGetLogFileFingerprint( fileName, fingerprintLength = logFileFingerprintLength ):
+    with open(fileName, "rb") as file:
+        tempBytes = file.read(fingerprintLength)
+    return '{0:08x}'.format(zlib.crc32(tempBytes) & 0xffffffff), len(tempBytes)
 
-
+"""
+def JAWriteFileInfo()
+Save log file name, device, inode, fingerprint, file position and prev time of each log file
+  so that processing can resume from this position next time
+One line per log file in json format.
+Pending ranges of log file are saved in separate line, with log file name spec and
+  list of [startPosition, endPosition, processedPriorityLevel] in pendingRanges
+Data is written to temporary file first and renamed to cache file so that partially written cache file is never read
+"""
 def JAWriteFileInfo():
-    global JAGatherLogStatsCache
+    tempCacheFileName = cacheLogFileName + '.tmp'
     try:
-        with open(cacheLogFileName, "w") as file:
-            numItems = 0
-
-            for key, value in logFileInfo.items():
-                tempPosition = logFileInfo[key]['filePosition']
-                tempPrevTime = logFileInfo[key]['prevTime']
-                file.write('{0} {1} {2}'.format(
-                    key, tempPosition, tempPrevTime))
+        numItems = 0
+        with open(tempCacheFileName, "w") as file:
+            for fileName, value in logFileInfo.items():
+                tempPosition = value.get('filePosition')
+                if tempPosition == None or tempPosition == 'ERROR':
+                    continue
+                try:
+                    fileStat = os.stat(fileName)
+                    fingerprint, fingerprintLength = JAGetLogFileFingerprint( fileName )
+                except OSError:
+                    ### log file not present anymore
+                    continue
+                file.write( json.dumps( {
+                    'fileName': fileName, 'device': fileStat.st_dev, 'inode': fileStat.st_ino,
+                    'fingerprint': fingerprint, 'fingerprintLength': fingerprintLength,
+                    'filePosition': int(tempPosition), 'prevTime': value.get('prevTime') }) + '\n')
                 numItems += 1
-                # close log file that was opened before
-                # logFileInfo[key]['filePointer'].close()
 
-            file.close()
-        LogMsg('INFO  JAWriteFileInfo() Wrote {0} log file info items to cache file: {1}\n'.format(
-            numItems, cacheLogFileName), statsLogFileName, True)
+            ### lines of pending ranges are before the file position saved above, processed after restart
+            for tempPendingRanges in (logFilePendingRanges, logFilePendingRangesWorkers):
+                for logFileName, pendingRangesOfFiles in tempPendingRanges.items():
+                    for fileName, pendingRanges in pendingRangesOfFiles.items():
+                        if len(pendingRanges) == 0:
+                            continue
+                        try:
+                            fileStat = os.stat(fileName)
+                            fingerprint, fingerprintLength = JAGetLogFileFingerprint( fileName )
+                        except OSError:
+                            continue
+                        ### ranges of file rotated since are not saved, these can not be processed
+                        fileId = [fileStat.st_dev, fileStat.st_ino]
+                        tempRanges = [ pendingRange[:3] for pendingRange in pendingRanges if pendingRange[3] == fileId ]
+                        if len(tempRanges) == 0:
+                            continue
+                        file.write( json.dumps( {
+                            'logFileName': logFileName, 'fileName': fileName, 'device': fileStat.st_dev, 'inode': fileStat.st_ino,
+                            'fingerprint': fingerprint, 'fingerprintLength': fingerprintLength,
+                            'pendingRanges': tempRanges }) + '\n')
+                        numItems += 1
+            file.flush()
+            os.fsync(file.fileno())
+
+        if sys.version_info[0] < 3:
+            if OSType == 'Windows' and os.path.exists(cacheLogFileName):
+                os.remove(cacheLogFileName)
+            os.rename(tempCacheFileName, cacheLogFileName)
+        else:
+            os.replace(tempCacheFileName, cacheLogFileName)
 
+        if debugLevel > 0:
+            print('DEBUG-1 JAWriteFileInfo() Wrote {0} log file info items to cache file: {1}'.format(
+                numItems, cacheLogFileName))
         return True
 
     except OSError as err:
-        errorMsg = 'ERROR - JAWriteFileInfo() Can not open file ' + JAGatherLogStatsCache + \
+        errorMsg = 'ERROR - JAWriteFileInfo() Can not write file ' + cacheLogFileName + \
             ' to save log file info ' + "OS error: {0}".format(err) + '\n'
         print(errorMsg)
         LogMsg(errorMsg, statsLogFileName, True)
         return False
 
-
 """
 def JAReadFileInfo()
-Read log file name, file pointer position so that processing can resume from this position
+Read log file info saved by JAWriteFileInfo() in prev run to logFileCheckpoints
+Pending ranges saved are restored to logFilePendingRanges, see JARestorePendingRanges()
+Lines not in expected format (like cache file written by older version) are ignored
 """
-
-
 def JAReadFileInfo():
     try:
         if os.path.exists(cacheLogFileName) == False:
             return False
         with open(cacheLogFileName, "r") as file:
-            while True:
-                tempLine = file.readline()
-                if not tempLine:
-                    break
-                fields = tempLine.split(' ')
-                if len(fields) >= 3:
-                    logFileInfo[fields[0]]['fileName'] = fields[0]
-                    logFileInfo[fields[0]]['filePosition'] = fields[1]
-                    logFileInfo[fields[0]]['prevTime'] = fields[2]
-            file.close()
+            for tempLine in file:
+                try:
+                    checkpoint = json.loads(tempLine)
+                    if 'pendingRanges' in checkpoint:
+                        JARestorePendingRanges( checkpoint )
+                        continue
+                    checkpoint['filePosition'] = int(checkpoint['filePosition'])
+                    checkpoint['fingerprintLength'] = int(checkpoint['fingerprintLength'])
+                    logFileCheckpoints[ (checkpoint['device'], checkpoint['inode']) ] = checkpoint
+                except (ValueError, KeyError, TypeError):
+                    continue
+        if debugLevel > 0:
+            print('DEBUG-1 JAReadFileInfo() Read {0} log file info items from cache file: {1}'.format(
+                len(logFileCheckpoints), cacheLogFileName))
         return True
 
     except OSError as err:
         errorMsg = 'INFO - JAReadFileInfo() Can not open file ' + cacheLogFileName + \
-            'to read log file info ' + "OS error: {0}".format(err) + '\n'
+            ' to read log file info ' + "OS error: {0}".format(err) + '\n'
         print(errorMsg)
         LogMsg(errorMsg, statsLogFileName, True)
+        return False
+
+"""
+def JARestorePendingRanges( checkpoint )
+Restore pending ranges saved by prev run if log file name spec is still present in config
+  and the file with that name is still the same file, device, inode and fingerprint of first bytes are same
+Returns True if pending ranges are restored
+"""
+def JARestorePendingRanges( checkpoint ):
+    logFileName = checkpoint['logFileName']
+    fileName = checkpoint['fileName']
+    if logFileName not in JAStatsSpec:
+        return False
+    try:
+        fileStat = os.stat(fileName)
+        if fileStat.st_dev != checkpoint['device'] or fileStat.st_ino != checkpoint['inode']:
+            return False
+        fingerprint, fingerprintLength = JAGetLogFileFingerprint( fileName, int(checkpoint['fingerprintLength']) )
+    except OSError:
+        return False
+    if fingerprint != checkpoint['fingerprint'] or fingerprintLength != int(checkpoint['fingerprintLength']):
+        return False
+
+    pendingRanges = []
+    pendingBytes = 0
+    for startPosition, endPosition, tempProcessedPriorityLevel in checkpoint['pendingRanges']:
+        startPosition, endPosition = int(startPosition), int(endPosition)
+        if startPosition < endPosition <= fileStat.st_size:
+            pendingRanges.append( [startPosition, endPosition, int(tempProcessedPriorityLevel), [fileStat.st_dev, fileStat.st_ino]] )
+            pendingBytes += endPosition - startPosition
+    if len(pendingRanges) == 0:
+        return False
+    logFilePendingRanges[logFileName][fileName] = pendingRanges
+    errorMsg = 'INFO - JARestorePendingRanges() restored {0} pending ranges, {1} bytes, of logFile:|{2}|'.format(
+        len(pendingRanges), pendingBytes, fileName)
+    print(errorMsg)
+    LogMsg(errorMsg, statsLogFileName, True)
+    return True
+
+"""
+def JAResumeLogFileFromCheckpoint( fileName )
+If checkpoint saved by prev run matches to the log file, set logFileInfo so that processing resumes from saved position
+Log file matches to the checkpoint when device, inode are same, file size is not less than saved position
+  and fingerprint of first bytes is same as the fingerprint saved
+Returns True if processing can resume from saved position
+"""
+def JAResumeLogFileFromCheckpoint( fileName ):
+    if len(logFileCheckpoints) == 0:
+        return False
+    try:
+        fileStat = os.stat(fileName)
+        checkpointKey = (fileStat.st_dev, fileStat.st_ino)
+        checkpoint = logFileCheckpoints.get( checkpointKey )
+        if checkpoint == None or fileStat.st_size < checkpoint['filePosition']:
+            return False
+        fingerprint, fingerprintLength = JAGetLogFileFingerprint( fileName, checkpoint['fingerprintLength'] )
+    except OSError:
+        return False
+    if fingerprint != checkpoint['fingerprint'] or fingerprintLength != checkpoint['fingerprintLength']:
+        return False
+
+    ### checkpoint is used only once
+    del logFileCheckpoints[checkpointKey]
+    logFileInfo[fileName]['fileName'] = fileName
+    logFileInfo[fileName]['filePointer'] = None
+    logFileInfo[fileName]['filePosition'] = checkpoint['filePosition']
+    logFileInfo[fileName]['prevTime'] = checkpoint['prevTime']
+    errorMsg = 'INFO - JAResumeLogFileFromCheckpoint() resuming logFile:|{0}| from position:{1}, saved for logFile:|{2}|'.format(
+        fileName, checkpoint['filePosition'], checkpoint['fileName'])
+    print(errorMsg)
+    LogMsg(errorMsg, statsLogFileName, True)
+    return True
 
 """
 Execute command if elapsed time is greater than IntervalInSec specified for that command
@@ -2020,7 +3138,7 @@ def JAProcessCommands( logFileProcessingStartTime, debugLevel):
         if gatherLogStatsEnabled == True:
             eventPriority = int(values[indexForCommandPriority])
 
-            if averageCPUUsage > maxCPUUsageForEvents[eventPriority]:
+            if eventPriority > allowedPriorityLevel:
                 if logEventPriorityLevel == maxCPUUsageLevels:
                     ### first time log file processing skipped, store current event priority
                     logEventPriorityLevel = eventPriority
@@ -2053,7 +3171,8 @@ def JAProcessCommands( logFileProcessingStartTime, debugLevel):
 ## temp storage while processing block of logs or traces with BlockStart, BlockEnd spec
 # used to cache log lines starting from BlockStart line so that any future match to 
 #  traceIdLine followed by BlockEnd can be used to log all lines within the block
-tempLogLine = ''
+# block state is kept per (fileName, key) so that blocks of different keys of a log file can be in progress at the same time
+tempLogLines = defaultdict(str)
 tempDuration = defaultdict(dict)
 tempTraceLine = defaultdict(dict)
 traceBlockInProgress = defaultdict(dict)
@@ -2064,104 +3183,171 @@ traceBlockStartLine = defaultdict(dict)
 traceBlockContains = defaultdict(dict)
 traceStatusMatch = defaultdict(dict)
 
+### trace block in progress is evicted, lines collected so far discarded, when it exceeds maxTraceBlockLines or
+###   maxTraceBlockBytes, or when block end is not seen within traceBlockTimeoutInSec
+### key - (fileName, key), present only while that block is in progress
+traceBlockStartTime = {}
+traceBlockLineCount = defaultdict(int)
+traceBlockBytes = defaultdict(int)
+### number of trace blocks in progress per fileName
+traceBlocksInProgressCount = defaultdict(int)
+### number of trace blocks evicted per key, logged and reset by JAPostAllDataToWebServer()
+traceBlocksEvicted = defaultdict(int)
+### new line at the end of trace log line is removed while forming the lines to post
+trailingNewLine = re.compile("\n$")
+
+"""
+JAStartTraceBlock( blockKey ), JAEndTraceBlock( blockKey )
+Track the trace block of (fileName, key) in progress for eviction
+"""
+def JAStartTraceBlock( blockKey ):
+    if blockKey not in traceBlockStartTime:
+        traceBlocksInProgressCount[blockKey[0]] += 1
+    traceBlockStartTime[blockKey] = time.time()
+    traceBlockLineCount[blockKey] = traceBlockBytes[blockKey] = 0
+
+def JAEndTraceBlock( blockKey ):
+    traceBlockInProgress[blockKey] = None
+    if blockKey in traceBlockStartTime:
+        del traceBlockStartTime[blockKey]
+        traceBlocksInProgressCount[blockKey[0]] -= 1
+
+"""
+JAEvictTraceBlock( blockKey, reason )
+Discard the lines collected for trace block of (fileName, key) in progress and count it in traceBlocksEvicted
+"""
+def JAEvictTraceBlock( blockKey, reason ):
+    fileName, key = blockKey
+    JAEndTraceBlock( blockKey )
+    traceBlockLogLines[blockKey] = []
+    tempTraceLine[blockKey] = tempDuration[blockKey] = ''
+    traceBlocksEvicted[key] += 1
+    if debugLevel > 0:
+        print("DEBUG-1 JAEvictTraceBlock() evicted trace block of key:{0}, log file:{1}, reason:{2}, lines:{3}, bytes:{4}".format(
+            key, fileName, reason, traceBlockLineCount[blockKey], traceBlockBytes[blockKey]))
+
+"""
+JAExpireTraceBlocks( keySpecs )
+Evict trace blocks of given keys that are in progress for more than traceBlockTimeoutInSec
+"""
+def JAExpireTraceBlocks( keySpecs ):
+    if len(traceBlockStartTime) == 0:
+        return
+    currentTime = time.time()
+    for blockKey, startTime in list(traceBlockStartTime.items()):
+        if blockKey[1] in keySpecs and currentTime - startTime > traceBlockTimeoutInSec:
+            JAEvictTraceBlock( blockKey, 'timeout' )
+
 def JAProcessLineForTrace( tempLine, fileName, key, values, keyDebugLevel ):
 
     global tracePatternIndexsList, logTracesCount, maxTraceLines, tempTraceLine, traceId, traceBlockStartKey
-    global tempLogLine , tempDuration
+    global tempDuration
+
+    blockKey = (fileName, key)
+    tracePatterns = values.tracePatterns
+    if values.traceFilter != None:
+        if profileLine == True:
+            myResults = JAProfilePattern( values.traceFilter, False, tempLine, key, 'trace', 'traceFilter' )
+        else:
+            myResults = values.traceFilter.search( tempLine)
+        if myResults == None:
+            ### none of the trace patterns is present in current line, nothing to collect unless trace block is in progress
+            if traceBlockInProgress[blockKey] != key:
+                return False
+            tracePatterns = ()
 
     tempAddNEWLINE = tempAppendTraceLine = False
     patternTraceMatched = False
+    ### line being formed is carried to next line till it is collected
+    tempLogLine = tempLogLines[blockKey]
 
     if keyDebugLevel > 2 :
         print( "\n\nDEBUG-3 JAProcessLineForTrace() processing log file:{0}, line:{1}, trace key:{2}, trace definition:{3}".format(fileName,tempLine,key, values))    
 
-    ### if trace block processing is in progress, 
-    #       proceed if current key passed match to traceBlockStartKey
-    
-    if traceBlockInProgress[fileName] != None:
-        if len(traceBlockInProgress[fileName]) > 0:
-            if ( key != traceBlockInProgress[fileName]):
-                return False
-            else:
-                tempAppendTraceLine = True
+    ### if trace block processing is in progress for current key, collect current line
+    if traceBlockInProgress[blockKey] == key:
+        tempAppendTraceLine = True
 
-    tempTraceSingleLine = values[indexForTraceSingleLine]
+    tempTraceSingleLine = values.traceSingleLine
     if ( tempTraceSingleLine == True ) :
-        tempLogLine = tempTraceLine[fileName] = ''
+        tempLogLine = tempTraceLine[blockKey] = ''
         if keyDebugLevel > 2 :
             print( "DEBUG-3 JAProcessLineForTrace() trace definitions in single line for current key:{0}".format(key))    
 
     ### see whether current line match to any trace definitions
-    for index in tracePatternIndexsList:
-
-        if values[index] == None:
-            continue
+    ### only the patterns defined for current key are present in values.tracePatterns
+    for index, searchPattern in tracePatterns:
 
         ### search for other patterns like indexForTraceId, indexForTraceBlockStart
         #   PatternTraceTimeStamp, indexForTraceLabel, indexForDuration
-        searchPattern = r'{0}'.format(values[index])
 
         if keyDebugLevel > 3:
-            print("DEBUG-4 JAProcessLineForTrace() searching for the pattern:{0}".format(searchPattern) )
-
-        try:
-            myResults = re.findall( searchPattern, tempLine)
-            patternMatchCount =  len(myResults)
-            if myResults != None and patternMatchCount > 0 :
-                
-                if index == indexForTraceBlockEnd:
-                    if traceBlockInProgress[fileName] == key:
-                        if keyDebugLevel > 3:
-                            print("DEBUG-4 JAProcessLineForTrace() End trace block:{0}".format(traceBlockInProgress[fileName]) )
-                        ### trace block end pattern in current line
-                        traceBlockInProgress[fileName] = None
-                        tempAddNEWLINE = True
-                        tempAppendTraceLine = True
-
-                ### if TraceBlockStart, set the flag so that subsequent log lines are collected till TraceBlockEnd
-                elif index == indexForTraceBlockStart:
-                    tempAppendTraceLine = True
-                    tempLogLine = tempTraceLine[fileName] = tempDuration[fileName] =  ''
-                    traceBlockTraceId[fileName] = traceBlockTimeStamp[fileName] = ''
-                    traceBlockLogLines[fileName] = []
-                    traceBlockInProgress[fileName] = key
-                    traceBlockContains[fileName] = False
-                    traceStatusMatch[fileName] = False
-
-                    if keyDebugLevel > 3:
-                        print("DEBUG-4 JAProcessLineForTrace() Start trace block:{0}".format(traceBlockInProgress[fileName]) )
-                else:
-                    if keyDebugLevel > 3:
-                        print("DEBUG-4 JAProcessLineForTrace() processing single trace line definition:{0}, matched pattern:{1}".format(key, searchPattern)) 
-
-                groupNumber = 0
-                if tempTraceLine[fileName] == '':
-                    """
-                    trace data to be posted to the web server is in the form
-                    id=<number>,timestamp=<logTimeInMicroSec>,duration=<inMicroSec>,name=logFileName,serviceName=key
-                    """
-                    tempTraceLine[fileName] = r'id={0},parentId={1},name={2},serviceName={3}'.format( traceId, values[indexForTraceParentId], fileName, key)
-
-                stringToAppendAtTheEndOfCurrentLine = ''
-                ### if pattern matches to single instance in line, len(myResults) will be 1
-                ###     myResults is of the form = [ (key1, value1, key2, value2....)]
-                ### if pattern matches to multiple instances in line, len(myResults) will be > 1
-                while patternMatchCount > 0:
-                    patternMatchCount -= 1
-
-                    tempResults = myResults.pop(0)
+            print("DEBUG-4 JAProcessLineForTrace() searching for the pattern:{0}".format(searchPattern.pattern) )
 
+        if profileLine == True:
+            myResults = JAProfilePattern( searchPattern, True, tempLine, key, 'trace', specForRegexPatterns[index] )
+        else:
+            myResults = searchPattern.findall( tempLine)
+        patternMatchCount =  len(myResults)
+        if myResults != None and patternMatchCount > 0 :
+            
+            if index == indexForTraceBlockEnd:
+                if traceBlockInProgress[blockKey] == key:
                     if keyDebugLevel > 3:
-                        print("DEBUG-4 JAProcessLineForTrace() pattern groups matched:{0}".format(tempResults) )
+                        print("DEBUG-4 JAProcessLineForTrace() End trace block:{0}".format(traceBlockInProgress[blockKey]) )
+                    ### trace block end pattern in current line
+                    JAEndTraceBlock( blockKey )
+                    tempAddNEWLINE = True
+                    tempAppendTraceLine = True
 
-                    for tempResult in tempResults:
-                        groupNumber += 1
+            ### if TraceBlockStart, set the flag so that subsequent log lines are collected till TraceBlockEnd
+            elif index == indexForTraceBlockStart:
+                if traceBlockInProgress[blockKey] == key:
+                    ### block in progress is not ended, its lines are discarded, count it as evicted
+                    JAEvictTraceBlock( blockKey, 'restarted' )
+                tempAppendTraceLine = True
+                tempLogLine = tempTraceLine[blockKey] = tempDuration[blockKey] =  ''
+                traceBlockTraceId[blockKey] = traceBlockTimeStamp[blockKey] = ''
+                traceBlockLogLines[blockKey] = []
+                traceBlockInProgress[blockKey] = key
+                JAStartTraceBlock( blockKey )
+                traceBlockContains[blockKey] = False
+                traceStatusMatch[blockKey] = False
 
-                        # if current pattern is PatternTimeStamp  of block start line where timestamp is expected to be present
-                        if index == indexForTimeStamp or (values[indexForTimeStamp] == None \
-                                and index == indexForTraceBlockStart):
+                if keyDebugLevel > 3:
+                    print("DEBUG-4 JAProcessLineForTrace() Start trace block:{0}".format(traceBlockInProgress[blockKey]) )
+            else:
+                if keyDebugLevel > 3:
+                    print("DEBUG-4 JAProcessLineForTrace() processing single trace line definition:{0}, matched pattern:{1}".format(key, searchPattern)) 
+
+            groupNumber = 0
+            if tempTraceLine[blockKey] == '':
+                """
+                trace data to be posted to the web server is in the form
+                id=<number>,timestamp=<logTimeInMicroSec>,duration=<inMicroSec>,name=logFileName,serviceName=key
+                """
+                tempTraceLine[blockKey] = r'id={0},parentId={1},name={2},serviceName={3}'.format( traceId, values.traceParentId, fileName, key)
+
+            stringToAppendAtTheEndOfCurrentLine = ''
+            ### actions of group numbers prepared while reading the config, see JAServiceSpec.traceGroupActions()
+            groupActions = values.traceActions[index]
+            blockContainsPattern = index == indexForTraceBlockContains and tempTraceSingleLine != True
+            ### words of current line, joined to form original line
+            lineParts = []
+            ### if pattern matches to single instance in line, len(myResults) will be 1
+            ###     myResults is of the form = [ (key1, value1, key2, value2....)]
+            ### if pattern matches to multiple instances in line, len(myResults) will be > 1
+            for tempResults in myResults:
 
-                            if values[indexForTimeStampGroup] == groupNumber :
+                if keyDebugLevel > 3:
+                    print("DEBUG-4 JAProcessLineForTrace() pattern groups matched:{0}".format(tempResults) )
+
+                for tempResult in tempResults:
+                    groupNumber += 1
+                    actions = groupActions.get(groupNumber)
+                    if actions != None:
+                        for action in actions:
+                            if action == traceActionTimeStamp:
                                 tempAppendTraceLine = True
 
                                 ### current tempResult is the timestamp field
@@ -2169,7 +3355,7 @@ def JAProcessLineForTrace( tempLine, fileName, key, values, keyDebugLevel ):
                                 ### format spec at https://www.tutorialspoint.com/python/time_strptime.htm
 
                                 # ensure the dateTimeString has 6 digits in fraction space, needed for loki time format
-                                if ( values[indexForTimeStampFormat] == '%Y-%m-%dT%H:%M:%S.%f' or values[indexForTimeStampFormat] == '%Y-%m-%d %H:%M:%S.%f') :
+                                if ( values.timeStampFormat == '%Y-%m-%dT%H:%M:%S.%f' or values.timeStampFormat == '%Y-%m-%d %H:%M:%S.%f') :
                                     # 2022-06-05 12:48:00.000000
                                     # 01234567890123456789012345 - length 26
                                     # 2022-06-05 12:48:00.000
@@ -2178,13 +3364,14 @@ def JAProcessLineForTrace( tempLine, fileName, key, values, keyDebugLevel ):
                                         tempResult = tempResult + "000"
 
                                 traceTimeStamp = int(JAGlobalLib.JAConvertStringTimeToTimeInMicrosec(tempResult, 
-                                                    values[indexForTimeStampFormat] ) )
+                                                    values.timeStampFormat ) )
                                 if ( traceTimeStamp == 0 ) :
-                                    errorMsg = "ERROR Invalid TimeStampFormat:{0}".format(values[indexForTimeStampFormat]) 
+                                    errorMsg = "ERROR Invalid TimeStampFormat:{0}".format(values.timeStampFormat) 
                                     print(errorMsg)
                                     LogMsg(errorMsg, statsLogFileName, True)
                                     ### DO NOT attempt to convert time next time
-                                    values[indexForTimeStampGroup] = None
+                                    values.timeStampGroup = None
+                                    values.traceActions = values.traceGroupActions()
                                     ### get current time in microseconds, default time for trace
                                     tempTimeStamp = int(time.time() * 1000000)
                                     
@@ -2193,162 +3380,133 @@ def JAProcessLineForTrace( tempLine, fileName, key, values, keyDebugLevel ):
 
                                     ### loki needs the time stamp with fraction second upto microseconds
                                     ###  add ".000000" to get time with only up to seconds to get in microseconds
-                                    if ( values[indexForTimeStampFormat] == '%Y-%m-%dT%H:%M:%S' or values[indexForTimeStampFormat] == '%Y-%m-%d %H:%M:%S'  ) :
+                                    if ( values.timeStampFormat == '%Y-%m-%dT%H:%M:%S' or values.timeStampFormat == '%Y-%m-%d %H:%M:%S'  ) :
                                         tempResult = tempResult + ".000000" 
                                     ### replace space separator between date and time with T, loki needs in isoformat
                                     tempResult = tempResult.replace(" ", "T")
-                                tempTraceLine[fileName] =  r"{0},timestamp={1}".format(tempTraceLine[fileName], tempTimeStamp)
-                                traceBlockTimeStamp[fileName] = tempResult
+                                tempTraceLine[blockKey] =  r"{0},timestamp={1}".format(tempTraceLine[blockKey], tempTimeStamp)
+                                traceBlockTimeStamp[blockKey] = tempResult
 
-                        if tempTraceSingleLine == True or index == indexForTraceId or \
-                            ( values[indexForTraceId] == None and index == indexForTraceBlockStart):
-                            ### current line has trace id
-                            if values[indexForTraceIdGroup] == groupNumber :
+                            elif action == traceActionTraceId:
                                 ### current tempResult is the traceid field
                                 ### remove -, _, g to Z from trace id field
-                                xlatedTraceId = re.sub(r'-|_|[g-zG-Z]', "", tempResult)
-                                tempTraceLine[fileName] = r'{0},traceId={1}'.format(tempTraceLine[fileName],xlatedTraceId)
+                                xlatedTraceId = traceIdCharsToRemove.sub("", tempResult)
+                                tempTraceLine[blockKey] = r'{0},traceId={1}'.format(tempTraceLine[blockKey],xlatedTraceId)
                                 tempAppendTraceLine = True
-                                traceBlockTraceId[fileName] = xlatedTraceId
+                                traceBlockTraceId[blockKey] = xlatedTraceId
 
                                 ### 1st line of trace block will get the traceId later, DO NOT add here for that condition                                
                                 if index != indexForTraceBlockStart:
                                     ### Add trace id to current line at the end end with indexForTraceIdPrefix 
                                     ### This is needed so that loki can locate the log line using trace id with space around it
-                                    if values[indexForTraceIdPrefix] != None:
-                                        stringToAppendAtTheEndOfCurrentLine =  r' {0}{1}'.format(values[indexForTraceIdPrefix], xlatedTraceId)   
+                                    if values.traceIdPrefix != None:
+                                        stringToAppendAtTheEndOfCurrentLine =  r' {0}{1}'.format(values.traceIdPrefix, xlatedTraceId)   
                                     else:
                                         stringToAppendAtTheEndOfCurrentLine =  r' TraceId={0}'.format(xlatedTraceId)
 
-                        if  (tempTraceSingleLine == True or index == indexForTraceBlockStatus) or \
-                            (values[indexForTraceBlockStatus] == None and index == indexForTraceBlockStart ):
-                            ### current line has status code
-                            if values[indexForTraceStatusGroup] == groupNumber and values[indexForTraceStatus] != None:
+                            elif action == traceActionStatus:
                                 ### current tempResult is the status field
                                 ### check whether the current status match to regex specified
-                                try:
-                                    tempStatusCode = re.match( values[indexForTraceStatus], tempResult)
-                                    if tempStatusCode != None:
-                                        ### status match, collect current trace line or trace block
-                                        tempAppendTraceLine = True
-                                        traceStatusMatch[fileName] = True
-                                        tempTraceLine[fileName] = r'{0},status={1}'.format(tempTraceLine[fileName],tempResult)
-                                    else:
-                                        # status DOES not match to desired spec, DO NOT collect corrent trace line or trace block
-                                        traceStatusMatch[fileName] = False
+                                tempStatusCode = values.traceStatus.match( tempResult)
+                                if tempStatusCode != None:
+                                    ### status match, collect current trace line or trace block
+                                    tempAppendTraceLine = True
+                                    traceStatusMatch[blockKey] = True
+                                    tempTraceLine[blockKey] = r'{0},status={1}'.format(tempTraceLine[blockKey],tempResult)
+                                else:
+                                    # status DOES not match to desired spec, DO NOT collect corrent trace line or trace block
+                                    traceStatusMatch[blockKey] = False
 
-                                except re.error as err:
-                                    errorMsg = "ERROR invalid pattern:|{0}|, regular expression error:|{1}|".format(values[indexForTraceStatus],err)
-                                    print(errorMsg)
-                                    LogMsg(errorMsg, statsLogFileName, True)
-                                    ### discard this pattern so that no need to check this again
-                                    values[index] = None
-                                    continue
-
-                        if tempTraceSingleLine == True or index == indexForTraceLabel or \
-                            ( values[indexForTraceLabel] == None and index == indexForTraceBlockStart) :
-                            ### trace label can be on it's own line or
-                            ###   or can be part of traceId or traceBlockStart line
-                            if values[indexForTraceLabelGroup] == groupNumber:
-                                tempTraceLine[fileName] = r"{0},label={1}".format(tempTraceLine[fileName],tempResult)
+                            elif action == traceActionLabel:
+                                ### trace label can be on it's own line or
+                                ###   or can be part of traceId or traceBlockStart line
+                                tempTraceLine[blockKey] = r"{0},label={1}".format(tempTraceLine[blockKey],tempResult)
                                 tempAppendTraceLine = True
 
-                        if tempTraceSingleLine == True or index == indexForDuration or \
-                            (values[indexForDuration] == None and index == indexForTraceBlockStart) :
-                            ### trace duration can be on its own line or
-                            ###  or can be part of traceId or traceBlockStart line
-                            if values[indexForDurationGroup] == groupNumber:
-                                tempTraceLine[fileName] = r"{0},duration={1}__NEWLINE__".format(tempTraceLine[fileName],tempResult)
-                                tempDuration[fileName] = tempResult
+                            elif action == traceActionDuration:
+                                ### trace duration can be on its own line or
+                                ###  or can be part of traceId or traceBlockStart line
+                                tempTraceLine[blockKey] = r"{0},duration={1}__NEWLINE__".format(tempTraceLine[blockKey],tempResult)
+                                tempDuration[blockKey] = tempResult
                                 tempAppendTraceLine = True
 
-                        if tempTraceSingleLine == True or index == indexForSkip or \
-                            (values[indexForSkip] == None and index == indexForTraceBlockStart):
-                            if values[indexForSkipGroups] != None:
+                            else:
                                 ### SKIP words can be on its own line or
                                 ###  or can be part of traceId or traceBlockStart line
-                                if str(groupNumber) in values[indexForSkipGroups]:
-                                    ### SKIP current group
-                                    tempResult = '_MASKED_'                                                                
-                                    tempAppendTraceLine = True
+                                tempResult = '_MASKED_'                                                                
+                                tempAppendTraceLine = True
 
-                        if  (tempTraceSingleLine == None or tempTraceSingleLine == False)  and index == indexForTraceBlockContains:
-                            ### current line contains the desired 
-                            traceBlockContains[fileName] = True
-                            
-                        ### append current word to form original line
-                        tempLogLine = tempLogLine + r'{0}'.format(tempResult)
-                
-                ### remove \n from line
-                tempLogLine = re.sub("\n$", '', tempLogLine) + stringToAppendAtTheEndOfCurrentLine
-                # found a matching pattern in current line, NO more search for any other pattern
-                ### get out of for loop
-                break
+                    if blockContainsPattern == True:
+                        ### current line contains the desired 
+                        traceBlockContains[blockKey] = True
+                        
+                    ### append current word to form original line
+                    lineParts.append( tempResult )
+            tempLogLine = tempLogLine + ''.join(lineParts)
+            
+            ### remove \n from line
+            tempLogLine = trailingNewLine.sub('', tempLogLine) + stringToAppendAtTheEndOfCurrentLine
+            # found a matching pattern in current line, NO more search for any other pattern
+            ### get out of for loop
+            break
 
-        except re.error as err:
-            errorMsg = "ERROR invalid pattern:|{0}|, regular expression error:|{1}|".format(searchPattern,err)
-            print(errorMsg)
-            LogMsg(errorMsg, statsLogFileName, True)
-            ### discard this pattern so that no need to check this again
-            values[index] = None
-            continue
 
     if keyDebugLevel > 3:
-        print("DEBUG-4 JAProcessLineForTrace() timeStamp:{0}, traceId:{1}".format(traceBlockTimeStamp[fileName], traceBlockTraceId[fileName]) )
+        print("DEBUG-4 JAProcessLineForTrace() timeStamp:{0}, traceId:{1}".format(traceBlockTimeStamp[blockKey], traceBlockTraceId[blockKey]) )
 
     if tempAppendTraceLine == True :
-        if (values[indexForTraceStatus] == None) or (values[indexForTraceStatus] != None and traceStatusMatch[fileName] == True) :
+        if (values.traceStatus == None) or (values.traceStatus != None and traceStatusMatch[blockKey] == True) :
             ### trace status check is not needed or status check matched, collect this trace.
-            if tempDuration[fileName] == None or tempDuration[fileName] == '':
-                if traceBlockInProgress[fileName] == None:
+            if tempDuration[blockKey] == None or tempDuration[blockKey] == '':
+                if traceBlockInProgress[blockKey] == None:
                     ### default to 1000 (1ms)
-                    tempTraceLine[fileName] = tempTraceLine[fileName] + r",duration={0}__NEWLINE__".format(1000)                   
+                    tempTraceLine[blockKey] = tempTraceLine[blockKey] + r",duration={0}__NEWLINE__".format(1000)                   
             
             if ( tempAddNEWLINE == True) :
 
                 tempIncludeCurrentBlock = True
-                if values[indexForTraceBlockContains] != None :
-                    if traceBlockContains[fileName] == False:
+                if values.traceBlockContains != None :
+                    if traceBlockContains[blockKey] == False:
                         tempIncludeCurrentBlock = False
-                if traceBlockTraceId[fileName] == '':
+                if traceBlockTraceId[blockKey] == '':
                     ### traceId not found for this block, DO NOT save the lines
                     tempIncludeCurrentBlock = False
                     
                 if tempIncludeCurrentBlock == True:
                     ### remove \n, it will be added later when ___NEWLINE__ is appended
-                    tempLine = re.sub("\n$", '', tempLogLine) 
+                    tempLine = trailingNewLine.sub('', tempLogLine) 
                     ### Log lines group separator, used by script on Web Server to post log line groups separatly to Loki
-                    traceBlockLogLines[fileName].append(tempLine + "__NEWLINE__")
+                    traceBlockLogLines[blockKey].append(tempLine + "__NEWLINE__")
 
                     ### remove \n from first line
-                    firstLogLine = traceBlockLogLines[fileName].pop(0)
-                    firstLogLine = re.sub("\n$", '', firstLogLine) 
+                    firstLogLine = traceBlockLogLines[blockKey].pop(0)
+                    firstLogLine = trailingNewLine.sub('', firstLogLine) 
 
                     ### add current trace block lines to logLines[key] with traceId prefixed at the end of the line
                     ### this is to ensure loki can use the traceid to associate with tempo on starting line
-                    if values[indexForTraceIdPrefix] != None:
+                    if values.traceIdPrefix != None:
                         tempLogLineWithTraceId = r'{0} {1}{2}\n'.format(firstLogLine, \
-                                    values[indexForTraceIdPrefix], \
-                                    traceBlockTraceId[fileName] )
+                                    values.traceIdPrefix, \
+                                    traceBlockTraceId[blockKey] )
                     else:
                         tempLogLineWithTraceId = r'{0} TraceId={1}\n'.format( firstLogLine, \
-                                    traceBlockTraceId[fileName] )
+                                    traceBlockTraceId[blockKey] )
 
                     logLines[key].append( tempLogLineWithTraceId )
                     if keyDebugLevel > 3:
                         print("DEBUG-4 JAProcessLineForTrace() modified trace start line:{0}".format(tempLogLineWithTraceId) )
-                    for line in traceBlockLogLines[fileName]:
+                    for line in traceBlockLogLines[blockKey]:
                         logLines[key].append( line )
                         ### increment the logTracesCount
                         logLinesCount[key] += 1
                     
-                    logTraces[key].append( tempTraceLine[fileName])
+                    logTraces[key].append( tempTraceLine[blockKey])
                     logTracesCount[key] +=1 
 
-                tempTraceLine[fileName] = ''
+                tempTraceLine[blockKey] = ''
                 tempAddNEWLINE = False
 
-            elif key == traceBlockInProgress[fileName]:
+            elif key == traceBlockInProgress[blockKey]:
                 if tempLogLine == '':
                     ### if no match occured, tempLogLine will be empty.
                     ###  use the passed line as is.
@@ -2356,9 +3514,15 @@ def JAProcessLineForTrace( tempLine, fileName, key, values, keyDebugLevel ):
                 else:
                     tempLogLine += '\n'
                 ### DO NOT append __NEWLINE__ separator so that this line is logged as a group of log lines
-                traceBlockLogLines[fileName].append(tempLogLine ) 
+                traceBlockLogLines[blockKey].append(tempLogLine ) 
                 if keyDebugLevel > 3:
                     print("DEBUG-4 JAProcessLineForTrace() inside trace block log line collected:{0}".format(tempLogLine) )
+                traceBlockLineCount[blockKey] += 1
+                traceBlockBytes[blockKey] += len(tempLogLine)
+                if traceBlockLineCount[blockKey] > maxTraceBlockLines:
+                    JAEvictTraceBlock( blockKey, 'lines' )
+                elif traceBlockBytes[blockKey] > maxTraceBlockBytes:
+                    JAEvictTraceBlock( blockKey, 'bytes' )
 
             else:
                 ### store log lines if number of log lines to be collected within a sampling interval is under maxLogLines
@@ -2372,10 +3536,10 @@ def JAProcessLineForTrace( tempLine, fileName, key, values, keyDebugLevel ):
                 
                 ### all trace definitions in single line with regex group corresponding to that line
                 ###   no other log line to process, add current trace info.
-                if values[indexForTraceSingleLine] == True :
-                    logTraces[key].append( tempTraceLine[fileName])
+                if values.traceSingleLine == True :
+                    logTraces[key].append( tempTraceLine[blockKey])
                     logTracesCount[key] +=1 
-                    tempTraceLine[fileName] = ''
+                    tempTraceLine[blockKey] = ''
                     tempAddNEWLINE = False
 
 
@@ -2384,6 +3548,7 @@ def JAProcessLineForTrace( tempLine, fileName, key, values, keyDebugLevel ):
             ### do not search for any more trace patterns (trace line pattern matching stops at first match)
             patternTraceMatched = True
 
+    tempLogLines[blockKey] = tempLogLine
     return patternTraceMatched
 
 def JAProcessLineForLog( tempLine, fileName, key, values, keyDebugLevel ):
@@ -2391,83 +3556,1013 @@ def JAProcessLineForLog( tempLine, fileName, key, values, keyDebugLevel ):
     patternLogMatched = False
 
     ### see whether current line match to any log definitions
-    for index in logPatternIndexsList:
-
-        if values[index] == None  or values[index] == '' :
-            continue
+    for index, searchPattern in values.logPatterns:
 
         ### maxLogLines non-zero, logs collection is enabled for this host
-        searchPattern = r'{0}'.format(values[index])
         ### search for matching PatternLog regardless of whether stats type pattern is found or not.
-        try:
-            if re.search(searchPattern, tempLine) != None:
-                if ( keyDebugLevel > 1 ):
-                    print("DEBUG-2 JAProcessLineForLog() pattern:{0}, matched to log line:{1}".format(searchPattern, tempLine))
-
-                try:
-                    tempPatternTimeStamp = r'{0}'.format(values[indexForTimeStamp])
-                    ### convert timestamp to standard format
-                    myResults = re.search(tempPatternTimeStamp, tempLine )
-                    if myResults != None:
-                        ## timestamp is in expected format
-                        if  values[indexForTimeStampGroup] != None:
-                            tempResult = myResults.group(values[indexForTimeStampGroup]) 
-                        else:
-                            ## assumt time is group 1 (start of line)
-                            tempResult = myResults.group(1)                    
-                        originalTimeStamp = tempResult
-                        # ensure the dateTimeString has 6 digits in fraction space, needed for loki time format
-                        if ( tempPatternTimeStamp == '(^\d\d\d\d-\d\d-\d\dT\d\d:\d\d:\d\d\.\d+)' or tempPatternTimeStamp == '(^\d\d\d\d-\d\d-\d\d \d\d:\d\d:\d\d\.\d+)' or \
-                            tempPatternTimeStamp == '(^\d\d\d\d-\d\d-\d\dT\d\d:\d\d:\d\d,\d+)' or tempPatternTimeStamp == '(^\d\d\d\d-\d\d-\d\d \d\d:\d\d:\d\d,\d+)' ) :
-                            # 2022-06-05 12:48:00.000000
-                            # 01234567890123456789012345 - length 26
-                            # 2022-06-05 12:48:00.000
-                            # 01234567890123456789012    - length 23            
-                            if len(tempResult) == 23 :
-                                tempResult = tempResult + "000"
-                        elif ( tempPatternTimeStamp == '(^\d\d\d\d-\d\d-\d\dT\d\d:\d\d:\d\d)' or tempPatternTimeStamp == '(^\d\d\d\d-\d\d-\d\d \d\d:\d\d:\d\d)'  ) :
-                            ### loki needs the time stamp with fraction second upto microseconds
-                            ###  add ".000000" to get time with only up to seconds to get in microseconds
-                            tempResult = tempResult + ".000000" 
-                        
-                        ### TBD add logic to handle other time formats here 
-                        
-                        ### replace space separator between date and time with T, loki needs in isoformat
-                        tempResult = tempResult.replace(" ", "T")
-                        ### replace comma with .
-                        tempResult = tempResult.replace(",", ".")
-                        tempLine = re.sub(originalTimeStamp, tempResult, tempLine)
-
-                    ### matching pattern found, collect this log line
-                    ### remove \n from the line, it will be added when __NEWLINE__ is appended
-                    tempLine = re.sub("\n$",'',tempLine)
-                    ### store log lines if number of log lines to be collected within a sampling interval is under maxLogLines
+        if profileLine == True:
+            myResults = JAProfilePattern( searchPattern, False, tempLine, key, 'log', specForRegexPatterns[index] )
+        else:
+            myResults = searchPattern.search(tempLine)
+        if myResults != None:
+            if ( keyDebugLevel > 1 ):
+                print("DEBUG-2 JAProcessLineForLog() pattern:{0}, matched to log line:{1}".format(searchPattern.pattern, tempLine))
+
+            tempPatternTimeStamp = values.timeStamp
+            if tempPatternTimeStamp != None:
+                ### convert timestamp to standard format
+                myResults = tempPatternTimeStamp.search(tempLine )
+            else:
+                myResults = None
+            if myResults != None:
+                ## timestamp is in expected format
+                if  values.timeStampGroup != None:
+                    tempTimeStampGroup = values.timeStampGroup
+                else:
+                    ## assumt time is group 1 (start of line)
+                    tempTimeStampGroup = 1
+                tempResult = myResults.group(tempTimeStampGroup)
+                originalTimeStamp = tempResult
+                # ensure the dateTimeString has 6 digits in fraction space, needed for loki time format
+                if ( tempPatternTimeStamp.pattern == '(^\d\d\d\d-\d\d-\d\dT\d\d:\d\d:\d\d\.\d+)' or tempPatternTimeStamp.pattern == '(^\d\d\d\d-\d\d-\d\d \d\d:\d\d:\d\d\.\d+)' or \
+                    tempPatternTimeStamp.pattern == '(^\d\d\d\d-\d\d-\d\dT\d\d:\d\d:\d\d,\d+)' or tempPatternTimeStamp.pattern == '(^\d\d\d\d-\d\d-\d\d \d\d:\d\d:\d\d,\d+)' ) :
+                    # 2022-06-05 12:48:00.000000
+                    # 01234567890123456789012345 - length 26
+                    # 2022-06-05 12:48:00.000
+                    # 01234567890123456789012    - length 23            
+                    if len(tempResult) == 23 :
+                        tempResult = tempResult + "000"
+                elif ( tempPatternTimeStamp.pattern == '(^\d\d\d\d-\d\d-\d\dT\d\d:\d\d:\d\d)' or tempPatternTimeStamp.pattern == '(^\d\d\d\d-\d\d-\d\d \d\d:\d\d:\d\d)'  ) :
+                    ### loki needs the time stamp with fraction second upto microseconds
+                    ###  add ".000000" to get time with only up to seconds to get in microseconds
+                    tempResult = tempResult + ".000000" 
+                
+                ### TBD add logic to handle other time formats here 
+                
+                ### replace space separator between date and time with T, loki needs in isoformat
+                tempResult = tempResult.replace(" ", "T")
+                ### replace comma with .
+                tempResult = tempResult.replace(",", ".")
+                if tempResult != originalTimeStamp:
+                    ### replace the timestamp in place, using the position where it is found
+                    timeStampStart, timeStampEnd = myResults.span(tempTimeStampGroup)
+                    tempLine = tempLine[:timeStampStart] + tempResult + tempLine[timeStampEnd:]
+
+            ### matching pattern found, collect this log line
+            ### remove \n from the line, it will be added when __NEWLINE__ is appended
+            if tempLine.endswith('\n'):
+                tempLine = tempLine[:-1]
+            if logLineDedup == True:
+                ### count every matched line, post one exemplar line per fingerprint
+                logLinesCount[key] += 1
+                fingerprint = logLineMaskPattern.sub('#', tempLine)
+                fingerprints = logLineFingerprints[key]
+                fingerprintInfo = fingerprints.get(fingerprint)
+                if fingerprintInfo != None:
+                    fingerprintInfo[1] += 1
+                elif len(fingerprints) < maxLogLines and logLinesBytes[key] < maxLogBytes:
+                    fingerprints[fingerprint] = [len(logLines[key]), 1]
                     logLines[key].append(tempLine + "__NEWLINE__")
-                    ### increment the logLinesCount
-                    logLinesCount[key] += 1
-                    ### do not search for any more log patterns (log line pattern matching stops at first match)
-                    patternLogMatched = True
-                    ### no more processing needed for current log line
-                    break
-                except re.error as err:
-                    errorMsg = "ERROR invalid timestamp pattern:|{0}|, regular expression error:|{1}|".format(tempPatternTimeStamp,err)
-                    print(errorMsg)
-                    LogMsg(errorMsg, statsLogFileName, True)
-                    ### discard this pattern so that no need to check this again
-                    values[index] = None
-                    continue                    
-        except re.error as err:
-            errorMsg = "ERROR invalid pattern:|{0}|, regular expression error:|{1}|".format(searchPattern,err)
-            print(errorMsg)
-            LogMsg(errorMsg, statsLogFileName, True)
-            ### discard this pattern so that no need to check this again
-            values[index] = None
-            continue
+                    logLinesBytes[key] += len(tempLine)
+            else:
+                ### store log lines if number of log lines to be collected within a sampling interval is under maxLogLines
+                logLines[key].append(tempLine + "__NEWLINE__")
+                ### increment the logLinesCount
+                logLinesCount[key] += 1
+                logLinesBytes[key] += len(tempLine)
+            ### do not search for any more log patterns (log line pattern matching stops at first match)
+            patternLogMatched = True
+            ### no more processing needed for current log line
+            break
 
     return patternLogMatched
 
+"""
+JAGetLogLineTimeInSec( tempLine, fileName, tempPatternTimeStamp, tempTimeStampGroup, tempTimeStampFormat )
+Returns time in seconds of the timestamp in current line, None if line does not have timestamp, 0 if timestamp can not be parsed
+"""
+def JAGetLogLineTimeInSec( tempLine, fileName, tempPatternTimeStamp, tempTimeStampGroup, tempTimeStampFormat ):
+    myResults = tempPatternTimeStamp.findall( tempLine)
+    patternMatchCount =  len(myResults)
+    if myResults != None and patternMatchCount > 0 :
+        ### if patterns found is greater than or equal to timeStampGroup, pick up the timeStamp value
+        if patternMatchCount >= tempTimeStampGroup:
+            currentTimeStampString = str(myResults[tempTimeStampGroup-1])
+            timeInSeconds = (int(JAGlobalLib.JAConvertStringTimeToTimeInMicrosec(
+                            currentTimeStampString, tempTimeStampFormat)))/1000000
+            if timeInSeconds == 0:
+                errorMsg = "ERROR JAProcessLogFile() Error parsing the timestamp string:|{0}|, picked up from log line:|{1}, using the 'TimeStampFormat' spec:|{2}|, logFile:|{3}|".format(
+                    currentTimeStampString, tempLine, tempTimeStampFormat, fileName)
+                LogMsg(errorMsg,statsLogFileName,True)
+            return timeInSeconds
+    return None
+
+"""
+JAUpdateStatsTimeStamp( tempLine, fileName, key, values, tempPatternTimeStamp, tempTimeStampGroup, tempTimeStampFormat )
+If current line has time stamp pattern, store that timestamp in logStats[key] to post to web server
+"""
+def JAUpdateStatsTimeStamp( tempLine, fileName, key, values, tempPatternTimeStamp, tempTimeStampGroup, tempTimeStampFormat ):
+    timeInSeconds = JAGetLogLineTimeInSec( tempLine, fileName, tempPatternTimeStamp, tempTimeStampGroup, tempTimeStampFormat )
+    if timeInSeconds != None and timeInSeconds != 0:
+        ### converted to string while posting the data
+        logStats[key].timeStamp = timeInSeconds
+        logStats[key].timeStampFormat = tempTimeStampFormat
+
+"""
+JAAggregateStatsValue( key, index, tempStats, sampleCounts, tempKey, tempResult )
+Aggregate one value found in log line to the stats of pattern kind index
+
+Parameters passed
+  key - service name
+  index - indexForPatternSum, indexForPatternAverage, indexForPatternDelta or indexForPatternHistogram
+  tempStats - dictionary of that pattern kind in JAServiceStats, key - variable name, value - aggregated value
+  sampleCounts - averageSampleCounts of JAServiceStats, used for indexForPatternAverage
+  tempKey - variable name
+  tempResult - value as string
+"""
+def JAAggregateStatsValue( key, index, tempStats, sampleCounts, tempKey, tempResult ):
+    ### find out the nature of the value, number or string
+    ###   numeric values are kept as float
+    try:
+        tempResult = float(tempResult)
+        tempResultIsNumber = True
+    except ValueError:
+        tempResultIsNumber = False
+
+    ## value portion of key/ value pair
+    ## if index is indexForPatternDelta, tempResult is cumulative value, need to subtract previous sample
+    ## value to get delta value and store it as current sample value.
+    if  index == indexForPatternDelta:
+        serviceNameSubKey = "{0}_{1}".format( key, tempKey)
+        tempResultToStore = tempResult
+        if previousSampleValuesPresent[serviceNameSubKey] == True :
+            if tempResultIsNumber == True:
+                ### previous value present, subtract prev value from current value to get delta value for current sample
+                tempResult = tempResult - previousSampleValues[serviceNameSubKey]
+            ## if string, leave the value as is
+        else:
+            # store default value of 0, this is to initialize the list with value so that next time, the operation succeeds
+            tempResult = 0.0
+            tempResultIsNumber = True
+            previousSampleValuesPresent[serviceNameSubKey] = True
+
+        ### store current sample value as is as previous sample
+        previousSampleValues[serviceNameSubKey] = tempResultToStore
+
+    elif index == indexForPatternHistogram:
+        ### only numeric values are added to the distribution
+        if tempResultIsNumber == True:
+            sketch = tempStats.get(tempKey)
+            if sketch == None:
+                sketch = tempStats[tempKey] = JAQuantileSketch()
+            sketch.add(tempResult)
+        return
+
+    previousValue = tempStats.get(tempKey)
+    if previousValue == None:
+        ### current key is not yet present, start with current value
+        tempStats[tempKey] = tempResult
+
+        ### if working average type metrics, set sample count of current key
+        if index == indexForPatternAverage :
+            sampleCounts[tempKey] = 1
+
+    else:
+        if tempResultIsNumber == True and isinstance(previousValue, float):
+            ### add to existing value
+            tempStats[tempKey] = previousValue + tempResult
+        ### if string type, append it to existing value
+        else:
+            tempStats[tempKey] = '{0}{1}'.format(previousValue, tempResult)
+
+        ### if working average type metrics, increment sample count of current key
+        if index == indexForPatternAverage :
+            sampleCounts[tempKey] += 1
+
+"""
+JAProcessCSVLine( tempLine, key, values, keyStats, variablePrefix, labelPrefix, keyDebugLevel )
+CSV extraction mode, split current line by CSVDelimiter and aggregate the fields of CSVSum, CSVAverage, CSVDelta columns
+  without regex match per value
+If CSVPrefix is defined, line is processed only if it contains that text, fields are counted from the start of that text
+  Log line: 2022-03-26T23:15:05.308415 CSV,client2,39,9.00,19.50
+  CSVPrefix: CSV,
+  fields:                              1   2       3  4    5      <-- column numbers
+Variable name of column is taken from PatternCSVVariableNames, GroupNumber<column number> if not defined
+"""
+def JAProcessCSVLine( tempLine, key, values, keyStats, variablePrefix, labelPrefix, keyDebugLevel ):
+    if values.CSVPrefix != None:
+        prefixPosition = tempLine.find( values.CSVPrefix )
+        if prefixPosition < 0:
+            return
+        fields = tempLine[prefixPosition:].rstrip('\r\n').split( values.CSVDelimiter )
+    else:
+        fields = tempLine.rstrip('\r\n').split( values.CSVDelimiter )
+    numFields = len(fields)
+
+    for index, columns in values.CSVColumns:
+        if index == indexForPatternSum :
+            tempStats = keyStats.sumValues
+        elif index == indexForPatternDelta :
+            tempStats = keyStats.deltaValues
+        else:
+            tempStats = keyStats.averageValues
+
+        numStats = 0
+        for column in columns:
+            if column < 1 or column > numFields:
+                ### current line does not have this column
+                continue
+            tempKey = JACSVVariableName( values.CSVVariableNames, column )
+            if variablePrefix != None :
+                tempKey = '{0}_{1}'.format( variablePrefix, tempKey)
+            ### this format of :<label>: needs to match the pattern searched in JASaveStats.py
+            if labelPrefix != None:
+                tempKey = ':{0}:{1}'.format( labelPrefix, tempKey)
+            JAAggregateStatsValue( key, index, tempStats, keyStats.averageSampleCounts, tempKey, fields[column-1].strip() )
+            numStats += 1
+
+        if numStats == 0:
+            continue
+        if index == indexForPatternSum :
+            keyStats.sumSampleCount += 1
+        elif index == indexForPatternDelta :
+            keyStats.deltaSampleCount += 1
+
+        if keyDebugLevel > 3:
+            print('DEBUG-4 JAProcessCSVLine() key: {0}, fields:{1}, stats: {2}'.format( key, fields, tempStats ))
+
+"""
+JAProcessLogLine( tempLine, fileName, logFileName, tempPatternTimeStamp, tempTimeStampGroup, tempTimeStampFormat )
+Search for patterns of each key associated with logFileName in current line, update stats in logStats[key]
+  and collect log lines, traces as per the spec of that key
+"""
+def JAProcessLogLine( tempLine, fileName, logFileName, tempPatternTimeStamp, tempTimeStampGroup, tempTimeStampFormat ):
+    global logEventPriorityLevel
+
+    patternMatched = patternLogMatched = patternTraceMatched = False
+
+    # search results are stored in logStats in below form
+    # key - service name
+    # values - JAServiceStats
+
+    # search for pass, fail, count, stats patterns of each service associated with this log file
+    for key, values in JAStatsSpec[logFileName].items():
+        eventPriority = values.priority
+        if eventPriority <= processedPriorityLevel:
+            ### line is processed for this key already, catching up pending range for deferred keys
+            continue
+
+        keyDebugLevel = values.debugLevel
+
+        if eventPriority > allowedPriorityLevel:
+            if logEventPriorityLevel == maxCPUUsageLevels:
+                ### first time log file processing skipped, store current event priorityy
+                logEventPriorityLevel = eventPriority
+            elif logEventPriorityLevel > eventPriority :
+                ## if previous event priority skipped is higher than current priority,
+                ##   save new priority
+                logEventPriorityLevel = eventPriority
+        else:
+            ### proceed with search if current CPU usage is lower than max CPU usage allowed
+            index = 0
+
+            ### if current key has spec related to trace processing, 
+            if values.traceProcessing == True and maxTraceLines > 0 and patternTraceMatched == False:   
+                if int(logTracesCount[key]) < maxTraceLines:
+                    patternTraceMatched = JAProcessLineForTrace( tempLine, fileName, key, values, keyDebugLevel )
+
+            ## upon trace match, log line is collected, thus, no need to search for log line again
+            if patternTraceMatched == False  and maxLogLines > 0 and values.logProcessing == True and patternLogMatched == False:
+                ### with dedup, lines are matched beyond maxLogLines to count similar lines
+                if logLineDedup == True or (int(logLinesCount[key]) < maxLogLines and logLinesBytes[key] < maxLogBytes):
+                    patternLogMatched = JAProcessLineForLog( tempLine, fileName, key, values, keyDebugLevel )
+
+            ### if current key does not have any stats processing spec, skip it
+            if values.statsProcessing != True:
+                continue
+
+            ### if variable prefix is defined for current service, 
+            ###   see whether the variable prefix pattern is present in current line
+            variablePrefix = None
+            if values.variablePrefix != None:
+                if profileLine == True:
+                    myResults = JAProfilePattern( values.variablePrefix, False, tempLine, key, 'stats', 'variablePrefix' )
+                else:
+                    myResults = values.variablePrefix.search( tempLine)
+                if myResults == None:
+                    ### since variable prefix is not matching, SKIP processing this line any further
+                    # since variable prefix will be prefixed to variables, if that is not present,
+                    #  no need to match any other patterns for this service 
+                    continue
+                else:
+                    if values.variablePrefixGroup != None:
+                        ### use the group value; based on pattern match, as variable prefix.
+                        ### Log line: 2021-10-05T01:09:03.249334 Stats MicroService25 total key1 9 dummy1 total key2 4.50 dummy2
+                        ###                                                        ^^ <-- variablePrefixGroupValues (two groups)
+                        ### PatternVariablePrefix: Stats MicroService(\d)(\d) total
+                        ###                                                ^ <-- variable prefix, group 2
+                        ###  use 2nd group value as variable prefix for the *_avrage metrics variable
+                        ###  PatternVariablePrefixGroup: 2
+                        variablePrefix = myResults.group(values.variablePrefixGroup)
+                    else:
+                        variablePrefix = myResults.group(1)
+            ### if patternLabel is defined for current service, 
+            ###   see whether the label  pattern is present in current line
+            labelPrefix = None
+            if values.label != None:
+                if profileLine == True:
+                    myResults = JAProfilePattern( values.label, False, tempLine, key, 'stats', 'label' )
+                else:
+                    myResults = values.label.search( tempLine)
+                if myResults == None:
+                    ### since pattern label is not matching, SKIP processing this line any further
+                    # since label will be posted with the data, if that label is not present,
+                    #  no need to match any other patterns for this service 
+                    continue
+                else:
+                    if values.labelGroup != None:
+                        ### use the group value; based on pattern match, as label.
+                        ### Log line: 2021-10-30T13:32:49.825709 Stats client1 total key1 34 dummy1 total key2 17.00 dummy2
+                        ###                                            ^^^^^^^ <-- labelGroup (signle group)
+                        ### PatternLabel: Stats (\w+) total
+                        ###                      ^^^ <-- label, group 1
+                        ###  use 1st group value as label this metrics
+                        ###  PatternLabelGroup: 1
+                        labelPrefix = myResults.group(values.labelGroup)
+                    else:
+                        labelPrefix = myResults.group(1)
+
+            ### if current line has time stamp pattern, store that timestamp to post to web server
+            if tempPatternTimeStamp != None:
+                JAUpdateStatsTimeStamp( tempLine, fileName, key, values, tempPatternTimeStamp, tempTimeStampGroup, tempTimeStampFormat)
+
+            keyStats = logStats[key]
+
+            if values.CSVColumns != None:
+                JAProcessCSVLine( tempLine, key, values, keyStats, variablePrefix, labelPrefix, keyDebugLevel )
+
+            ### see whether current line match to any stats definitions
+            ###   only the patterns defined for current key are present in values.statsPatterns
+            for index, searchPattern in values.statsPatterns:
+
+                if index == indexForPatternSum or index == indexForPatternAverage or index == indexForPatternDelta or index == indexForPatternHistogram :
+                    ### special processing needed to extract the statistics from current line
+                    if profileLine == True:
+                        myResults = JAProfilePattern( searchPattern, True, tempLine, key, 'stats', specForRegexPatterns[index] )
+                    else:
+                        myResults = searchPattern.findall( tempLine)
+                    patternMatchCount =  len(myResults)
+                    if myResults != None and patternMatchCount > 0 :
+                        ### current line has stats in one or more places. Aggregate the values
+                        ### the pattern spec is in the format
+                        ###   <pattern>(Key1)<pattern>(value1)<pattern>key2<pattern>value2....
+                        numStats = 0
+
+                        ### values are aggregated in place in the dictionary of current pattern type
+                        ###   key - variable name, value - aggregated value
+                        if index == indexForPatternSum :
+                            tempStats = keyStats.sumValues
+                        elif index == indexForPatternDelta :
+                            tempStats = keyStats.deltaValues
+                        elif index == indexForPatternHistogram :
+                            ### distribution of values is kept in JAQuantileSketch of each variable
+                            tempStats = keyStats.histogramValues
+                        else:
+                            tempStats = keyStats.averageValues
+                            ### sample count of each variable for average type metrics
+                            sampleCounts = keyStats.averageSampleCounts
+
+                        if keyDebugLevel > 3:
+                            print("DEBUG-4 JAProcessLogFile() processing line with PatternDelta, PatternSum or PatternAverage, search result:{0}\n Previous values:{1}".format(myResults, tempStats))
+                        tempKey = ''
+                        groupNumber = 0
+
+                        ### if pattern matches to single instance in line, len(myResults) will be 1
+                        ###     myResults is of the form = [ (key1, value1, key2, value2....)]
+                        ### if pattern matches to multiple instances in line, len(myResults) will be > 1
+                        CSVVariableNames = values.CSVVariableNames
+                        if values.columnBuffering == True and patternMatchCount == 1 and (index == indexForPatternSum or index == indexForPatternAverage) and isinstance(myResults[0], tuple):
+                            ### single CSV record in line, values are aggregated per column later in batch
+                            keyStats.addColumnValues( index, myResults[0] )
+                            myResults = []
+                        for tempResults in myResults:
+
+                            for tempResult in tempResults:
+                                groupNumber += 1
+                                if values.skipGroups != None:
+                                    ### if current group number is in skipGroup list, skip it
+                                    if ( str(groupNumber) in values.skipGroups):
+                                        continue
+
+                                ### if line in CSV format, use the variable names defined in config file
+                                if CSVVariableNames != None:
+                                    ### log line is in CSV format, each field contains data
+                                    tempResultContainsValue = True
+                                    try:
+                                        if CSVVariableNames[groupNumber-1] != None:
+                                            currentVariableName = CSVVariableNames[groupNumber-1]
+                                        else:
+                                            currentVariableName = 'GroupNumber{0}'.format(groupNumber-1)
+                                    except:
+                                        currentVariableName = 'GroupNumber{0}'.format(groupNumber)
+
+                                    ### if variable prefix is present, prefix that to current key
+                                    if variablePrefix != None :
+                                        currentVariableName = '{0}_{1}'.format( variablePrefix, currentVariableName)
+
+                                    ### if label is present, prefix that to updated current key
+                                    ### this format of :<label>: needs to match the pattern searched
+                                    ###  in JASaveStats.py
+                                    if labelPrefix != None:
+                                        currentVariableName = ':{0}:{1}'.format( labelPrefix, currentVariableName)
+
+                                    ### save the key name, this is used to make a combined key later <serviceName>_<key>
+                                    tempKey = currentVariableName
+
+                                else:
+                                    if numStats % 2 == 0:
+                                        tempResultContainsValue = False
+                                        ### if current name has space, replace it with '_'
+                                        currentVariableName = whiteSpaceChars.sub('_',tempResult)
+                                        ### if variable prefix is present, prefix that to current key
+                                        if variablePrefix != None :
+                                            currentVariableName = '{0}_{1}'.format( variablePrefix, currentVariableName)
+
+                                        ### if label is present, prefix that to updated current key
+                                        ### this format of :<label>: needs to match the pattern searched
+                                        ###  in JASaveStats.py
+                                        if labelPrefix != None:
+                                            currentVariableName = ':{0}:{1}'.format( labelPrefix, currentVariableName)
+
+                                        ### save the key name, this is used to make a combined key later <serviceName>_<key>
+                                        tempKey = currentVariableName
+
+                                    else:
+                                        tempResultContainsValue = True
+
+                                if tempResultContainsValue == True:
+                                    JAAggregateStatsValue( key, index, tempStats, keyStats.averageSampleCounts, tempKey, tempResult )
+                                numStats += 1
+
+                        ### for average type, sample count is incremented based for ecach prefix variable key values   
+                        if index == indexForPatternAverage :
+                            numSamples = sampleCounts
+                        elif index == indexForPatternSum :
+                            ### increment sample count
+                            keyStats.sumSampleCount += 1
+                            numSamples = keyStats.sumSampleCount
+                        elif index == indexForPatternHistogram :
+                            numSamples = { name: sketch.count for name, sketch in tempStats.items() }
+                        else:
+                            keyStats.deltaSampleCount += 1
+                            numSamples = keyStats.deltaSampleCount
+
+                        if keyDebugLevel > 3:
+                            print('DEBUG-4 JAProcessLogFile() key: {0}, found pattern:|{1}|, numSamples:{2}, stats: {3}'.format(
+                                key, searchPattern.pattern, numSamples, tempStats ))
+                        ### get out of the loop
+                        patternMatched = True
+                else:
+                    if profileLine == True:
+                        myResults = JAProfilePattern( searchPattern, False, tempLine, key, 'stats', specForRegexPatterns[index] )
+                    else:
+                        myResults = searchPattern.search( tempLine)
+                    if myResults != None:
+                        ### matching pattern found for pass, fail, count type of tracking
+
+                        ### if PatternLabel is present, count is tracked for each label value
+                        ###  in the dictionary with key :<label>:
+                        if labelPrefix != None:
+                            if index != indexForSkip:
+                                tempLabelCounts = getattr(keyStats, statsLabelCountAttributes[index])
+                                tempListVarName = ':{0}:'.format( labelPrefix)
+                                if keyDebugLevel > 3:
+                                    print("DEBUG-4 JAProcessLogFile() processing line with PatternLabel:{0}, label counts:{1}".format(tempListVarName, tempLabelCounts))
+                                if tempListVarName in tempLabelCounts:
+                                    tempLabelCounts[tempListVarName] += 1
+                                else:
+                                    ## start with stats value of 1 for this label
+                                    tempLabelCounts[tempListVarName] = 1
+
+                        ### matching pattern found without any label, increment the count 
+                        elif index == indexForPatternPass:
+                            keyStats.passCount += 1
+                        elif index == indexForPatternFail:
+                            keyStats.failCount += 1
+                        elif index == indexForPatternCount:
+                            keyStats.countCount += 1
+
+                        if keyDebugLevel > 3:
+                            print('DEBUG-4 JAProcessLogFile() key: {0}, found pattern:|{1}|, stats: {2}'.format(
+                                    key, searchPattern.pattern, keyStats ))
+                        ### get out of the loop
+                        patternMatched = True
+
+            ## if both log pattern and stats pattern matched, get out of the while loop
+            if patternMatched == True and (patternLogMatched == True or patternTraceMatched == True):
+                break
+            else:
+                ### increment index so that search continues with next pattern
+                index += 1         
+
+        ## if log pattern or stats pattern matched, get out of the for loop
+        ## once a given line matched to a log or stats pattern, search for matching pattern stops
+        if patternMatched == True and (patternLogMatched == True or patternTraceMatched == True):
+            break
+
+### profile of log line processing, gathered from the lines sampled every profileSampleInterval lines
+### key - (serviceName, stage, pattern name), value - [evaluation count, match count, nanoseconds, pattern]
+###   stage is trace, log or stats, time is measured for the patterns searched while processing sampled line
+profileStats = {}
+### key - log file name spec, value - [lines sampled, nanoseconds taken by JAProcessLogLine() for those lines]
+profileLogFiles = {}
+### key - (serviceName, stage), value - nanoseconds of sampled lines since last post, posted when profilePostStats is True
+profileIntervalStats = defaultdict(int)
+### lines processed since last sampled line
+profileLineCount = 0
+### True while sampled line is processed, patterns searched are timed by JAProfilePattern()
+profileLine = False
+### nanosecond counter, perf_counter_ns() is available from python 3.7, perf_counter() from python 3.3
+if hasattr(time, 'perf_counter_ns'):
+    profilePerfCounter = time.perf_counter_ns
+elif hasattr(time, 'perf_counter'):
+    profilePerfCounter = lambda: int(time.perf_counter() * 1e9)
+else:
+    profilePerfCounter = lambda: int(time.time() * 1e9)
+
+"""
+JAProfileLogLine( tempLine, fileName, logFileName, tempPatternTimeStamp, tempTimeStampGroup, tempTimeStampFormat )
+Process the log line using JAProcessLogLine(), recording the time taken for the log file
+Patterns searched while processing the line are timed and counted by JAProfilePattern(),
+  patterns skipped after a match or for keys not processed are not counted
+"""
+def JAProfileLogLine( tempLine, fileName, logFileName, tempPatternTimeStamp, tempTimeStampGroup, tempTimeStampFormat ):
+    global profileLine
+    profileLine = True
+    startTime = profilePerfCounter()
+    try:
+        JAProcessLogLine( tempLine, fileName, logFileName, tempPatternTimeStamp, tempTimeStampGroup, tempTimeStampFormat )
+    finally:
+        profileLine = False
+    elapsedTime = profilePerfCounter() - startTime
+    if logFileName in profileLogFiles:
+        profileLogFiles[logFileName][0] += 1
+        profileLogFiles[logFileName][1] += elapsedTime
+    else:
+        profileLogFiles[logFileName] = [1, elapsedTime]
+
+"""
+JAProfilePattern( searchPattern, findAll, tempLine, key, stage, patternName )
+Search the pattern in sampled line using findall() if findAll is True, else search(), and return the result
+Time taken, evaluation and match count are recorded for the pattern, evaluation is counted in regexEvaluations
+  as profileSampleInterval evaluations since one line of profileSampleInterval lines is sampled
+"""
+def JAProfilePattern( searchPattern, findAll, tempLine, key, stage, patternName ):
+    startTime = profilePerfCounter()
+    if findAll == True:
+        myResults = searchPattern.findall( tempLine)
+    else:
+        myResults = searchPattern.search( tempLine)
+    elapsedTime = profilePerfCounter() - startTime
+
+    profileKey = (key, stage, patternName)
+    if profileKey in profileStats:
+        patternProfile = profileStats[profileKey]
+    else:
+        patternProfile = profileStats[profileKey] = [0, 0, 0, searchPattern.pattern]
+    patternProfile[0] += 1
+    if myResults:
+        patternProfile[1] += 1
+    patternProfile[2] += elapsedTime
+    profileIntervalStats[(key, stage)] += elapsedTime
+    agentStats['regexEvaluations'] += profileSampleInterval
+    return myResults
+
+"""
+JAAddRegexEvaluations( logFileName, linesSearched )
+Add number of prefilter searches to agentStats, prefilter of the log file is searched in linesSearched
+Patterns of keys searched are counted by JAProfilePattern() in sampled lines
+"""
+def JAAddRegexEvaluations( logFileName, linesSearched ):
+    if logFilePrefilter.get(logFileName) != None:
+        agentStats['regexEvaluations'] += linesSearched
+
+"""
+JAMergeAgentStats( tempAgentStats )
+Add self metrics gathered by a worker or catch up process to the ones of this process
+"""
+def JAMergeAgentStats( tempAgentStats ):
+    for name, value in tempAgentStats.items():
+        agentStats[name] += value
+
+"""
+JAWriteProfile()
+Write profile gathered so far to profile file, next to cache file, patterns taking more time first
+Times are of sampled lines, estimated time is sampled time multiplied by profileSampleInterval
+"""
+def JAWriteProfile():
+    profileFileName = os.path.splitext(cacheLogFileName)[0] + '.profile'
+    try:
+        with open( profileFileName, "w") as file:
+            file.write( '### profile of log line processing, every {0} lines sampled, written at {1}\n'.format(
+                profileSampleInterval, JAGlobalLib.UTCDateTime()) )
+            file.write( '### logFile,sampledLines,sampledTimeInMicroSec,averageTimeInNanoSec,estimatedTimeInMicroSec\n' )
+            for logFileName, logFileProfile in sorted( profileLogFiles.items(), key=lambda item: item[1][1], reverse=True ):
+                file.write( '{0},{1},{2:.0f},{3:.0f},{4:.0f}\n'.format(
+                    logFileName, logFileProfile[0], logFileProfile[1] / 1000, logFileProfile[1] / logFileProfile[0],
+                    logFileProfile[1] * profileSampleInterval / 1000 ) )
+            file.write( '### key,stage,patternName,sampledEvaluations,sampledMatches,sampledTimeInMicroSec,averageTimeInNanoSec,estimatedTimeInMicroSec,pattern\n' )
+            for profileKey, patternProfile in sorted( profileStats.items(), key=lambda item: item[1][2], reverse=True ):
+                file.write( '{0},{1},{2},{3},{4},{5:.0f},{6:.0f},{7:.0f},{8}\n'.format(
+                    profileKey[0], profileKey[1], profileKey[2], patternProfile[0], patternProfile[1], patternProfile[2] / 1000,
+                    patternProfile[2] / patternProfile[0], patternProfile[2] * profileSampleInterval / 1000, patternProfile[3] ) )
+    except OSError as err:
+        errorMsg = 'ERROR - JAWriteProfile() Can not write profile file:{0}, error:{1}\n'.format( profileFileName, err)
+        print(errorMsg)
+        LogMsg(errorMsg, statsLogFileName, True)
+
+"""
+JAMergeProfile( tempProfileStats, tempProfileLogFiles, tempProfileIntervalStats )
+Add profile gathered by a worker process to the profile of this process
+"""
+def JAMergeProfile( tempProfileStats, tempProfileLogFiles, tempProfileIntervalStats ):
+    for profileKey, patternProfile in tempProfileStats.items():
+        if profileKey in profileStats:
+            for index in range(3):
+                profileStats[profileKey][index] += patternProfile[index]
+        else:
+            profileStats[profileKey] = patternProfile
+    for logFileName, logFileProfile in tempProfileLogFiles.items():
+        if logFileName in profileLogFiles:
+            profileLogFiles[logFileName][0] += logFileProfile[0]
+            profileLogFiles[logFileName][1] += logFileProfile[1]
+        else:
+            profileLogFiles[logFileName] = logFileProfile
+    for profileKey, elapsedTime in tempProfileIntervalStats.items():
+        profileIntervalStats[profileKey] += elapsedTime
+
+"""
+JAAddLogStatsBackfill( intervalStartTime, serviceStats )
+Add stats of previous interval, { serviceName: JAServiceStats }, to logStatsBackfill to be posted in next post
+"""
+def JAAddLogStatsBackfill( intervalStartTime, serviceStats ):
+    if intervalStartTime not in logStatsBackfill:
+        logStatsBackfill[intervalStartTime] = serviceStats
+        return
+    for key, keyStats in serviceStats.items():
+        if key in logStatsBackfill[intervalStartTime]:
+            logStatsBackfill[intervalStartTime][key].merge( keyStats )
+        else:
+            logStatsBackfill[intervalStartTime][key] = keyStats
+
+"""
+JASelectLogStatsWindow( logFileName, timeInSeconds, tempTimeStampFormat )
+Gather stats of keys of logFileName in the window of timeInSeconds, opening the window if needed
+Lines of a window already closed are counted in the next window
+Stats of lines without timestamp, before first timestamp or after the window is closed, are counted in this window
+"""
+def JASelectLogStatsWindow( logFileName, timeInSeconds, tempTimeStampFormat ):
+    global logStatsWatermark, lateLineCount
+    if timeInSeconds > logStatsWatermark:
+        logStatsWatermark = timeInSeconds
+    windowStartTime = int(timeInSeconds / dataPostIntervalInSec) * dataPostIntervalInSec
+    if windowStartTime <= lastClosedWindowStartTime:
+        windowStartTime = lastClosedWindowStartTime + dataPostIntervalInSec
+        lateLineCount += 1
+
+    prevWindowStartTime = logStatsCurrentWindow.get(logFileName)
+    if windowStartTime == prevWindowStartTime:
+        return
+
+    window = logStatsWindows.get(windowStartTime)
+    if window == None:
+        window = logStatsWindows[windowStartTime] = {}
+        logStatsWindowOpenTime[windowStartTime] = time.time()
+    for key, keySpec in JAStatsSpec[logFileName].items():
+        keyStats = window.get(key)
+        if keyStats == None:
+            if prevWindowStartTime == None:
+                keyStats = logStats[key]
+            else:
+                keyStats = JAServiceStats(keySpec)
+            keyStats.timeStampFormat = tempTimeStampFormat
+            window[key] = keyStats
+        elif prevWindowStartTime == None:
+            keyStats.merge( logStats[key] )
+        logStats[key] = keyStats
+        logStatsWindowKeys.add(key)
+    logStatsCurrentWindow[logFileName] = windowStartTime
+
+"""
+JAAddLogStatsWindow( windowStartTime, window )
+Add stats of a window gathered by worker process, { serviceName: JAServiceStats }, to the windows open
+If that window is already closed, stats are counted in next window
+"""
+def JAAddLogStatsWindow( windowStartTime, window ):
+    if windowStartTime <= lastClosedWindowStartTime:
+        windowStartTime = lastClosedWindowStartTime + dataPostIntervalInSec
+    if windowStartTime not in logStatsWindows:
+        logStatsWindows[windowStartTime] = {}
+        logStatsWindowOpenTime[windowStartTime] = time.time()
+    for key, keyStats in window.items():
+        logStatsWindowKeys.add(key)
+        if key in logStatsWindows[windowStartTime]:
+            logStatsWindows[windowStartTime][key].merge( keyStats )
+        else:
+            logStatsWindows[windowStartTime][key] = keyStats
+
+"""
+JACloseLogStatsWindows( closeAllWindows = False )
+Close windows in the order of start time, when line with timestamp maxLatenessInSec after window end is seen
+  or window is open for dataPostIntervalInSec plus maxLatenessInSec, like when log file is idle
+All windows are closed when closeAllWindows is True
+Stats of closed windows are moved to logStatsBackfill to be posted with window end time as timestamp
+"""
+def JACloseLogStatsWindows( closeAllWindows = False ):
+    global lastClosedWindowStartTime, lateLineCount
+    currentTime = time.time()
+    for windowStartTime in sorted(logStatsWindows.keys()):
+        windowEndTime = windowStartTime + dataPostIntervalInSec
+        if closeAllWindows == False and windowEndTime + maxLatenessInSec > logStatsWatermark and \
+            currentTime - logStatsWindowOpenTime[windowStartTime] < dataPostIntervalInSec + maxLatenessInSec:
+            break
+
+        window = logStatsWindows.pop(windowStartTime)
+        del logStatsWindowOpenTime[windowStartTime]
+        for keyStats in window.values():
+            keyStats.timeStamp = windowEndTime
+        JAAddLogStatsBackfill( windowStartTime, window )
+        lastClosedWindowStartTime = windowStartTime
+
+        ### lines of log file after this are counted in next window
+        for logFileName, currentWindowStartTime in logStatsCurrentWindow.items():
+            if currentWindowStartTime == windowStartTime:
+                logStatsCurrentWindow[logFileName] = None
+                for key, keySpec in JAStatsSpec[logFileName].items():
+                    logStats[key] = JAServiceStats(keySpec)
+
+    if lateLineCount > 0:
+        errorMsg = "INFO JACloseLogStatsWindows() {0} log lines of closed windows counted in next window, MaxLatenessInSec:{1}".format(
+            lateLineCount, maxLatenessInSec)
+        print(errorMsg)
+        LogMsg(errorMsg, statsLogFileName, True)
+        lateLineCount = 0
+
+"""
+JAProcessLogFileShard( logFileName, fileName, startPosition, endPosition, firstShard, tempPatternTimeStamp, tempTimeStampGroup, tempTimeStampFormat, endTime=None )
+Called in catch up process, gather stats of lines from startPosition till endPosition of the log file,
+  bucketed per dataPostIntervalInSec using the timestamp of the lines
+Log lines and traces are not collected while catching up
+If endTime is given, processing stops at the end of the block being processed when current time exceeds endTime
+Returns stats per interval, { intervalStartTime: { serviceName: JAServiceStats } }, along with last delta type sample values
+  stats of lines are returned with intervalStartTime None if none of the lines has timestamp or tempPatternTimeStamp is None
+  endPosition is the position till which lines are processed
+"""
+def JAProcessLogFileShard( logFileName, fileName, startPosition, endPosition, firstShard, tempPatternTimeStamp, tempTimeStampGroup, tempTimeStampFormat, endTime=None ):
+    global maxLogLines, maxTraceLines, profileLineCount
+    maxLogLines = maxTraceLines = 0
+    if firstShard == False:
+        ### previous sample of delta type is in previous shard, first sample in this shard is used as previous sample
+        previousSampleValuesPresent.clear()
+
+    keySpecs = JAStatsSpec[logFileName]
+    currentIntervalStartTime = None
+    intervalStats = { None: {} }
+    for key, keySpec in keySpecs.items():
+        intervalStats[None][key] = logStats[key] = JAServiceStats(keySpec)
+
+    tempPrefilter = logFilePrefilter.get(logFileName)
+    byteMode = logFileByteMode.get(logFileName, False)
+    ### self metrics of this catch up process are returned to parent process
+    agentStats.clear()
+    ### when time is up, lines till the end of current block are processed, position of next block is returned
+    stopPosition = None
+    lineCount = 0
+    fileReader = JALogFileReader( fileName, startPosition)
+    for tempLine in fileReader.readLines( decodeLines = not byteMode, endPosition = endPosition ):
+        if stopPosition != None:
+            if fileReader.position != stopPosition:
+                ### line of next block
+                break
+        elif endTime != None:
+            lineCount += 1
+            if lineCount % 1000 == 0 and time.time() > endTime:
+                stopPosition = fileReader.position
+        if len(tempLine) < 2:
+            continue
+        if tempPrefilter != None and tempPrefilter.search( tempLine) == None:
+            continue
+        if byteMode == True:
+            tempLine = JADecodeLogLine( tempLine )
+
+        if tempPatternTimeStamp != None:
+            timeInSeconds = JAGetLogLineTimeInSec( tempLine, fileName, tempPatternTimeStamp, tempTimeStampGroup, tempTimeStampFormat )
+        else:
+            timeInSeconds = None
+        if timeInSeconds != None and timeInSeconds != 0:
+            intervalStartTime = int(timeInSeconds / dataPostIntervalInSec) * dataPostIntervalInSec
+            if intervalStartTime != currentIntervalStartTime:
+                if currentIntervalStartTime == None:
+                    ### lines before first timestamp are counted in first interval
+                    intervalStats[intervalStartTime] = intervalStats.pop(None)
+                elif intervalStartTime not in intervalStats:
+                    intervalStats[intervalStartTime] = { key: JAServiceStats(keySpec) for key, keySpec in keySpecs.items() }
+                ### stats of lines are gathered in the stats of current interval
+                for key in keySpecs:
+                    logStats[key] = intervalStats[intervalStartTime][key]
+                currentIntervalStartTime = intervalStartTime
+
+        ### lines are sampled so that patterns searched are counted in regexEvaluations returned
+        if profileSampleInterval > 0:
+            profileLineCount += 1
+            if profileLineCount >= profileSampleInterval:
+                profileLineCount = 0
+                JAProfileLogLine( tempLine, fileName, logFileName, tempPatternTimeStamp, tempTimeStampGroup, tempTimeStampFormat )
+                continue
+
+        JAProcessLogLine( tempLine, fileName, logFileName, tempPatternTimeStamp, tempTimeStampGroup, tempTimeStampFormat )
+    fileReader.close()
+    if stopPosition == None:
+        stopPosition = fileReader.position
+    JAAddRegexEvaluations( logFileName, agentStats['linesRead'] )
+
+    tempSampleNames = [ name for name, present in previousSampleValuesPresent.items() if present == True ]
+    return {
+        'intervalStats': intervalStats,
+        'previousSampleValues': { name: previousSampleValues[name] for name in tempSampleNames },
+        'previousSampleValuesPresent': { name: True for name in tempSampleNames },
+        'logEventPriorityLevel': logEventPriorityLevel,
+        'agentStats': dict(agentStats),
+        'endPosition': stopPosition,
+        'readError': fileReader.readError }
+
+"""
+JACatchUpLogFile( logFileName, fileName, fileReader, tempPatternTimeStamp, tempTimeStampGroup, tempTimeStampFormat )
+If backlog from current position of fileReader exceeds catchUpThresholdInMB, split it into line aligned shards,
+  process the shards in parallel in catchUpProcesses child processes and merge the stats gathered
+Stats of previous intervals are saved in logStatsBackfill to be posted with the timestamp of that interval,
+  stats of latest interval are added to logStats
+Delta type sample at the start of each shard, except first shard, is counted as 0 since previous sample is in previous shard
+fileReader is positioned after the backlog processed, remaining lines are processed by caller
+Returns True if backlog is processed
+"""
+def JACatchUpLogFile( logFileName, fileName, fileReader, tempPatternTimeStamp, tempTimeStampGroup, tempTimeStampFormat ):
+    global logEventPriorityLevel
+    if catchUpThresholdInMB <= 0 or catchUpProcesses < 2 or OSType == 'Windows':
+        return False
+
+    startPosition = fileReader.position
+    try:
+        fileSize = os.path.getsize(fileName)
+        if fileSize - startPosition < catchUpThresholdInMB * 1024 * 1024:
+            return False
+
+        with open(fileName, "rb") as file:
+            ### backlog ends at the end of last complete line
+            tempPosition = max(startPosition, fileSize - logFileReadBlockSize)
+            file.seek( tempPosition )
+            lastNewLine = file.read(fileSize - tempPosition).rfind(b'\n')
+            if lastNewLine < 0:
+                return False
+            endPosition = tempPosition + lastNewLine + 1
+
+            ### each shard starts at the start of a line
+            shardPositions = [ startPosition ]
+            shardSize = int((endPosition - startPosition) / catchUpProcesses)
+            for shardIndex in range(1, catchUpProcesses):
+                file.seek( startPosition + shardIndex * shardSize )
+                file.readline()
+                tempPosition = file.tell()
+                if tempPosition > shardPositions[-1] and tempPosition < endPosition:
+                    shardPositions.append( tempPosition )
+            shardPositions.append( endPosition )
+
+    except OSError as err:
+        errorMsg = 'ERROR - JACatchUpLogFile() Can not read logFile:|' + \
+            fileName + '|' + "OS error: {0}".format(err) + '\n'
+        print(errorMsg)
+        LogMsg(errorMsg, statsLogFileName, True)
+        return False
+
+    errorMsg = "INFO JACatchUpLogFile() processing backlog of {0} bytes of logFile:{1} in {2} shards".format(
+        endPosition - startPosition, fileName, len(shardPositions) - 1)
+    print(errorMsg)
+    LogMsg(errorMsg, statsLogFileName, True)
+
+    import multiprocessing
+    shards = []
+    for shardIndex in range(len(shardPositions) - 1):
+        parentConnection, shardConnection = multiprocessing.Pipe()
+        procId = os.fork()
+        if procId == 0:
+            ### catch up process, send stats gathered from the shard and exit
+            parentConnection.close()
+            for tempConnection, tempProcId in shards:
+                tempConnection.close()
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            if hasattr(signal, 'SIGHUP'):
+                signal.signal(signal.SIGHUP, signal.SIG_IGN)
+            try:
+                shardConnection.send( JAProcessLogFileShard( logFileName, fileName,
+                    shardPositions[shardIndex], shardPositions[shardIndex+1], shardIndex == 0,
+                    tempPatternTimeStamp, tempTimeStampGroup, tempTimeStampFormat ) )
+            except Exception as err:
+                errorMsg = "ERROR JACatchUpLogFile() catch up process:{0} failed for logFile:{1}, error:{2}".format(
+                    os.getpid(), fileName, err)
+                print(errorMsg)
+                LogMsg(errorMsg, statsLogFileName, True)
+            sys.stdout.flush()
+            os._exit(0)
+
+        shardConnection.close()
+        shards.append( (parentConnection, procId) )
+
+    shardResults = []
+    for shardConnection, procId in shards:
+        try:
+            results = shardConnection.recv()
+            if results['readError'] == True:
+                results = None
+        except (EOFError, OSError):
+            results = None
+        shardResults.append( results )
+        shardConnection.close()
+        try:
+            os.waitpid( procId, 0 )
+        except OSError:
+            pass
+
+    if None in shardResults:
+        errorMsg = "ERROR JACatchUpLogFile() catch up failed for logFile:{0}, processing backlog in single process".format(fileName)
+        print(errorMsg)
+        LogMsg(errorMsg, statsLogFileName, True)
+        return False
+
+    ### merge stats of all shards, shards are in the order of lines in log file
+    intervalStats = {}
+    for results in shardResults:
+        for intervalStartTime, serviceStats in results['intervalStats'].items():
+            if intervalStartTime in intervalStats:
+                for key, keyStats in serviceStats.items():
+                    intervalStats[intervalStartTime][key].merge( keyStats )
+            else:
+                intervalStats[intervalStartTime] = serviceStats
+        previousSampleValues.update( results['previousSampleValues'] )
+        previousSampleValuesPresent.update( results['previousSampleValuesPresent'] )
+        JAMergeAgentStats( results['agentStats'] )
+        if results['logEventPriorityLevel'] < logEventPriorityLevel:
+            logEventPriorityLevel = results['logEventPriorityLevel']
+
+    intervalStartTimes = sorted( [ intervalStartTime for intervalStartTime in intervalStats.keys() if intervalStartTime != None ] )
+    for intervalStartTime, serviceStats in intervalStats.items():
+        if intervalStartTime != None and intervalStartTime == intervalStartTimes[-1] and intervalBucketing == True:
+            ### latest interval is kept open to add stats of lines processed after the backlog
+            for keyStats in serviceStats.values():
+                keyStats.timeStampFormat = tempTimeStampFormat
+            JAAddLogStatsWindow( intervalStartTime, serviceStats )
+            continue
+        if intervalStartTime == None or intervalStartTime == intervalStartTimes[-1]:
+            ### latest interval is posted along with the stats of lines processed after the backlog
+            for key, keyStats in serviceStats.items():
+                logStats[key].merge( keyStats )
+            continue
+
+        for keyStats in serviceStats.values():
+            keyStats.timeStamp = intervalStartTime + dataPostIntervalInSec
+            keyStats.timeStampFormat = tempTimeStampFormat
+        JAAddLogStatsBackfill( intervalStartTime, serviceStats )
+
+    fileReader.seek( endPosition )
+
+    errorMsg = "INFO JACatchUpLogFile() processed backlog of logFile:{0}, stats of {1} previous intervals to post".format(
+        fileName, max(len(intervalStartTimes) - 1, 0))
+    print(errorMsg)
+    LogMsg(errorMsg, statsLogFileName, True)
+    return True
+
 def JAProcessLogFile(logFileName, startTimeInSec, logFileProcessingStartTime, gatherLogStatsEnabled, debugLevel):
     global averageCPUUsage, thisHostName, logEventPriorityLevel, statsPatternIndexsList, traceId, OSType, logFileInfo
+    global profileLineCount
+
+    keyPriorities = [values.priority for values in JAStatsSpec[logFileName].values()]
+    ### set to True when log file parsing is disabled due to processing time, lines skipped are processed later
+    skippedDueToTime = False
+
+    if gatherLogStatsEnabled == True:
+        ### defer log file if CPU governor does not allow any of its keys, file position is not changed
+        ###   so that lines logged till next round are processed then
+        if (min(keyPriorities) if keyPriorities else maxCPUUsageLevels) > allowedPriorityLevel:
+            if logFileName not in logFileDeferredSince:
+                logFileDeferredSince[logFileName] = startTimeInSec
+            if debugLevel > 0:
+                print('DEBUG-1 JAProcessLogFile() deferred processing logFileName:{0}, allowedPriorityLevel:{1}'.format(
+                    logFileName, allowedPriorityLevel))
+            return False
+        ### look for files modified since the log file was deferred
+        deferredSinceTimeInSec = logFileDeferredSince.pop(logFileName, None)
+        if deferredSinceTimeInSec != None and deferredSinceTimeInSec < startTimeInSec:
+            startTimeInSec = deferredSinceTimeInSec
+
     logFileNames = JAGlobalLib.JAFindModifiedFiles(
         logFileName, startTimeInSec, debugLevel, thisHostName, OSType)
 
@@ -2483,6 +4578,11 @@ def JAProcessLogFile(logFileName, startTimeInSec, logFileProcessingStartTime, ga
 
         if debugLevel > 0:
             print('DEBUG-1 JAProcessLogFile() Processing log file: ' + fileName)
+        ### if this program is just started, resume from the position saved by prev run
+        resumedFromCheckpoint = False
+        if logFileInfo.get(fileName) == None:
+            resumedFromCheckpoint = JAResumeLogFileFromCheckpoint( fileName )
+
         if logFileInfo.get(fileName) == None:
             firstTime = True
         elif logFileInfo[fileName].get('filePosition') == None:
@@ -2492,11 +4592,13 @@ def JAProcessLogFile(logFileName, startTimeInSec, logFileProcessingStartTime, ga
             try:
                 # if the file was overwritten with same log file name,
                 # current file size can be less than filePosition store before
+                fileReader = logFileInfo[fileName].get('filePointer')
                 if os.path.getsize(fileName) < filePosition:
                     firstTime = True
+                    if fileReader != None:
+                        fileReader.close()
                 else:
                     firstTime = False
-                    file = logFileInfo[fileName].get('filePointer')
                     prevTimeInSec = logFileInfo[fileName].get('prevTime')
             except OSError as err:
                 errorMsg = 'ERROR - JAProcessLogFile() Can not access logFile:| ' + fileName + \
@@ -2514,10 +4616,10 @@ def JAProcessLogFile(logFileName, startTimeInSec, logFileProcessingStartTime, ga
         tempTimeStampFormat = None
 
         for key, values in JAStatsSpec[logFileName].items():
-            if ( values[indexForTimeStamp] != None ):
-                tempPatternTimeStamp = r'{0}'.format( values[indexForTimeStamp])
-                tempTimeStampGroup = values[indexForTimeStampGroup]
-                tempTimeStampFormat = r'{0}'.format( values[indexForTimeStampFormat])
+            if ( values.timeStamp != None ):
+                tempPatternTimeStamp = values.timeStamp
+                tempTimeStampGroup = values.timeStampGroup
+                tempTimeStampFormat = r'{0}'.format( values.timeStampFormat)
                 break
 
         if debugLevel > 1:
@@ -2535,7 +4637,7 @@ def JAProcessLogFile(logFileName, startTimeInSec, logFileProcessingStartTime, ga
             try:
                 fileSize = os.path.getsize(fileName)
                 logTimePointFound = False
-                file =  open(fileName, "r")
+                file =  open(fileName, "rb")
                 
                 if gatherLogStatsEnabled == True and tempPatternTimeStamp != None:
                     ### Open the log file that was changed within the FromTime specified, using binary halving method, locate the starting log line
@@ -2547,109 +4649,98 @@ def JAProcessLogFile(logFileName, startTimeInSec, logFileProcessingStartTime, ga
                         file.seek( filePosition, 0)
                         ### read two lines so that 2nd line has full line, including timestamp
                         logLine = file.readline()
-                        logLine = file.readline()
+                        logLine = file.readline().decode('utf-8', 'replace')
                         if not logLine:
                             break
                         filePosition = file.tell()
                         ### search for timestamp pattern
-                        try:
-                            myResults = re.findall( tempPatternTimeStamp, logLine)
+                        myResults = tempPatternTimeStamp.findall( logLine)
+                        patternMatchCount =  len(myResults)
+                        if myResults != None and patternMatchCount > 0 :
+                            ### if patterns found is greater than or equal to timeStampGroup, pick up the timeStamp value
+                            if patternMatchCount >= tempTimeStampGroup:
+                                currentTimeStampString = str(myResults[tempTimeStampGroup-1])
+                                timeInSeconds = (int(JAGlobalLib.JAConvertStringTimeToTimeInMicrosec(
+                                                currentTimeStampString, tempTimeStampFormat)))/1000000
+                                if timeInSeconds == 0:
+                                    errorMsg = "ERROR JAProcessLogFile() Error parsing the timestamp string:|{0}|, picked up from log line:|{1}, using the 'TimeStampFormat' spec:|{2}|, logFile:|{3}|, errorMsg:|{4}|".format(
+                                        currentTimeStampString, logLine, values.timeStampFormat, fileName, errorMsg)
+                                    LogMsg(errorMsg,statsLogFileName,True)
+                                    skipThisFile = True
+                                    break
+
+                                if timeInSeconds >  prevTimeInSec:                             
+                                    ### current time is greater than fromTime desired
+                                    if lastCheck < 0:
+                                        ### last check was less than fromTime
+                                        filePosition = lastPosition
+                                        if filePosition < 0:
+                                            filePosition = 0
+                                        file.seek( filePosition, 0)
+                                        break
+
+                                    if filePosition < 3000:
+                                        file.seek( 0, 0)
+                                        break
+
+                                    lastPosition =  filePosition
+                                    filePosition = int(filePosition / 2)
+                                    lastCheck = 1
+                                elif timeInSeconds < prevTimeInSec:   
+                                    ### current time is less than fromTime desired
+                                    if lastCheck > 0:
+                                        ### last time current timestamp was greater than fromTime
+                                        break
+                                    lastCheck = -1
+                                    if filePosition > ( fileSize - 3000) :
+                                        file.seek( filePosition, 0)
+                                        break
+                                    lastPosition = filePosition
+                                    filePosition = filePosition + int((fileSize - filePosition)/2)
+                            else:
+                                ### position to end of current line, to read next line that may have timestamp
+                                filePosition += len(logLine)
+
+                    if ( skipThisFile == False ):
+                        ### read line by line until the time stamp is greater than previous time stamp
+                        logTimePointFound = False
+                        while logTimePointFound == False:
+                            filePosition = file.tell()
+                            logLine = file.readline().decode('utf-8', 'replace')
+                            if not logLine:
+                                break
+                            ### search for timestamp pattern
+                            myResults = tempPatternTimeStamp.findall( logLine)
                             patternMatchCount =  len(myResults)
                             if myResults != None and patternMatchCount > 0 :
                                 ### if patterns found is greater than or equal to timeStampGroup, pick up the timeStamp value
                                 if patternMatchCount >= tempTimeStampGroup:
                                     currentTimeStampString = str(myResults[tempTimeStampGroup-1])
-                                    timeInSeconds = (int(JAGlobalLib.JAConvertStringTimeToTimeInMicrosec(
-                                                    currentTimeStampString, tempTimeStampFormat)))/1000000
+                                    timeInSeconds = (JAGlobalLib.JAConvertStringTimeToTimeInMicrosec(
+                                                    currentTimeStampString, tempTimeStampFormat))/1000000
                                     if timeInSeconds == 0:
                                         errorMsg = "ERROR JAProcessLogFile() Error parsing the timestamp string:|{0}|, picked up from log line:|{1}, using the 'TimeStampFormat' spec:|{2}|, logFile:|{3}|, errorMsg:|{4}|".format(
-                                            currentTimeStampString, logLine, values[indexForTimeStampFormat], fileName, errorMsg)
+                                            currentTimeStampString, logLine, values.timeStampFormat, fileName, errorMsg)
                                         LogMsg(errorMsg,statsLogFileName,True)
                                         skipThisFile = True
                                         break
 
-                                    if timeInSeconds >  prevTimeInSec:                             
-                                        ### current time is greater than fromTime desired
-                                        if lastCheck < 0:
-                                            ### last check was less than fromTime
-                                            filePosition = lastPosition
-                                            if filePosition < 0:
-                                                filePosition = 0
-                                            file.seek( filePosition, 0)
-                                            break
-
-                                        if filePosition < 3000:
-                                            file.seek( 0, 0)
-                                            break
-
-                                        lastPosition =  filePosition
-                                        filePosition = int(filePosition / 2)
-                                        lastCheck = 1
-                                    elif timeInSeconds < prevTimeInSec:   
-                                        ### current time is less than fromTime desired
-                                        if lastCheck > 0:
-                                            ### last time current timestamp was greater than fromTime
-                                            break
-                                        lastCheck = -1
-                                        if filePosition > ( fileSize - 3000) :
-                                            file.seek( filePosition, 0)
-                                            break
-                                        lastPosition = filePosition
-                                        filePosition = filePosition + int((fileSize - filePosition)/2)
-                                else:
-                                    ### position to end of current line, to read next line that may have timestamp
-                                    filePosition += len(logLine)
-                        except re.error as err: 
-                            errorMsg = "ERROR JAProcessLogFile() invalid timestamp pattern:|{0}|, regular expression error:|{1}|, skipping the log file:|{2}|".format(
-                                    patternTimeStamp,err, logFileName)
-                            LogMsg(errorMsg, statsLogFileName, True)
-                            file.close()
-                            skipThisFile = True
-                            break
+                                    if timeInSeconds >  prevTimeInSec:
+                                        logTimePointFound = True
+                                        ### go back to previous postion so that current line will be read again
+                                        file.seek( filePosition, 0)
+                                        break 
 
-                    if ( skipThisFile == False ):
-                        ### read line by line until the time stamp is greater than previous time stamp
-                        logTimePointFound = False
-                        while logTimePointFound == False:
-                            filePosition = file.tell()
-                            logLine = file.readline()
-                            if not logLine:
-                                break
-                            ### search for timestamp pattern
-                            try:
-                                myResults = re.findall( tempPatternTimeStamp, logLine)
-                                patternMatchCount =  len(myResults)
-                                if myResults != None and patternMatchCount > 0 :
-                                    ### if patterns found is greater than or equal to timeStampGroup, pick up the timeStamp value
-                                    if patternMatchCount >= tempTimeStampGroup:
-                                        currentTimeStampString = str(myResults[tempTimeStampGroup-1])
-                                        timeInSeconds = (JAGlobalLib.JAConvertStringTimeToTimeInMicrosec(
-                                                        currentTimeStampString, tempTimeStampFormat))/1000000
-                                        if timeInSeconds == 0:
-                                            errorMsg = "ERROR JAProcessLogFile() Error parsing the timestamp string:|{0}|, picked up from log line:|{1}, using the 'TimeStampFormat' spec:|{2}|, logFile:|{3}|, errorMsg:|{4}|".format(
-                                                currentTimeStampString, logLine, values[indexForTimeStampFormat], fileName, errorMsg)
-                                            LogMsg(errorMsg,statsLogFileName,True)
-                                            skipThisFile = True
-                                            break
-
-                                        if timeInSeconds >  prevTimeInSec:
-                                            logTimePointFound = True
-                                            ### go back to previous postion so that current line will be read again
-                                            file.seek( filePosition, 0)
-                                            break 
-
-                            except re.error as err: 
-                                errorMsg = "ERROR JAProcessLogFile() invalid timestamp pattern:|{0}|, regular expression error:|{1}|, skipping the log file:|{2}|".format(
-                                        patternTimeStamp,err, logFileName)
-                                LogMsg(errorMsg, statsLogFileName, True)
-                                file.close()
-                                skipThisFile = True
-                                break
                     
                     if debugLevel > 0:
                         filePosition = file.tell()
                         print("DEBUG-1 JAProcessLogFile() filePosition:{0}, logLine:{1}".format( filePosition, logLine))
 
+                ### lines from this position onwards are read in blocks
+                filePosition = file.tell()
+                file.close()
+                fileReader = JALogFileReader( fileName, filePosition)
+
             except OSError as err:
                 errorMsg = 'ERROR - JAProcessLogFile() Can not open logFile:| ' + fileName + \
                     '|' + "OS error: {0}".format(err) + '\n'
@@ -2665,12 +4756,9 @@ def JAProcessLogFile(logFileName, startTimeInSec, logFileProcessingStartTime, ga
         else:
             try:
                 # if this program is just started and it read file position from cache file,
-                # file pointer fill be None, need to open the file fresh
-                if file == None:
-                    file = open(fileName, "r")
-
-                # position file pointer to the previous position
-                file.seek(filePosition)
+                # file pointer fill be None, need to open the file fresh at the previous position
+                if fileReader == None:
+                    fileReader = JALogFileReader( fileName, filePosition)
             except OSError as err:
                 errorMsg = 'ERROR - JAProcessLogFile() Can not seek position in logFile:|' + \
                     fileName + '|' + "OS error: {0}".format(err) + '\n'
@@ -2685,6 +4773,7 @@ def JAProcessLogFile(logFileName, startTimeInSec, logFileProcessingStartTime, ga
             elapsedTimeInSec = time.time() - logFileProcessingStartTime
             if elapsedTimeInSec > maxProcessingTimeForAllEvents:
                 gatherLogStatsEnabled =  False
+                skippedDueToTime = True
                 if ( debugLevel ):
                     errorMsg = "DEBUG-1 JAProcessLogFile() disabled log file parsing, elapsedTimeInSec:{0} is greater than maxProcessingTimeForAllEvents:{1}, logFileProcessingStartTime:{2}, currentTime:{3}".format(
                         elapsedTimeInSec, maxProcessingTimeForAllEvents, logFileProcessingStartTime, time.time() )
@@ -2695,14 +4784,20 @@ def JAProcessLogFile(logFileName, startTimeInSec, logFileProcessingStartTime, ga
         # so that next time, search can start from that position onwards.
         # do not search for patterns in log lines
         # this is to avoid overloading the system when CPU usage is higher than max limit set
+        # lines skipped due to processing time, including lines logged while this program was not running
+        #   when processing is resumed from checkpoint saved by prev run, are saved as pending range, to be processed later
         if gatherLogStatsEnabled == False:
             try:
+                startPosition = fileReader.position
                 # position 0 bytes from end of file
-                file.seek(0, 2)
+                fileReader.seekToEnd()
+                if skippedDueToTime == True or resumedFromCheckpoint == True:
+                    JAAddPendingRange( logFileName, fileName, fileReader, startPosition, fileReader.position, 0 )
                 # end of file, save position info
                 logFileInfo[fileName]['fileName'] = fileName
-                logFileInfo[fileName]['filePointer'] = file
-                logFileInfo[fileName]['filePosition'] = file.tell()
+                logFileInfo[fileName]['logFileName'] = logFileName
+                logFileInfo[fileName]['filePointer'] = fileReader
+                logFileInfo[fileName]['filePosition'] = fileReader.position
                 logFileInfo[fileName]['prevTime'] = time.time()
 
             except OSError as err:
@@ -2716,463 +4811,274 @@ def JAProcessLogFile(logFileName, startTimeInSec, logFileProcessingStartTime, ga
 
         else:
             # gatherLogStats enabled
-            while True:
-                try:
-                    prevFilePosition = file.tell()
-                    if( debugLevel > 3 ):
-                        print( 'DEBUG-4 JAProcessLogFile() prevFilePosition:{0}'.format(prevFilePosition))
-                    # read line by line
-                    tempLine = file.readline()
-                    if not tempLine:
-                        ### if file has grown from last read and not able to read the file now using previous file pointer,
-                        ###    try closing the file, open the file and read from prev file position
-                        fileSize = os.path.getsize( fileName)
-                        if( fileSize > prevFilePosition):
-                            if( debugLevel > 1 ):
-                                print('DEBUG-2 JAProcessLogFile() closing the file and reopening the file:{0}, prevFilePosition:{1}, fileSize:{2}'.format(
-                                    fileName, prevFilePosition, fileSize))
-                            file.close()
-                            file = open( fileName, "r")
-                            file.seek(prevFilePosition)
-                            tempLine = file.readline()
-                            logFileInfo[fileName]['filePointer'] = file
-
-                    if not tempLine:
-                        # end of file, pause processing for now
-                        logFileInfo[fileName]['fileName'] = fileName
-                        logFileInfo[fileName]['filePointer'] = file
-                        logFileInfo[fileName]['filePosition'] = file.tell()
-                        logFileInfo[fileName]['prevTime'] = time.time()
-                        if debugLevel > 0:
-                            print('DEBUG-1 JAProcessLogFile() Reached end of log file: ' + fileName)
-                        break
+            startPosition = fileReader.position
+            ### if backlog to process is large, like after downtime, process it in parallel
+            if tempPatternTimeStamp != None:
+                JACatchUpLogFile( logFileName, fileName, fileReader, tempPatternTimeStamp, tempTimeStampGroup, tempTimeStampFormat )
+
+            tempPrefilter = logFilePrefilter.get(logFileName)
+            ### in byte mode, prefilter is bytes pattern, lines are decoded only after matching prefilter
+            byteMode = logFileByteMode.get(logFileName, False)
+            lastLineSkippedByPrefilter = None
+            ### stats are gathered in the window of the timestamp of log line
+            selectWindow = intervalBucketing == True and tempPatternTimeStamp != None
+            linesReadBefore = agentStats['linesRead']
+            for tempLine in fileReader.readLines( decodeLines = not byteMode ):
+                # SKIP short lines
+                if len(tempLine) < 2:
+                    continue
 
-                    # SKIP short lines
-                    if len(tempLine) < 2:
+                ### if current line does not match to any pattern of any key of this log file, SKIP further processing
+                ###   while trace block is in progress, every line needs to be processed
+                if tempPrefilter != None and traceBlocksInProgressCount[fileName] == 0:
+                    if tempPrefilter.search( tempLine) == None:
+                        lastLineSkippedByPrefilter = tempLine
+                        continue
+                lastLineSkippedByPrefilter = None
+                if byteMode == True:
+                    tempLine = JADecodeLogLine( tempLine )
+
+                if selectWindow == True:
+                    timeInSeconds = JAGetLogLineTimeInSec( tempLine, fileName, tempPatternTimeStamp, tempTimeStampGroup, tempTimeStampFormat )
+                    if timeInSeconds != None and timeInSeconds != 0:
+                        JASelectLogStatsWindow( logFileName, timeInSeconds, tempTimeStampFormat )
+
+                if profileSampleInterval > 0:
+                    profileLineCount += 1
+                    if profileLineCount >= profileSampleInterval:
+                        profileLineCount = 0
+                        JAProfileLogLine( tempLine, fileName, logFileName, tempPatternTimeStamp, tempTimeStampGroup, tempTimeStampFormat )
                         continue
 
-                except OSError as err:
-                    errorMsg = 'ERROR - JAProcessLogFile() error reading a line from logFile:|' + \
-                        fileName + '|' + "OS error: {0}".format(err) + '\n'
-                    print(errorMsg)
-                    LogMsg(errorMsg, statsLogFileName, True)
-                    # store error status so that next round, this will not be tried
-                    logFileInfo[fileName]['filePosition'] = 'ERROR'
-                    continue    
+                JAProcessLogLine( tempLine, fileName, logFileName, tempPatternTimeStamp, tempTimeStampGroup, tempTimeStampFormat )
 
-                patternMatched = patternLogMatched = patternTraceMatched = False
+            JAAddRegexEvaluations( logFileName, agentStats['linesRead'] - linesReadBefore )
 
-                # search results are stored in logStats in below form
-                # key - service name
-                # values -  value1, presentFlag1, value2, presentFlag2,....
-                # { 'AlarmCRIT': [ 0, False, 0, False, 2, True, 0, False],
-                #   'ApacheICDR': [ 2, True, 0, False, 0, False, 0, False]}
-                #                    pass      fail     count     stats
+            if fileReader.readError == True:
+                # store error status so that next round, this will not be tried
+                logFileInfo[fileName]['filePosition'] = 'ERROR'
+                continue
 
-                # search for pass, fail, count, stats patterns of each service associated with this log file
+            ### if last lines were skipped by prefilter, stats timestamp of keys that process every line
+            ###   is updated using the last skipped line
+            if lastLineSkippedByPrefilter != None and tempPatternTimeStamp != None:
+                if byteMode == True:
+                    lastLineSkippedByPrefilter = JADecodeLogLine( lastLineSkippedByPrefilter )
                 for key, values in JAStatsSpec[logFileName].items():
-                    eventPriority = values[indexForPriority]
-
-                    keyDebugLevel = values[indexForDebugLevel]
-
-                    if averageCPUUsage > maxCPUUsageForEvents[eventPriority]:
-                        if logEventPriorityLevel == maxCPUUsageLevels:
-                            ### first time log file processing skipped, store current event priorityy
-                            logEventPriorityLevel = eventPriority
-                        elif logEventPriorityLevel > eventPriority :
-                            ## if previous event priority skipped is higher than current priority,
-                            ##   save new priority
-                            logEventPriorityLevel = eventPriority
-                    else:
-                        ### proceed with search if current CPU usage is lower than max CPU usage allowed
-                        index = 0
+                    if values.statsProcessing == True and values.variablePrefix == None and values.label == None:
+                        JAUpdateStatsTimeStamp( lastLineSkippedByPrefilter, fileName, key, values, tempPatternTimeStamp, tempTimeStampGroup, tempTimeStampFormat)
+
+            ### keys deferred by CPU governor are processed for these lines later
+            if max( keyPriorities ) > allowedPriorityLevel:
+                JAAddPendingRange( logFileName, fileName, fileReader, startPosition, fileReader.position, allowedPriorityLevel )
+
+            # end of file, pause processing for now
+            logFileInfo[fileName]['fileName'] = fileName
+            logFileInfo[fileName]['logFileName'] = logFileName
+            logFileInfo[fileName]['filePointer'] = fileReader
+            logFileInfo[fileName]['filePosition'] = fileReader.position
+            logFileInfo[fileName]['prevTime'] = time.time()
+            if debugLevel > 0:
+                print('DEBUG-1 JAProcessLogFile() Reached end of log file: ' + fileName)
+
+    ### catch up lines skipped before when all keys are allowed
+    if gatherLogStatsEnabled == True and allowedPriorityLevel == maxCPUUsageLevels - 1:
+        JAProcessPendingRanges( logFileName, logFileProcessingStartTime )
+
+    JAExpireTraceBlocks( JAStatsSpec[logFileName] )
+    return True
 
-                        ### if current key has spec related to trace processing, 
-                        if values[indexForTraceProcessing] == True and maxTraceLines > 0 and patternTraceMatched == False:   
-                            if int(logTracesCount[key]) < maxTraceLines:
-                                patternTraceMatched = JAProcessLineForTrace( tempLine, fileName, key, values, keyDebugLevel )
+"""
+JAAddPendingRange( logFileName, fileName, fileReader, startPosition, endPosition, processedPriorityLevel )
+Save byte range of the log file skipped for keys with priority above processedPriorityLevel, to be processed later
+Range is merged with previous range if it continues that range
+"""
+def JAAddPendingRange( logFileName, fileName, fileReader, startPosition, endPosition, processedPriorityLevel ):
+    if endPosition <= startPosition:
+        return
+    try:
+        fileStat = os.fstat( fileReader.file.fileno() )
+    except OSError:
+        return
+    fileId = [fileStat.st_dev, fileStat.st_ino]
+    pendingRanges = logFilePendingRanges[logFileName].setdefault( fileName, [] )
+    if len(pendingRanges) > 0:
+        lastRange = pendingRanges[-1]
+        if lastRange[1] == startPosition and lastRange[2] == processedPriorityLevel and lastRange[3] == fileId:
+            lastRange[1] = endPosition
+            return
+    pendingRanges.append( [startPosition, endPosition, processedPriorityLevel, fileId] )
 
-                        ## upon trace match, log line is collected, thus, no need to search for log line again
-                        if patternTraceMatched == False  and maxLogLines > 0 and values[indexForLogProcessing] == True and patternLogMatched == False:
-                            if int(logLinesCount[key]) < maxLogLines:
-                                patternLogMatched = JAProcessLineForLog( tempLine, fileName, key, values, keyDebugLevel )
+"""
+JAGetPendingBytes()
+Return number of bytes in pending ranges of log files processed by this process
+"""
+def JAGetPendingBytes():
+    pendingBytes = 0
+    for pendingRangesOfFiles in logFilePendingRanges.values():
+        for pendingRanges in pendingRangesOfFiles.values():
+            for pendingRange in pendingRanges:
+                pendingBytes += pendingRange[1] - pendingRange[0]
+    return pendingBytes
 
-                        ### if current key does not have any stats processing spec, skip it
-                        if values[indexForStatsProcessing] != True:
-                            continue
+"""
+JAProcessPendingRanges( logFileName, logFileProcessingStartTime )
+Process pending ranges of the log file, oldest first, till the ranges are processed
+  or elapsed time exceeds maxProcessingTimeForAllEvents, range is processed partially if time is up while processing it
+Stats are bucketed using the timestamp of the lines, stats of previous intervals are posted with the timestamp of that interval
+Log lines and traces are not collected for the lines of pending range
+"""
+def JAProcessPendingRanges( logFileName, logFileProcessingStartTime ):
+    pendingRangesOfFiles = logFilePendingRanges.get(logFileName)
+    if not pendingRangesOfFiles:
+        return
 
-                        ### if variable prefix is defined for current service, 
-                        ###   see whether the variable prefix pattern is present in current line
-                        variablePrefix = None
-                        if values[indexForVariablePrefix] != None:
-                            variablePrefixSearchPattern = r'{0}'.format( values[indexForVariablePrefix])
-                            try:
-                                myResults = re.search( variablePrefixSearchPattern, tempLine)
-                                if myResults == None:
-                                    ### since variable prefix is not matching, SKIP processing this line any further
-                                    # since variable prefix will be prefixed to variables, if that is not present,
-                                    #  no need to match any other patterns for this service 
-                                    continue
-                                else:
-                                    if values[indexForVariablePrefixGroup] != None:
-                                        ### use the group value; based on pattern match, as variable prefix.
-                                        ### Log line: 2021-10-05T01:09:03.249334 Stats MicroService25 total key1 9 dummy1 total key2 4.50 dummy2
-                                        ###                                                        ^^ <-- variablePrefixGroupValues (two groups)
-                                        ### PatternVariablePrefix: Stats MicroService(\d)(\d) total
-                                        ###                                                ^ <-- variable prefix, group 2
-                                        ###  use 2nd group value as variable prefix for the *_avrage metrics variable
-                                        ###  PatternVariablePrefixGroup: 2
-                                        variablePrefix = myResults.group(values[indexForVariablePrefixGroup])
-                                    else:
-                                        variablePrefix = myResults.group(1)
-                            except re.error as err:
-                                errorMsg = "ERROR invalid pattern:|{0}|, regular expression error:|{1}|".format(variablePrefixSearchPattern,err)
-                                print(errorMsg)
-                                LogMsg(errorMsg, statsLogFileName, True)
-                                ### discard this pattern so that no need to check this again
-                                values[indexForVariablePrefix] = None
-                                continue
-                        ### if patternLabel is defined for current service, 
-                        ###   see whether the label  pattern is present in current line
-                        labelPrefix = None
-                        if values[indexForLabel] != None:
-                            patternLabelSearchPattern = r'{0}'.format( values[indexForLabel])
-                            try:
-                                myResults = re.search( patternLabelSearchPattern, tempLine)
-                                if myResults == None:
-                                    ### since pattern label is not matching, SKIP processing this line any further
-                                    # since label will be posted with the data, if that label is not present,
-                                    #  no need to match any other patterns for this service 
-                                    continue
-                                else:
-                                    if values[indexForLabelGroup] != None:
-                                        ### use the group value; based on pattern match, as label.
-                                        ### Log line: 2021-10-30T13:32:49.825709 Stats client1 total key1 34 dummy1 total key2 17.00 dummy2
-                                        ###                                            ^^^^^^^ <-- labelGroup (signle group)
-                                        ### PatternLabel: Stats (\w+) total
-                                        ###                      ^^^ <-- label, group 1
-                                        ###  use 1st group value as label this metrics
-                                        ###  PatternLabelGroup: 1
-                                        labelPrefix = myResults.group(values[indexForLabelGroup])
-                                    else:
-                                        labelPrefix = myResults.group(1)
-                            except re.error as err:
-                                errorMsg = "ERROR invalid pattern:|{0}|, regular expression error:|{1}|".format(patternLabelSearchPattern,err)
-                                print(errorMsg)
-                                LogMsg(errorMsg, statsLogFileName, True)
-                                ### discard this pattern so that no need to check this again
-                                values[indexForLabel] = None
-                                continue
-
-                        ### if current line has time stamp pattern, store that timestamp to post to web server
-                        try:
-                            if tempPatternTimeStamp != None:
-                                myResults = re.findall( tempPatternTimeStamp, tempLine)
-                                patternMatchCount =  len(myResults)
-                                if myResults != None and patternMatchCount > 0 :
-                                    ### if patterns found is greater than or equal to timeStampGroup, pick up the timeStamp value
-                                    if patternMatchCount >= tempTimeStampGroup:
-                                        currentTimeStampString = str(myResults[tempTimeStampGroup-1])
-                                        timeInSeconds = (int(JAGlobalLib.JAConvertStringTimeToTimeInMicrosec(
-                                                        currentTimeStampString, tempTimeStampFormat)))/1000000
-                                        if timeInSeconds == 0:
-                                            errorMsg = "ERROR JAProcessLogFile() Error parsing the timestamp string:|{0}|, picked up from log line:|{1}, using the 'TimeStampFormat' spec:|{2}|, logFile:|{3}|".format(
-                                                currentTimeStampString, tempLine, values[indexForTimeStampFormat], fileName)
-                                            LogMsg(errorMsg,statsLogFileName,True)
-                                        else:
-                                            logStats[key][indexForTimeStampFormat*2] = datetime.datetime.fromtimestamp(timeInSeconds).strftime(tempTimeStampFormat) 
-                                            logStats[key][indexForTimeStampFormat*2+1] = True   
-                        except re.error as err: 
-                            errorMsg = "ERROR JAProcessLogFile() invalid timestamp pattern:|{0}|, regular expression error:|{1}|, log line:|{2}|".format(
-                                    patternTimeStamp,err, tempLine)
-                            LogMsg(errorMsg, statsLogFileName, True)
-
-                        ### see whether current line match to any stats definitions
-                        for index in statsPatternIndexsList:
-
-                            if values[index] == None:
-                                continue
-                        
-                            logStatsKeyValueIndexEven = index * 2
-                            logStatsKeyValueIndexOdd = logStatsKeyValueIndexEven + 1
-                            
-                            searchPattern = r'{0}'.format(values[index])
-                            if index == indexForPatternSum or index == indexForPatternAverage or index == indexForPatternDelta :
-                                ### special processing needed to extract the statistics from current line
-                                try:
-                                    myResults = re.findall( searchPattern, tempLine)
-                                except re.error as err:
-                                    errorMsg = "ERROR invalid pattern:|{0}|, regular expression error:|{1}|".format(searchPattern,err)
-                                    print(errorMsg)
-                                    LogMsg(errorMsg, statsLogFileName, True)
-                                    ### discard this pattern so that no need to check this again
-                                    values[index] = None
-                                    continue
-                                patternMatchCount =  len(myResults)
-                                if myResults != None and patternMatchCount > 0 :
-                                    ### current line has stats in one or more places. Aggregate the values
-                                    ### the pattern spec is in the format
-                                    ###   <pattern>(Key1)<pattern>(value1)<pattern>key2<pattern>value2....
-                                    numStats = 0
-
-                                    ### make a copy of current list values
-                                    tempStats = list(logStats[key][logStatsKeyValueIndexOdd])
-
-                                    ### make a copy of sampleCountList values for average type metrics
-                                    if index == indexForPatternAverage :
-                                        sampleCountList = list(logStats[key][logStatsKeyValueIndexEven])
-
-                                    if keyDebugLevel > 3:
-                                        print("DEBUG-4 JAProcessLogFile() processing line with PatternDelta, PatternSum or PatternAverage, search result:{0}\n Previous values:{1}".format(myResults, tempStats))
-                                    tempKey = ''
-                                    appendCurrentValueToList = False
-                                    indexToCurrentKeyInTempStats = 0
-                                    groupNumber = 0
-
-
-                                    ### if pattern matches to single instance in line, len(myResults) will be 1
-                                    ###     myResults is of the form = [ (key1, value1, key2, value2....)]
-                                    ### if pattern matches to multiple instances in line, len(myResults) will be > 1
-                                    while patternMatchCount > 0:
-                                        patternMatchCount -= 1
-
-                                        tempResults = myResults.pop(0)
-
-                                        if values[indexForCSVVariableNames] != None:
-                                            CSVVariableNames = list(logStats[key][indexForCSVVariableNames*2])
-                                        else:
-                                            CSVVariableNames = None
-
-                                        for tempResult in tempResults:
-                                            groupNumber += 1
-                                            if values[indexForSkipGroups] != None:
-                                                ### if current group number is in skipGroup list, skip it
-                                                if ( str(groupNumber) in values[indexForSkipGroups]):
-                                                    continue
-                                            
-                                            ### if line in CSV format, use the variable names defined in config file
-                                            if values[indexForCSVVariableNames] != None:
-                                                ### log line is in CSV format, each field contains data
-                                                tempResultContainsValue = True
-                                                try:
-                                                    if CSVVariableNames[groupNumber-1] != None:
-                                                        currentVariableName = CSVVariableNames[groupNumber-1]
-                                                    else:
-                                                        currentVariableName = 'GroupNumber{0}'.format(groupNumber-1)
-                                                except:
-                                                    currentVariableName = 'GroupNumber{0}'.format(groupNumber)
-
-                                                ### if variable prefix is present, prefix that to current key
-                                                if variablePrefix != None :
-                                                    currentVariableName = '{0}_{1}'.format( variablePrefix, currentVariableName)
-
-                                                ### if label is present, prefix that to updated current key
-                                                ### this format of :<label>: needs to match the pattern searched
-                                                ###  in JASaveStats.py
-                                                if labelPrefix != None:
-                                                    currentVariableName = ':{0}:{1}'.format( labelPrefix, currentVariableName)
-
-                                                ### if current key is NOT present in list, append it
-                                                # if len(tempStats) <= numStats :
-                                                try:
-                                                    tempIndexToCurrentKeyInTempStats = tempStats.index( currentVariableName)
-                                                    if tempIndexToCurrentKeyInTempStats >= 0 :
-                                                        appendCurrentValueToList = False
-                                                        ### in order to store key/value pair associated with variable prefefix
-                                                        ###    need to find the index at which that variablePrefix_key is present
-                                                        ##     in the list and use that to aggregate the value
-                                                        indexToCurrentKeyInTempStats = tempIndexToCurrentKeyInTempStats                                                        
-                                                except ValueError:
-                                                    ### value is NOT present in tempStats list
-                                                    appendCurrentValueToList = True
-                                                    ### current tempResult is not yet in the list, append it
-                                                    tempStats.append(currentVariableName)
-                                                    if index == indexForPatternAverage :
-                                                        sampleCountList.append(1)
-
-                                                ### save the key name, this is used to make a combined key later <serviceName>_<key>
-                                                tempKey = currentVariableName
-
-                                            else:
-                                                if numStats % 2 == 0:
-                                                    tempResultContainsValue = False
-                                                    ### if current name has space, replace it with '_'
-                                                    currentVariableName = re.sub('\s','_',tempResult)
-                                                    ### if variable prefix is present, prefix that to current key
-                                                    if variablePrefix != None :
-                                                        currentVariableName = '{0}_{1}'.format( variablePrefix, currentVariableName)
-
-                                                    ### if label is present, prefix that to updated current key
-                                                    ### this format of :<label>: needs to match the pattern searched
-                                                    ###  in JASaveStats.py
-                                                    if labelPrefix != None:
-                                                        currentVariableName = ':{0}:{1}'.format( labelPrefix, currentVariableName)
-
-                                                    ### if current key is NOT present in list, append it
-                                                    # if len(tempStats) <= numStats :
-                                                    try:
-                                                        tempIndexToCurrentKeyInTempStats = tempStats.index( currentVariableName)
-                                                        if tempIndexToCurrentKeyInTempStats >= 0 :
-                                                            appendCurrentValueToList = False
-                                                            ### in order to store key/value pair associated with variable prefefix
-                                                            ###    need to find the index at which that variablePrefix_key is present
-                                                            ##     in the list and use that to aggregate the value
-                                                            indexToCurrentKeyInTempStats = tempIndexToCurrentKeyInTempStats                                                        
-                                                    except ValueError:
-                                                        ### value is NOT present in tempStats list
-                                                        appendCurrentValueToList = True
-                                                        ### current tempResult is not yet in the list, append it
-                                                        tempStats.append(currentVariableName)
-                                                        if index == indexForPatternAverage :
-                                                            sampleCountList.append(1)
-
-                                                    ### save the key name, this is used to make a combined key later <serviceName>_<key>
-                                                    tempKey = currentVariableName
-
-                                                else:
-                                                    tempResultContainsValue = True
-
-                                            if tempResultContainsValue == True:
-                                                ### find out the nature of the value, number or string
-                                                try:
-                                                    float(tempResult)
-                                                    tempResultIsNumber = True
-                                                except:
-                                                    tempResultIsNumber = False
-
-                                                ## value portion of key/ value pair
-                                                ## if index is indexForPatternDelta, tempResult is cumulative value, need to subtract previous sample
-                                                ## value to get delta value and store it as current sample value.
-                                                if  index == indexForPatternDelta:
-                                                    serviceNameSubKey = "{0}_{1}".format( key, tempKey)
-                                                    if tempResultIsNumber == True:
-                                                        tempResultToStore = float(tempResult)
-                                                    else:
-                                                        tempResultToStore = tempResult
-                                                    if previousSampleValuesPresent[serviceNameSubKey] == True :
-                                                        if tempResultIsNumber == True:
-                                                            ### previous value present, subtract prev value from current value to get delta value for current sample
-                                                            tempResult = float(tempResult) - previousSampleValues[serviceNameSubKey]
-                                                        ## if string, leave the value as is
-                                                    else:
-                                                        # store default value of 0, this is to initialize the list with value so that next time, the operation succeeds
-                                                        tempResult = 0
-                                                        previousSampleValuesPresent[serviceNameSubKey] = True
-
-                                                    ### store current sample value as is as previous sample
-                                                    previousSampleValues[serviceNameSubKey] = tempResultToStore
-                                                
-                                                if appendCurrentValueToList == True:
-                                                    if tempResultIsNumber == True:
-                                                        tempStats.append(float(tempResult))
-                                                    else:
-                                                        ### vlaue is string type
-                                                        tempStats.append(tempResult)
-
-                                                    ### if working average type metrics, set sample count in the list corresponding to 
-                                                    ###     current key in key/value list
-                                                    if index == indexForPatternAverage :
-                                                        sampleCountList.append(1)
-
-                                                else:
-                                                    if tempResultIsNumber == True:
-                                                        ### add to existing value
-                                                        tempStatsFloat = float(tempStats[indexToCurrentKeyInTempStats+1]) + float(tempResult)
-                                                        tempStats[indexToCurrentKeyInTempStats+1] = str(tempStatsFloat)
-                                                    ### if string type, leave it as is
-                                                    else:
-                                                        tempStats[indexToCurrentKeyInTempStats+1] += tempResult
-
-                                                    ### if working average type metrics, increment sample count in the list corresponding to 
-                                                    ###     current key in key/value list
-                                                    if index == indexForPatternAverage :
-                                                        sampleCountList[indexToCurrentKeyInTempStats+1] += 1
-                                            numStats += 1
-
-                                    ### for average type, sample count is incremented based for ecach prefix variable key values   
-                                    if index == indexForPatternAverage :
-                                        logStats[key][logStatsKeyValueIndexEven] = list(sampleCountList)
-                                    else:
-                                        ### increment sample count
-                                        logStats[key][logStatsKeyValueIndexEven] += 1
+    tempPatternTimeStamp = tempTimeStampGroup = tempTimeStampFormat = None
+    for key, values in JAStatsSpec[logFileName].items():
+        if ( values.timeStamp != None ):
+            tempPatternTimeStamp = values.timeStamp
+            tempTimeStampGroup = values.timeStampGroup
+            tempTimeStampFormat = r'{0}'.format( values.timeStampFormat)
+            break
 
-                                    ### store tempStats as list
-                                    logStats[key][logStatsKeyValueIndexOdd] = list(tempStats)
+    endTime = logFileProcessingStartTime + maxProcessingTimeForAllEvents
+    for fileName in list(pendingRangesOfFiles.keys()):
+        pendingRanges = pendingRangesOfFiles[fileName]
+        while len(pendingRanges) > 0:
+            if time.time() > endTime:
+                return
+            startPosition, endPosition, tempProcessedPriorityLevel, fileId = pendingRanges[0]
+            try:
+                fileStat = os.stat( fileName )
+                if [fileStat.st_dev, fileStat.st_ino] != fileId or fileStat.st_size < endPosition:
+                    fileStat = None
+            except OSError:
+                fileStat = None
+            if fileStat == None:
+                errorMsg = "WARN JAProcessPendingRanges() logFile:{0} is rotated or removed, discarded pending {1} bytes".format(
+                    fileName, endPosition - startPosition)
+                print(errorMsg)
+                LogMsg(errorMsg, statsLogFileName, True)
+                pendingRanges.pop(0)
+                continue
 
-                                    if keyDebugLevel > 3:
-                                        print('DEBUG-4 JAProcessLogFile() key: {0}, found pattern:|{1}|, numSamples:{2}, stats: {3}'.format(
-                                            key, values[index], logStats[key][logStatsKeyValueIndexEven], logStats[key][logStatsKeyValueIndexOdd] ))
-                                    ### get out of the loop
-                                    patternMatched = True
-                            else:
-                                try:
-                                    if re.search(searchPattern, tempLine) != None:
-                                        ### matching pattern found for pass, fail, count type of tracking
-
-                                        ### if PatternLabel is present, need to prepare variable name with lable value
-                                        ###  in the form <label> and track the values as list
-                                        ###  for the index logStats[key][logStatsKeyValueIndexEven]
-                                        if ( labelPrefix ) != None:
-                                            tempListVarName = ':{0}:'.format( labelPrefix)
-                                            ### prepare variable name to be used in list
-                                            numStats = 0
-
-                                            try:
-                                                ### make a copy of current list values
-                                                tempListStats = list(logStats[key][logStatsKeyValueIndexEven])
-                                                if keyDebugLevel > 3:
-                                                    print("DEBUG-4 JAProcessLogFile() processing line with PatternLabel:{0}, tempListStats:{1}".format(tempListVarName, tempListStats))
-                                                appendCurrentValueToList = False
-                                                indexToCurrentKeyInTempStats = 0
-
-                                                try:
-                                                    tempIndexToCurrentKeyInTempStats = tempListStats.index( tempListVarName )
-                                                    if tempIndexToCurrentKeyInTempStats >= 0 :
-                                                        ### this is the case of couting pass, fail, count
-                                                        ###   increment conut
-                                                        tempListStats[tempIndexToCurrentKeyInTempStats+1] += 1
-
-                                                except ValueError:
-                                                    ### value is NOT present in tempStats list, append it
-                                                    tempListStats.append(tempListVarName)
-                                                    ## start with stats value of 1 for this label
-                                                    tempListStats.append(1)
-                                            except:
-                                                print("ERROR internal error - key:{0}, logStatsKeyValueIndexEven:{1}, logStats[key][logStatsKeyValueIndexEven]:{2}, labelPrefix:{3}".format(\
-                                                    key, logStatsKeyValueIndexEven, logStats[key][logStatsKeyValueIndexEven], labelPrefix))  
-
-                                        elif ( index != indexForTimeStamp and \
-                                            index != indexForSkip and \
-                                            index != indexForCSVVariableNames):
-                                            ### matching pattern found without any label, increment the count 
-                                            logStats[key][logStatsKeyValueIndexEven] += 1
-
-                                        if keyDebugLevel > 3:
-                                            print('DEBUG-4 JAProcessLogFile() key: {0}, found pattern:|{1}|, stats: {2}'.format(
-                                                    key, values[index], logStats[key][logStatsKeyValueIndexEven] ))
-                                        ### get out of the loop
-                                        patternMatched = True
-                                except re.error as err:
-                                    errorMsg = "ERROR invalid pattern:|{0}|, regular expression error:|{1}|".format(searchPattern,err)
-                                    print(errorMsg)
-                                    LogMsg(errorMsg, statsLogFileName, True)
-                                    ### discard this pattern so that no need to check this again
-                                    values[index] = None
-                                    continue
-                        
-                        ## if both log pattern and stats pattern matched, get out of the while loop
-                        if patternMatched == True and (patternLogMatched == True or patternTraceMatched == True):
-                            break
-                        else:
-                            ### increment index so that search continues with next pattern
-                            index += 1         
+            results = JACatchUpPendingRange( logFileName, fileName, startPosition, endPosition, tempProcessedPriorityLevel,
+                                             tempPatternTimeStamp, tempTimeStampGroup, tempTimeStampFormat, endTime )
+            if results == None:
+                errorMsg = "ERROR JAProcessPendingRanges() catch up failed for logFile:{0}, discarded pending {1} bytes".format(
+                    fileName, endPosition - startPosition)
+                print(errorMsg)
+                LogMsg(errorMsg, statsLogFileName, True)
+                pendingRanges.pop(0)
+                continue
+            JAMergePendingRangeStats( logFileName, results['intervalStats'], tempProcessedPriorityLevel, tempTimeStampFormat )
+            JAMergeAgentStats( results['agentStats'] )
 
-                    ## if log pattern or stats pattern matched, get out of the for loop
-                    ## once a given line matched to a log or stats pattern, search for matching pattern stops
-                    if patternMatched == True and (patternLogMatched == True or patternTraceMatched == True):
-                        break
+            if results['endPosition'] < endPosition:
+                pendingRanges[0][0] = results['endPosition']
+            else:
+                pendingRanges.pop(0)
+            if debugLevel > 0:
+                print('DEBUG-1 JAProcessPendingRanges() processed pending range of logFile:{0}, startPosition:{1}, endPosition:{2}, processedPriorityLevel:{3}'.format(
+                    fileName, startPosition, results['endPosition'], tempProcessedPriorityLevel))
+        del pendingRangesOfFiles[fileName]
 
-    return True
+"""
+JACatchUpPendingRange( logFileName, fileName, startPosition, endPosition, tempProcessedPriorityLevel, tempPatternTimeStamp, tempTimeStampGroup, tempTimeStampFormat, endTime )
+Gather stats of the lines of pending range in catch up process, for keys with priority above tempProcessedPriorityLevel,
+  till endPosition or endTime whichever is earlier
+On Windows, lines are processed in this process, state changed by JAProcessLogFileShard() is restored after that
+Returns results of JAProcessLogFileShard(), None if catch up failed
+"""
+def JACatchUpPendingRange( logFileName, fileName, startPosition, endPosition, tempProcessedPriorityLevel, tempPatternTimeStamp, tempTimeStampGroup, tempTimeStampFormat, endTime ):
+    global processedPriorityLevel, maxLogLines, maxTraceLines, logEventPriorityLevel
+    if OSType == 'Windows':
+        savedLogStats = dict(logStats)
+        savedPreviousSampleValues = dict(previousSampleValues)
+        savedPreviousSampleValuesPresent = dict(previousSampleValuesPresent)
+        savedAgentStats = dict(agentStats)
+        savedState = (maxLogLines, maxTraceLines, logEventPriorityLevel)
+        processedPriorityLevel = tempProcessedPriorityLevel
+        try:
+            results = JAProcessLogFileShard( logFileName, fileName, startPosition, endPosition, False,
+                tempPatternTimeStamp, tempTimeStampGroup, tempTimeStampFormat, endTime )
+            if results['readError'] == True:
+                results = None
+        except Exception as err:
+            errorMsg = "ERROR JACatchUpPendingRange() catch up failed for logFile:{0}, error:{1}".format(fileName, err)
+            print(errorMsg)
+            LogMsg(errorMsg, statsLogFileName, True)
+            results = None
+        processedPriorityLevel = 0
+        logStats.update( savedLogStats )
+        previousSampleValues.clear()
+        previousSampleValues.update( savedPreviousSampleValues )
+        previousSampleValuesPresent.clear()
+        previousSampleValuesPresent.update( savedPreviousSampleValuesPresent )
+        agentStats.clear()
+        agentStats.update( savedAgentStats )
+        maxLogLines, maxTraceLines, logEventPriorityLevel = savedState
+        return results
+
+    import multiprocessing
+    parentConnection, childConnection = multiprocessing.Pipe()
+    procId = os.fork()
+    if procId == 0:
+        ### catch up process, send stats gathered from the range and exit
+        parentConnection.close()
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        if hasattr(signal, 'SIGHUP'):
+            signal.signal(signal.SIGHUP, signal.SIG_IGN)
+        processedPriorityLevel = tempProcessedPriorityLevel
+        try:
+            ### previous sample of delta type is not known, first sample in the range is used as previous sample
+            childConnection.send( JAProcessLogFileShard( logFileName, fileName, startPosition, endPosition, False,
+                tempPatternTimeStamp, tempTimeStampGroup, tempTimeStampFormat, endTime ) )
+        except Exception as err:
+            errorMsg = "ERROR JACatchUpPendingRange() catch up process:{0} failed for logFile:{1}, error:{2}".format(
+                os.getpid(), fileName, err)
+            print(errorMsg)
+            LogMsg(errorMsg, statsLogFileName, True)
+        sys.stdout.flush()
+        os._exit(0)
+
+    childConnection.close()
+    try:
+        results = parentConnection.recv()
+        if results['readError'] == True:
+            results = None
+    except (EOFError, OSError):
+        results = None
+    parentConnection.close()
+    try:
+        os.waitpid( procId, 0 )
+    except OSError:
+        pass
+    return results
+
+"""
+JAMergePendingRangeStats( logFileName, intervalStats, tempProcessedPriorityLevel, tempTimeStampFormat )
+Add stats of pending range to the stats of the interval of line timestamp, for keys with priority above tempProcessedPriorityLevel
+Stats of intervals already posted are saved in logStatsBackfill to be posted with the timestamp of that interval
+"""
+def JAMergePendingRangeStats( logFileName, intervalStats, tempProcessedPriorityLevel, tempTimeStampFormat ):
+    keySpecs = JAStatsSpec[logFileName]
+    currentIntervalStartTime = int(time.time() / dataPostIntervalInSec) * dataPostIntervalInSec
+    for intervalStartTime, serviceStats in intervalStats.items():
+        serviceStats = { key: keyStats for key, keyStats in serviceStats.items() if keySpecs[key].priority > tempProcessedPriorityLevel }
+        if intervalStartTime == None or (intervalBucketing == False and intervalStartTime >= currentIntervalStartTime):
+            ### posted along with the stats of current interval
+            for key, keyStats in serviceStats.items():
+                logStats[key].merge( keyStats )
+        elif intervalBucketing == True and intervalStartTime > lastClosedWindowStartTime:
+            for keyStats in serviceStats.values():
+                keyStats.timeStampFormat = tempTimeStampFormat
+            JAAddLogStatsWindow( intervalStartTime, serviceStats )
+        else:
+            for keyStats in serviceStats.values():
+                keyStats.timeStamp = intervalStartTime + dataPostIntervalInSec
+                keyStats.timeStampFormat = tempTimeStampFormat
+            JAAddLogStatsBackfill( intervalStartTime, serviceStats )
 
 def JARetryLogStatsPost(currentTime):
     """
@@ -3225,8 +5131,488 @@ def JARetryLogStatsPost(currentTime):
             print(errorMsg)
             LogMsg(errorMsg, statsLogFileName, True)
 
+### log file worker processes, list of [connection to worker, process id, log file names assigned to worker]
+logFileWorkers = []
+
+"""
+JAStartLogFileWorkers()
+Start maxWorkerProcesses worker processes and assign log files to them in round robin way
+Each worker keeps the log files assigned to it open across rounds so that
+  file positions, partial lines and trace blocks stay within one process
+Not supported on Windows, log files are processed in this process
+"""
+def JAStartLogFileWorkers():
+    logFileNames = sorted(JAStatsSpec.keys())
+    numberOfWorkers = min(maxWorkerProcesses, len(logFileNames))
+    if numberOfWorkers <= 1:
+        return
+    if OSType == 'Windows':
+        errorMsg = "WARN MaxWorkerProcesses is not supported on Windows, processing log files in single process"
+        print(errorMsg)
+        LogMsg(errorMsg, statsLogFileName, True)
+        return
+
+    import multiprocessing
+    for workerIndex in range(numberOfWorkers):
+        workerLogFileNames = logFileNames[workerIndex::numberOfWorkers]
+        parentConnection, workerConnection = multiprocessing.Pipe()
+        procId = os.fork()
+        if procId == 0:
+            ### worker process, close connections of other workers so that they see end of file when parent exits
+            parentConnection.close()
+            for tempConnection, tempProcId, tempLogFileNames in logFileWorkers:
+                tempConnection.close()
+            ### pending ranges of log files of other workers are processed by those workers
+            for tempLogFileName in list(logFilePendingRanges.keys()):
+                if tempLogFileName not in workerLogFileNames:
+                    del logFilePendingRanges[tempLogFileName]
+            ### stats gathered by parent process before worker is started, like when it is restarted
+            ###   by JAReloadConfig(), are posted by parent process, reset them in this process
+            JACollectWorkerResults( workerLogFileNames )
+            ### parent process handles interrupt and reload requests
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            if hasattr(signal, 'SIGHUP'):
+                signal.signal(signal.SIGHUP, signal.SIG_IGN)
+            JALogFileWorkerLoop( workerConnection )
+
+        workerConnection.close()
+        logFileWorkers.append( [parentConnection, procId, workerLogFileNames] )
+        ### files of these log files are read by worker process from now on, file positions are updated by its replies
+        for fileInfo in logFileInfo.values():
+            if fileInfo.get('logFileName') in workerLogFileNames and fileInfo.get('filePointer') != None:
+                fileInfo['filePointer'].close()
+                fileInfo['filePointer'] = None
+        ### pending ranges are processed by worker process, reported in each reply of worker
+        for logFileName in workerLogFileNames:
+            if logFileName in logFilePendingRanges:
+                logFilePendingRangesWorkers[logFileName] = logFilePendingRanges.pop(logFileName)
+        errorMsg = "INFO JAStartLogFileWorkers() started worker process:{0} for log files:{1}".format(procId, workerLogFileNames)
+        print(errorMsg)
+        LogMsg(errorMsg, statsLogFileName, True)
+
+"""
+JALogFileWorkerLoop( connection )
+Worker process loop, process log files for each request received from parent, send stats gathered in reply
+Exits when parent process closes the connection
+"""
+def JALogFileWorkerLoop( connection ):
+    global allowedPriorityLevel, logEventPriorityLevel
+    ### self metrics of parent process copied while forking this process are reported by parent process
+    agentStats.clear()
+    try:
+        while True:
+            try:
+                request = connection.recv()
+            except (EOFError, OSError):
+                ### parent process exited
+                break
+            if request == None:
+                break
+            (logFileNames, startTimeInSec, processingStartTime, gatherLogStatsEnabled,
+                allowedPriorityLevel, logEventPriorityLevel) = request
+            for logFileName in logFileNames:
+                JAProcessLogFile(logFileName, startTimeInSec, processingStartTime,
+                                 gatherLogStatsEnabled, debugLevel)
+            connection.send( JACollectWorkerResults( logFileNames ) )
+    except Exception as err:
+        errorMsg = "ERROR JALogFileWorkerLoop() worker process:{0} exiting, error:{1}".format(os.getpid(), err)
+        print(errorMsg)
+        LogMsg(errorMsg, statsLogFileName, True)
+    sys.stdout.flush()
+    ### do not return to main program in worker process
+    os._exit(0)
+
+"""
+JACollectWorkerResults( logFileNames )
+In worker process, return stats, log lines and traces gathered for keys of given log files and
+  reset them for next round. File positions are returned so that parent can save them in file info
+"""
+def JACollectWorkerResults( logFileNames ):
+    global workerCPUSecondsReported
+    ### CPU seconds used by this worker process since last reply, counted in CPU budget by parent process
+    tempTimes = os.times()
+    cpuSeconds = tempTimes[0] + tempTimes[1]
+    results = {
+        'cpuSeconds': cpuSeconds - workerCPUSecondsReported,
+        'logStats': {}, 'logLines': {}, 'logLinesCount': {}, 'logTraces': {}, 'logTracesCount': {},
+        'logFileInfo': {}, 'logEventPriorityLevel': logEventPriorityLevel,
+        'logStatsBackfill': dict(logStatsBackfill),
+        'logStatsWindows': dict(logStatsWindows), 'logStatsWatermark': logStatsWatermark,
+        'traceBlocksEvicted': dict(traceBlocksEvicted), 'logPendingBytes': JAGetPendingBytes(),
+        'logFilePendingRanges': { logFileName: logFilePendingRanges[logFileName] for logFileName in logFileNames if logFileName in logFilePendingRanges },
+        'profileStats': dict(profileStats), 'profileLogFiles': dict(profileLogFiles),
+        'profileIntervalStats': dict(profileIntervalStats),
+        'agentStats': dict(agentStats), 'processId': os.getpid(), 'memoryRSS': JAGlobalLib.JAGetProcessRSS() }
+    workerCPUSecondsReported = cpuSeconds
+    agentStats.clear()
+    ### profile is kept by parent process
+    profileStats.clear()
+    profileLogFiles.clear()
+    profileIntervalStats.clear()
+    logStatsBackfill.clear()
+    traceBlocksEvicted.clear()
+    ### windows are closed by parent process, lines after this are counted in window opened again
+    logStatsWindows.clear()
+    logStatsWindowOpenTime.clear()
+    for logFileName in logFileNames:
+        for key, keySpec in JAStatsSpec[logFileName].items():
+            if key in logStatsWindowKeys:
+                ### stats of lines without timestamp are kept till window is opened
+                if logStatsCurrentWindow.get(logFileName) != None:
+                    logStats[key] = JAServiceStats(keySpec)
+            else:
+                results['logStats'][key] = logStats[key]
+                logStats[key] = JAServiceStats(keySpec)
+            JAAddLogLineCounts(key)
+            results['logLines'][key] = logLines[key]
+            logLines[key] = []
+            results['logLinesCount'][key] = logLinesCount[key]
+            logLinesCount[key] = 0
+            logLinesBytes[key] = 0
+            results['logTraces'][key] = logTraces[key]
+            logTraces[key] = []
+            results['logTracesCount'][key] = logTracesCount[key]
+            logTracesCount[key] = 0
+        if logFileName in logStatsCurrentWindow:
+            logStatsCurrentWindow[logFileName] = None
+
+    ### file info copied from parent process while forking this process is not returned
+    for fileName, fileInfo in logFileInfo.items():
+        if fileInfo.get('logFileName') not in logFileNames:
+            continue
+        results['logFileInfo'][fileName] = {
+            'fileName': fileName, 'logFileName': fileInfo.get('logFileName'),
+            'filePosition': fileInfo.get('filePosition'), 'prevTime': fileInfo.get('prevTime') }
+    return results
+
+"""
+JAMergeWorkerResults( results )
+Add stats, log lines and traces gathered by a worker process to the ones of this process
+"""
+def JAMergeWorkerResults( results ):
+    global logEventPriorityLevel, logStatsWatermark, agentCPUSecondsWorkers, logPendingBytesWorkers
+    agentCPUSecondsWorkers += results['cpuSeconds']
+    logPendingBytesWorkers += results['logPendingBytes']
+    JAMergeProfile( results['profileStats'], results['profileLogFiles'], results['profileIntervalStats'] )
+    JAMergeAgentStats( results['agentStats'] )
+    agentMemoryRSSWorkers[results['processId']] = results['memoryRSS']
+    for key, keyStats in results['logStats'].items():
+        logStats[key].merge( keyStats )
+    for intervalStartTime, serviceStats in results['logStatsBackfill'].items():
+        JAAddLogStatsBackfill( intervalStartTime, serviceStats )
+    for windowStartTime, window in results['logStatsWindows'].items():
+        JAAddLogStatsWindow( windowStartTime, window )
+    if results['logStatsWatermark'] > logStatsWatermark:
+        logStatsWatermark = results['logStatsWatermark']
+    for key, keyLogLines in results['logLines'].items():
+        logLines[key].extend( keyLogLines )
+    for key, count in results['logLinesCount'].items():
+        logLinesCount[key] += count
+    for key, keyLogTraces in results['logTraces'].items():
+        logTraces[key].extend( keyLogTraces )
+    for key, count in results['logTracesCount'].items():
+        logTracesCount[key] += count
+    for key, count in results['traceBlocksEvicted'].items():
+        traceBlocksEvicted[key] += count
+    ### file positions and pending ranges are saved by JAWriteFileInfo() from this process
+    for fileName, fileInfo in results['logFileInfo'].items():
+        logFileInfo[fileName].update( fileInfo )
+    logFilePendingRangesWorkers.update( results['logFilePendingRanges'] )
+    if results['logEventPriorityLevel'] < logEventPriorityLevel:
+        logEventPriorityLevel = results['logEventPriorityLevel']
+
+"""
+JAProcessLogFiles( logFileNames, startTimeInSec, processingStartTime, gatherLogStatsEnabled )
+Process given log files, in worker processes if started, else in this process
+If a worker process is not reachable, its log files are processed in this process from the saved file positions
+"""
+def JAProcessLogFiles( logFileNames, startTimeInSec, processingStartTime, gatherLogStatsEnabled ):
+    global logPendingBytesWorkers
+    logFileNamesToProcess = list(logFileNames)
+    workersToReply = []
+    for worker in list(logFileWorkers):
+        workerConnection, procId, workerLogFileNames = worker
+        tempLogFileNames = [ logFileName for logFileName in logFileNamesToProcess if logFileName in workerLogFileNames ]
+        if len(tempLogFileNames) == 0:
+            continue
+        try:
+            workerConnection.send( (tempLogFileNames, startTimeInSec, processingStartTime, gatherLogStatsEnabled,
+                                    allowedPriorityLevel, logEventPriorityLevel) )
+            workersToReply.append( worker )
+            for logFileName in tempLogFileNames:
+                logFileNamesToProcess.remove( logFileName )
+        except OSError as err:
+            JAStopLogFileWorker( worker, err )
+
+    ### pending bytes are reported by workers in each reply
+    if len(workersToReply) > 0:
+        logPendingBytesWorkers = 0
+
+    ### process log files not handled by worker processes while workers are processing their log files
+    for logFileName in logFileNamesToProcess:
+        JAProcessLogFile(logFileName, startTimeInSec, processingStartTime,
+                         gatherLogStatsEnabled, debugLevel)
+
+    for worker in workersToReply:
+        try:
+            JAMergeWorkerResults( worker[0].recv() )
+        except (EOFError, OSError) as err:
+            JAStopLogFileWorker( worker, err )
+            for logFileName in worker[2]:
+                if logFileName in logFileNames:
+                    JAProcessLogFile(logFileName, startTimeInSec, processingStartTime,
+                                     gatherLogStatsEnabled, debugLevel)
+
+"""
+JAStopLogFileWorker( worker, err )
+Remove worker process that is not reachable, its log files are processed in this process from next round
+"""
+def JAStopLogFileWorker( worker, err ):
+    workerConnection, procId, workerLogFileNames = worker
+    errorMsg = "ERROR JAStopLogFileWorker() worker process:{0} not reachable, error:{1}, processing log files:{2} in main process".format(
+        procId, err, workerLogFileNames)
+    print(errorMsg)
+    LogMsg(errorMsg, statsLogFileName, True)
+    workerConnection.close()
+    logFileWorkers.remove( worker )
+    try:
+        os.kill( procId, signal.SIGTERM )
+        os.waitpid( procId, 0 )
+    except OSError:
+        pass
+    ### pending ranges reported by the worker are processed in this process
+    for logFileName in workerLogFileNames:
+        if logFileName in logFilePendingRangesWorkers:
+            logFilePendingRanges[logFileName] = logFilePendingRangesWorkers.pop(logFileName)
+
+"""
+JAStopLogFileWorkers()
+Ask worker processes to exit and wait for them to exit
+File positions and pending ranges reported by worker processes in last reply are kept in this process
+  so that worker processes started after this resume from there. Trace blocks in progress in worker processes are discarded
+"""
+def JAStopLogFileWorkers():
+    global logPendingBytesWorkers
+    for worker in list(logFileWorkers):
+        workerConnection, procId, workerLogFileNames = worker
+        try:
+            workerConnection.send( None )
+            os.waitpid( procId, 0 )
+        except OSError:
+            pass
+        workerConnection.close()
+        logFileWorkers.remove( worker )
+        for logFileName in workerLogFileNames:
+            if logFileName in logFilePendingRangesWorkers:
+                logFilePendingRanges[logFileName] = logFilePendingRangesWorkers.pop(logFileName)
+        errorMsg = "INFO JAStopLogFileWorkers() stopped worker process:{0} of log files:{1}".format(procId, workerLogFileNames)
+        print(errorMsg)
+        LogMsg(errorMsg, statsLogFileName, True)
+    logPendingBytesWorkers = 0
+
+"""
+JAGetHostCPUUsage()
+Return CPU usage % of the host since previous call, derived from /proc/stat
+If /proc/stat is not available, return average CPU usage saved by JAGatherOSStats
+"""
+def JAGetHostCPUUsage():
+    global hostCPUTimesPrev
+    try:
+        with open('/proc/stat') as procFile:
+            cpuTimes = procFile.readline().split()
+    except (IOError, OSError):
+        return JAGlobalLib.JAGetAverageCPUUsage()
+    if len(cpuTimes) < 6 or cpuTimes[0] != 'cpu':
+        return JAGlobalLib.JAGetAverageCPUUsage()
+
+    ### user, nice, system, idle, iowait, irq, softirq, steal, guest time is included in user time
+    cpuTimes = [ float(cpuTime) for cpuTime in cpuTimes[1:9] ]
+    idleTime = cpuTimes[3] + cpuTimes[4]
+    totalTime = sum(cpuTimes)
+    prevCPUTimes = hostCPUTimesPrev
+    hostCPUTimesPrev = [idleTime, totalTime]
+    if prevCPUTimes == None or totalTime <= prevCPUTimes[1]:
+        return 0
+    return 100.0 - 100.0 * (idleTime - prevCPUTimes[0]) / (totalTime - prevCPUTimes[1])
+
+"""
+JAGetAgentCPUSeconds()
+Return CPU seconds used by this program so far, including worker and catch up processes
+"""
+def JAGetAgentCPUSeconds():
+    tempTimes = os.times()
+    ### children times include catch up processes and worker processes that exited
+    return tempTimes[0] + tempTimes[1] + tempTimes[2] + tempTimes[3] + agentCPUSecondsWorkers
+
+"""
+JAUpdateCPUGovernor()
+Sample CPU usage of the host and of this program, update CPU seconds available in budget,
+  set allowedPriorityLevel, keys with priority above this level are deferred till next round
+Priority of a key is allowed when host CPU usage is under MaxCPUUsageForPriority<N>Events and
+  CPU seconds available is above the share of budget for that priority
+"""
+def JAUpdateCPUGovernor():
+    global averageCPUUsage, cpuSecondsAvailable, agentCPUSecondsPrev, agentCPUSecondsUsed, allowedPriorityLevel, logEventPriorityLevel
+
+    averageCPUUsage = JAGetHostCPUUsage()
+
+    agentCPUSeconds = JAGetAgentCPUSeconds()
+    cpuSecondsUsed = agentCPUSeconds - agentCPUSecondsPrev
+    agentCPUSecondsPrev = agentCPUSeconds
+    agentCPUSecondsUsed += cpuSecondsUsed
+    if maxCPUSecondsPerInterval > 0:
+        cpuSecondsAvailable = min( cpuSecondsAvailable - cpuSecondsUsed + maxCPUSecondsPerInterval, maxCPUSecondsPerInterval )
+
+    allowedPriorityLevel = maxCPUUsageLevels - 1
+    if averageCPUUsage > maxCPUUsageForEvents[0]:
+        allowedPriorityLevel = 0
+    else:
+        while allowedPriorityLevel > 0:
+            if averageCPUUsage > maxCPUUsageForEvents[allowedPriorityLevel]:
+                allowedPriorityLevel -= 1
+            elif maxCPUSecondsPerInterval > 0 and \
+                cpuSecondsAvailable < maxCPUSecondsPerInterval * cpuBudgetShareForPriority[allowedPriorityLevel]:
+                allowedPriorityLevel -= 1
+            else:
+                break
+
+    if allowedPriorityLevel < maxCPUUsageLevels - 1:
+        ### lowest priority deferred, posted to web server
+        logEventPriorityLevel = allowedPriorityLevel + 1
+    if debugLevel > 0:
+        print('DEBUG-1 JAUpdateCPUGovernor() host CPU usage:{0:.1f}, CPU seconds used:{1:.3f}, available:{2:.3f}, allowedPriorityLevel:{3}'.format(
+            averageCPUUsage, cpuSecondsUsed, cpuSecondsAvailable, allowedPriorityLevel))
+
+"""
+JAWatchLogFiles( waitTimeInSec )
+Wait for change in watched log files for waitTimeInSec, process the changed log files as changes are seen
+Changes seen within watchIntervalInSec are processed together so that log file is not processed for each line written
+Stats gathered here are posted by main loop after waitTimeInSec
+"""
+def JAWatchLogFiles( waitTimeInSec ):
+    waitEndTime = time.time() + waitTimeInSec
+    while True:
+        remainingTimeInSec = waitEndTime - time.time()
+        if remainingTimeInSec <= 0:
+            break
+        changedLogFileNames = logFileWatcher.waitForChange( remainingTimeInSec )
+        if len(changedLogFileNames) == 0:
+            continue
+
+        processingStartTime = time.time()
+        JAProcessLogFiles( sorted(changedLogFileNames), loopStartTimeInSec, processingStartTime,
+                           JAGatherLogStatsEnabled )
+        if debugLevel > 1:
+            print('DEBUG-2 JAWatchLogFiles() processed changed log files:{0}, processing time:{1}'.format(
+                changedLogFileNames, time.time() - processingStartTime))
+
+        ### changes seen during this sleep are processed together after the sleep
+        remainingTimeInSec = waitEndTime - time.time()
+        if remainingTimeInSec > 0:
+            time.sleep( min(watchIntervalInSec, remainingTimeInSec) )
+
+"""
+JABenchmarkReadAndFilter( logFileName, fileName )
+Read lines of the file and search prefilter of the log file name without processing the lines,
+  time taken is the readAndFilter stage of benchmark
+"""
+def JABenchmarkReadAndFilter( logFileName, fileName ):
+    tempPrefilter = logFilePrefilter.get(logFileName)
+    byteMode = logFileByteMode.get(logFileName, False)
+    fileReader = JALogFileReader( fileName, 0)
+    for tempLine in fileReader.readLines( decodeLines = not byteMode ):
+        if tempPrefilter != None:
+            tempPrefilter.search( tempLine)
+    fileReader.close()
+
+"""
+JARunBenchmark()
+Process log files once from the start without posting to web server, report throughput and exit
+Engine options like MaxWorkerProcesses, CatchUpThresholdInMB, IntervalBucketing are taken from config file so that
+  the same corpus can be processed with different config files to compare them
+Stages reported
+  readAndFilter - CPU seconds to read lines and search prefilter, measured in a separate pass before processing
+  processLines - rest of CPU seconds used to process the log files
+  trace, log, stats pattern search - estimated from every 1000th line when ProfileSampleInterval is not set,
+    time of the patterns searched while processing sampled lines, part of processLines
+"""
+def JARunBenchmark():
+    global maxProcessingTimeForAllEvents, maxCPUSecondsPerInterval, allowedPriorityLevel, profileSampleInterval
+    maxProcessingTimeForAllEvents = float('inf')
+    maxCPUSecondsPerInterval = 0
+    allowedPriorityLevel = maxCPUUsageLevels - 1
+    if profileSampleInterval == 0:
+        profileSampleInterval = 1000
+
+    agentCPUSecondsStart = JAGetAgentCPUSeconds()
+    for logFileName in sorted(JAStatsSpec.keys()):
+        for fileName in JAGlobalLib.JAFindModifiedFiles( logFileName, 1, debugLevel, thisHostName, OSType):
+            try:
+                JABenchmarkReadAndFilter( logFileName, fileName )
+            except OSError as err:
+                errorMsg = 'ERROR - JARunBenchmark() Can not read logFile:|{0}|, OS error: {1}'.format( fileName, err)
+                print(errorMsg)
+                LogMsg(errorMsg, statsLogFileName, True)
+                continue
+            ### process the file from the start, like resuming from checkpoint at position 0
+            logFileInfo[fileName] = { 'fileName': fileName, 'filePosition': 0, 'prevTime': 1 }
+    readAndFilterCPUSeconds = JAGetAgentCPUSeconds() - agentCPUSecondsStart
+    agentStats.clear()
+
+    JAStartLogFileWorkers()
+    agentCPUSecondsStart = JAGetAgentCPUSeconds()
+    benchmarkStartTime = time.time()
+    ### pass 1 for start time so that all files of log file name are processed
+    JAProcessLogFiles( sorted(JAStatsSpec.keys()), 1, benchmarkStartTime, True )
+    elapsedTimeInSec = max( time.time() - benchmarkStartTime, 0.000001 )
+    ### CPU seconds of worker processes are reported in their results
+    cpuSecondsUsed = JAGetAgentCPUSeconds() - agentCPUSecondsStart
+
+    ### stop worker processes so that their peak RSS is included in the peak RSS of child processes
+    for workerConnection, procId, workerLogFileNames in logFileWorkers:
+        try:
+            workerConnection.send( None )
+            workerConnection.close()
+            os.waitpid( procId, 0 )
+        except OSError:
+            pass
+
+    try:
+        import resource
+        ### ru_maxrss is in bytes on MacOS, in KB on other unix hosts
+        rssUnit = 1 if platform.system() == 'Darwin' else 1024
+        peakRSS = resource.getrusage( resource.RUSAGE_SELF ).ru_maxrss * rssUnit
+        peakRSSChildren = resource.getrusage( resource.RUSAGE_CHILDREN ).ru_maxrss * rssUnit
+    except ImportError:
+        peakRSS = JAGlobalLib.JAGetProcessRSS()
+        peakRSSChildren = 0
+
+    linesRead = agentStats['linesRead']
+    bytesRead = agentStats['bytesRead']
+    stageTimes = defaultdict(int)
+    for profileKey, stageTime in profileIntervalStats.items():
+        stageTimes[profileKey[1]] += stageTime
+    benchmarkResults = [
+        "INFO JARunBenchmark() configFile:{0}, logFiles:{1}, lines:{2}, bytes:{3}, elapsedTimeInSec:{4:.3f}, CPUSeconds:{5:.3f}".format(
+            configFile, ','.join(sorted(JAStatsSpec.keys())), linesRead, bytesRead, elapsedTimeInSec, cpuSecondsUsed),
+        "INFO JARunBenchmark() lines/sec:{0:.0f}, MB/sec:{1:.2f}, regexEvaluations:{2}, peakRSS:{3}, peakRSSChildren:{4}".format(
+            linesRead / elapsedTimeInSec, bytesRead / 1048576 / elapsedTimeInSec, agentStats['regexEvaluations'], peakRSS, peakRSSChildren),
+        "INFO JARunBenchmark() stage CPUSeconds, readAndFilter:{0:.3f}, processLines:{1:.3f}, estimated pattern search, {2}".format(
+            readAndFilterCPUSeconds, max( cpuSecondsUsed - readAndFilterCPUSeconds, 0 ),
+            ', '.join( [ '{0}:{1:.3f}'.format( stage, stageTimes[stage] * profileSampleInterval / 1000000000 ) for stage in ('trace', 'log', 'stats') ] ) ) ]
+    JAWriteProfile()
+
+    for errorMsg in benchmarkResults:
+        print(errorMsg)
+        LogMsg(errorMsg + '\n', statsLogFileName, True)
+    sys.stdout.flush()
+    sys.exit(0)
+
+if benchmarkMode == True:
+    JARunBenchmark()
+
 # read file info saved during prev run
-# JAReadFileInfo()
+JAReadFileInfo()
 
 # reduce process priority
 if OSType == 'Windows':
@@ -3240,80 +5626,203 @@ else:
     if debugLevel > 1:
         print("DEBUG-2 process priority: {0}".format(os.nice(0)))
 
-### delete old log files
-if OSType == 'Windows':
-    ### TBD expand this later 
-    logFilesToDelete = None
+"""
+JADeleteOldLogFiles()
+Delete log files of this program older than 7 days
+"""
+def JADeleteOldLogFiles():
+    if OSType == 'Windows':
+        ### TBD expand this later 
+        logFilesToDelete = None
 
-else:
-    tempFileNameToDelete = '{0}*'.format(statsLogFileName)
-    result =  subprocess.run(['find', '-name', tempFileNameToDelete, '-mtime', '+7'],stdout=subprocess.PIPE,stderr=subprocess.PIPE) 
-    logFilesToDelete = result.stdout.decode('utf-8').split('\n')
+    else:
+        tempFileNameToDelete = '{0}*'.format(statsLogFileName)
+        result =  subprocess.run(['find', '-name', tempFileNameToDelete, '-mtime', '+7'],stdout=subprocess.PIPE,stderr=subprocess.PIPE) 
+        logFilesToDelete = result.stdout.decode('utf-8').split('\n')
 
-if logFilesToDelete != None:
-    for deleteFileName in logFilesToDelete:
-        if deleteFileName != '':
-            os.remove( deleteFileName)
+    if logFilesToDelete != None:
+        for deleteFileName in logFilesToDelete:
+            if deleteFileName != '':
+                os.remove( deleteFileName)
 
+"""
+JAStartRetryLogStatsPost( currentTime )
+Process retryLogStats files if present with time stamp within retryDurationInHours, in child process
+"""
+def JAStartRetryLogStatsPost( currentTime ):
+    ### clean up child process of prev retry operation if it is completed
+    if OSType != 'Windows':
+        try:
+            while os.waitpid(-1, os.WNOHANG)[0] > 0:
+                pass
+        except OSError:
+            pass
+
+    if retryDurationInHours > 0 :
+        skipRetry = False 
+        ### read the last time this process was started, 
+        ###   if the time elapsed is less than 24 times dataCollectDurationInSec, 
+        ###   prev instance is still running, get out
+        prevStartTime = JAGlobalLib.JAReadTimeStamp( "JAGatherLogStats.RetryStartTime")
+        if prevStartTime > 0:
+            currentTime = time.time()
+            if ( prevStartTime + 24 * dataCollectDurationInSec) > currentTime:
+                errorMsg = 'INFO - Previous retry operation still in progress'
+                print(errorMsg)
+                LogMsg(errorMsg,statsLogFileName, True)
+                skipRetry = True
 
-### process retryLogStats files if present with time stamp within retryDurationInHours
-if retryDurationInHours > 0 :
-    skipRetry = False 
-    ### read the last time this process was started, 
-    ###   if the time elapsed is less than 24 times dataCollectDurationInSec, 
-    ###   prev instance is still running, get out
-    prevStartTime = JAGlobalLib.JAReadTimeStamp( "JAGatherLogStats.RetryStartTime")
-    if prevStartTime > 0:
-        currentTime = time.time()
-        if ( prevStartTime + 24 * dataCollectDurationInSec) > currentTime:
-            errorMsg = 'INFO - Previous retry operation still in progress'
-            print(errorMsg)
-            LogMsg(errorMsg,statsLogFileName, True)
-            skipRetry = True
-
-    if skipRetry == False:
-        ### Create a file with current time stamp
-        JAGlobalLib.JAWriteTimeStamp("JAGatherLogStats.RetryStartTime")
-        if OSType == 'Windows':
-            errorMsg = "ERROR RetryDurationInHours is not suppported on Windows, history data not sent to webserver automatically"
+        if skipRetry == False:
+            ### Create a file with current time stamp
+            JAGlobalLib.JAWriteTimeStamp("JAGatherLogStats.RetryStartTime")
+            if OSType == 'Windows':
+                errorMsg = "ERROR RetryDurationInHours is not suppported on Windows, history data not sent to webserver automatically"
+                print(errorMsg)
+                LogMsg(errorMsg, statsLogFileName, True)
+                JAGlobalLib.JAWriteTimeStamp("JAGatherLogStats.RetryStartTime", 0)
+            else:
+                procId = os.fork()
+                if procId == 0:
+                    ### child process
+                    JARetryLogStatsPost(currentTime)
+                    JAGlobalLib.JAWriteTimeStamp("JAGatherLogStats.RetryStartTime", 0)
+                    errorMsg = "INFO Retry operation completed"
+                    print(errorMsg)
+                    LogMsg(errorMsg,statsLogFileName, True)
+                    sys.exit(0)
+
+"""
+JAReloadConfig()
+Read config file again and apply the spec of LogFile and Execute sections in this process
+Log file positions, pending ranges, previous sample values of delta metrics and windows open are retained
+Worker processes are stopped and started again so that they use the new spec
+Parameters of Environment section, log file and cache file names are applied when this program is restarted
+"""
+def JAReloadConfig():
+    global JAStatsSpec, JAExecuteCommandSpec, logFilePrefilter, logFileByteMode, logFileWatcher, reloadConfigRequested
+    reloadConfigRequested = False
+    errorMsg = 'INFO - JAReloadConfig() reloading configFile:{0}'.format(configFile)
+    print(errorMsg)
+    LogMsg(errorMsg, statsLogFileName, True)
+    try:
+        tempStats = JAReadConfigFile()
+        tempStatsSpec = JAGatherLogFileSpecs( tempStats['LogFile'] )
+        tempExecuteCommandSpec = JAGatherExecuteCommandSpecs( tempStats )
+        ### config file being edited or not in expected format
+        if len(tempStatsSpec) == 0:
+            raise ValueError('no key with LogFileName in LogFile section')
+    except Exception as err:
+        errorMsg = 'ERROR - JAReloadConfig() Can not read configFile:|{0}|, error:{1}, continuing with current spec'.format(configFile, err)
+        print(errorMsg)
+        LogMsg(errorMsg, statsLogFileName, True)
+        return False
+
+    for sectionName in ('Environment', 'GatherLogStatsLogFile', 'GatherLogStatsCacheFile'):
+        if tempStats.get(sectionName) != JAStats.get(sectionName):
+            errorMsg = 'WARN  JAReloadConfig() {0} is changed in configFile:{1}, restart this program to apply it'.format(sectionName, configFile)
             print(errorMsg)
             LogMsg(errorMsg, statsLogFileName, True)
-            JAGlobalLib.JAWriteTimeStamp("JAGatherLogStats.RetryStartTime", 0)
-        else:
-            procId = os.fork()
-            if procId == 0:
-                ### child process
-                JARetryLogStatsPost(programStartTime)
-                JAGlobalLib.JAWriteTimeStamp("JAGatherLogStats.RetryStartTime", 0)
-                errorMsg = "INFO Retry operation completed"
-                print(errorMsg)
-                LogMsg(errorMsg,statsLogFileName, True)
-                sys.exit(0)
+
+    ### worker processes have the spec read before, they are started again after spec is updated
+    JAStopLogFileWorkers()
+
+    JAStatsSpec = tempStatsSpec
+    tempLogFilePrefilter = {}
+    tempLogFileByteMode = {}
+    for logFileName in JAStatsSpec:
+        tempLogFilePrefilter[logFileName], tempLogFileByteMode[logFileName] = JABuildLogFilePrefilter( logFileName, JAStatsSpec[logFileName])
+    logFilePrefilter = tempLogFilePrefilter
+    logFileByteMode = tempLogFileByteMode
+
+    ### commands already executed are executed again after IntervalInSec
+    for key, commandSpec in tempExecuteCommandSpec.items():
+        if key in JAExecuteCommandSpec and JAExecuteCommandSpec[key].get(indexForLastExecutionTime) != None:
+            commandSpec[indexForLastExecutionTime] = JAExecuteCommandSpec[key][indexForLastExecutionTime]
+    JAExecuteCommandSpec = tempExecuteCommandSpec
+
+    ### stats of current interval are already posted, stats of keys are gathered per new spec from now on
+    ###   stats in windows open are posted when the window is closed, lines after this are counted in window selected again
+    keys = set()
+    for keySpecs in JAStatsSpec.values():
+        for key, keySpec in keySpecs.items():
+            keys.add(key)
+            logStats[key] = JAServiceStats(keySpec)
+            if key not in logLines:
+                logLines[key] = []
+            if key not in logTraces:
+                logTraces[key] = []
+    for key in list(logStats.keys()):
+        if key not in keys:
+            del logStats[key]
+            logLines.pop(key, None)
+            logTraces.pop(key, None)
+    for logFileName in list(logStatsCurrentWindow.keys()):
+        logStatsCurrentWindow[logFileName] = None
+    ### trace blocks of keys removed are not ended anymore
+    for blockKey in list(traceBlockStartTime.keys()):
+        if blockKey[1] not in keys:
+            JAEvictTraceBlock( blockKey, 'reload' )
+    ### lines of log files removed are not processed anymore
+    for logFileName in list(logFilePendingRanges.keys()):
+        if logFileName not in JAStatsSpec:
+            del logFilePendingRanges[logFileName]
+
+    JAStartLogFileWorkers()
+
+    if logFileWatcher != None:
+        logFileWatcher.close()
+        logFileWatcher = JALogFileWatcher( sorted(JAStatsSpec.keys()) )
+
+    errorMsg = 'INFO - JAReloadConfig() reloaded configFile:{0}, log files:{1}, keys:{2}, commands:{3}'.format(
+        configFile, len(JAStatsSpec), len(keys), len(JAExecuteCommandSpec))
+    print(errorMsg)
+    LogMsg(errorMsg, statsLogFileName, True)
+    return True
+
+JADeleteOldLogFiles()
+
+JAStartRetryLogStatsPost( programStartTime )
+### in daemon mode, retry is started every hour
+retryStartTime = programStartTime
+### in daemon mode, file names posted to web server and old log files are handled when date changes
+currentDate = JAGlobalLib.UTCDateForFileName()
 
 # first time, sleep for dataPostIntervalInSec so that log file can be processed and posted after waking up
 sleepTimeInSec = dataPostIntervalInSec
 
-# initially, enable log stats gathering.
-# disable this if CPU usage average exceeds the threshold level set
+# enable log stats gathering, log files are deferred by CPU governor when CPU usage exceeds the threshold level set
 JAGatherLogStatsEnabled = True
 
+### take first sample of host CPU usage and CPU seconds used so far, governor uses the usage since then
+### CPU seconds used in startup are not counted in budget
+JAGetHostCPUUsage()
+agentCPUSecondsPrev = JAGetAgentCPUSeconds()
+cpuSecondsAvailable = maxCPUSecondsPerInterval
+
 # take current time, it will be used to find files modified since this time for next round
 logFileProcessingStartTime = time.time()
 
 #### execute commands so that any log file created by these are also available to open
 JAProcessCommands( logFileProcessingStartTime, debugLevel)
 
+# start worker processes if log files are to be processed in parallel
+JAStartLogFileWorkers()
+
 # open all log files, position the file pointer to the end of the file
 # this is to avoid counting transactions outside one minute window and showing higher tps than actual
-for logFileName in sorted(JAStatsSpec.keys()):
-    ### pass 0 for start time reference so that only latest file is picked for processing
-    ### pass False for JAGatherLogStatsEnabled so that file pointers are moved to end of file
-    JAProcessLogFile(logFileName, 0, logFileProcessingStartTime,
-                        False, debugLevel)
+### pass 0 for start time reference so that only latest file is picked for processing
+### pass False for JAGatherLogStatsEnabled so that file pointers are moved to end of file
+JAProcessLogFiles( sorted(JAStatsSpec.keys()), 0, logFileProcessingStartTime, False )
 elapsedTimeInSec = 0
+
+# when watching log files, process changes in log files as they happen in between stats posting
+logFileWatcher = None
+if watchLogFiles == True:
+    logFileWatcher = JALogFileWatcher( sorted(JAStatsSpec.keys()) )
+
 # until the end time, keep checking the log file for presence of patterns
 # and post the stats per post interval
-while loopStartTimeInSec <= statsEndTimeInSec:
+while daemonMode == True or loopStartTimeInSec <= statsEndTimeInSec:
     if debugLevel > 0:
         try:
             if sys.version_info.major >= 3 and sys.version_info.minor >= 3:
@@ -3325,7 +5834,11 @@ while loopStartTimeInSec <= statsEndTimeInSec:
         print('DEBUG-1 log file(s) processing time: {0}, elapsedTimeInSec:{1}, Sleeping for: {2} sec'.format(
             myProcessingTime, elapsedTimeInSec, sleepTimeInSec))
 
-    time.sleep(sleepTimeInSec)
+    if logFileWatcher != None and logFileWatcher.enabled == True:
+        # process log files as they change till sleep time elapses, stats are posted after that
+        JAWatchLogFiles( sleepTimeInSec )
+    else:
+        time.sleep(sleepTimeInSec)
 
     # take current time, it will be used to find files modified since this time for next round
     logFileProcessingStartTime = time.time()
@@ -3333,30 +5846,47 @@ while loopStartTimeInSec <= statsEndTimeInSec:
     ### for each loop, reset the value
     logEventPriorityLevel = maxCPUUsageLevels
 
-    averageCPUUsage = JAGlobalLib.JAGetAverageCPUUsage()
-    if averageCPUUsage > maxCPUUsageForEvents[0]:
-        JAGatherLogStatsEnabled = False
-        logEventPriorityLevel = 0
+    ### sample CPU usage, defer keys of lower priority when CPU usage is high or CPU budget is used up
+    JAUpdateCPUGovernor()
 
     #### execute commands so that any log file created by these are also available to open
     if JAGatherLogStatsEnabled == True:
         JAProcessCommands( logFileProcessingStartTime, debugLevel)
 
     # gather log stats for all logs
-    for logFileName in sorted(JAStatsSpec.keys()):
-        JAProcessLogFile(logFileName, loopStartTimeInSec, logFileProcessingStartTime,
-                         JAGatherLogStatsEnabled, debugLevel)
-
-    # post the data to web server if the gathering is enabled.
-    if JAGatherLogStatsEnabled == True:
-        # post collected stats to Web Server
-        JAPostAllDataToWebServer()
-    else:
-        errorMsg = "WARN  Current CPU Usage: {0} is above max CPU usage level specified: {1}, Skipped gathering Log stats".format(
-            averageCPUUsage, maxCPUUsageForEvents)
+    JAProcessLogFiles( sorted(JAStatsSpec.keys()), loopStartTimeInSec, logFileProcessingStartTime,
+                       JAGatherLogStatsEnabled )
+
+    # post collected stats to Web Server, even when all keys are deferred, stats gathered while watching
+    #   log files during sleep belong to this interval, posting them next round would double the rates
+    JAPostAllDataToWebServer()
+    if allowedPriorityLevel == 0:
+        errorMsg = "WARN  Current CPU Usage: {0:.1f} is above max CPU usage level specified: {1} or CPU budget is used up, CPU seconds available:{2:.3f}, deferred gathering Log stats".format(
+            averageCPUUsage, maxCPUUsageForEvents, cpuSecondsAvailable)
         print(errorMsg)
         LogMsg(errorMsg, statsLogFileName, True)
 
+    # save file info every round so that next run can resume from current position even if this run is terminated
+    JAWriteFileInfo()
+
+    if reloadConfigRequested == True:
+        JAReloadConfig()
+
+    if daemonMode == True:
+        ### keep the start time current so that instance started from crontab waits for this instance to end
+        JAGlobalLib.JAWriteTimeStamp("JAGatherLogStats.PrevStartTime")
+
+        if currentDate != JAGlobalLib.UTCDateForFileName():
+            currentDate = JAGlobalLib.UTCDateForFileName()
+            logStatsToPost['fileName'] = thisHostName + ".LogStats." + currentDate
+            logLinesToPost['fileName'] = thisHostName + ".LogLines." + currentDate
+            logTracesToPost['fileName'] = thisHostName + ".LogLines." + currentDate
+            JADeleteOldLogFiles()
+
+        if time.time() - retryStartTime >= 3600:
+            retryStartTime = time.time()
+            JAStartRetryLogStatsPost( retryStartTime )
+
     # if elapsed time is less than post interval, sleep till post interval elapses
     currentTime = time.time()
     elapsedTimeInSec = currentTime - logFileProcessingStartTime
@@ -3369,8 +5899,11 @@ while loopStartTimeInSec <= statsEndTimeInSec:
     loopStartTimeInSec = logFileProcessingStartTime
 
 
+# post stats of windows still open before exiting
+JAPostOpenLogStatsWindows()
+
 # Save file info to be used next round
-# JAWriteFileInfo()
+JAWriteFileInfo()
 
 ### close fileNameRetryStatsPost
 if retryLogStatsFileHandleCurrent != None :
@@ -115,6 +115,16 @@ JAToTimeString =  None
 ### used to derive the sar data file name based on today's date
 JADayOfMonth = None
 
+### run till terminated instead of exiting after DataCollectDurationInSec
+daemonMode = None
+
+### when True, health of this program is posted as JAAgent series every DataPostIntervalInSec
+postAgentStats = None
+### [post count, total seconds, max seconds] of posts to web server since last JAAgent post
+agentPostLatency = [0, 0, 0]
+### CPU seconds used by this program till last JAAgent post
+agentCPUSecondsPrev = 0
+
 ### cache file name
 JAGatherOSStatsCache = "JAGatherOSStats.cache"
 
@@ -185,15 +195,28 @@ def JASignalHandler(sig, frame):
 
 signal.signal(signal.SIGINT, JASignalHandler)
 
+### set upon SIGHUP, config file is reloaded after current round of stats collection
+reloadConfigRequested = False
+
+def JAReloadSignalHandler(sig, frame):
+    global reloadConfigRequested
+    reloadConfigRequested = True
 
-def JAOSStatsExit(reason):
+if hasattr(signal, 'SIGHUP'):
+    signal.signal(signal.SIGHUP, JAReloadSignalHandler)
+
+
+def JAOSStatsExit(reason, resetPrevStartTime=True):
     print(reason)
     JAOSStatsEndTime = datetime.datetime.now()
     JAOSStatsDuration = JAOSStatsEndTime - JAOSStatsStartTime
     JAOSStatsDurationInSec = JAOSStatsDuration.total_seconds()
     JAGlobalLib.LogMsg('{0}, processing duration:{1} sec\n'.format(reason,JAOSStatsDurationInSec ), JAOSStatsLogFileName, True)
     ### write prev start time of 0 so that next time process will run
-    JAGlobalLib.JAWriteTimeStamp("JAGatherOSStats.PrevStartTime", 0)
+    ###   not done when exiting because another instance is running, in DaemonMode, that instance
+    ###   refreshes the time stamp once per interval and next instance started by cron needs to see it
+    if resetPrevStartTime == True:
+        JAGlobalLib.JAWriteTimeStamp("JAGatherOSStats.PrevStartTime", 0)
     sys.exit()
 
 
@@ -263,7 +286,7 @@ def JAGatherEnvironmentSpecs( key, values ):
     global dataPostIntervalInSec, dataCollectDurationInSec
     global webServerURL, disableWarnings, verifyCertificate
     global DBDetails, retryDurationInHours, retryOSStatsBatchSize
-    global debugLevel
+    global debugLevel, daemonMode, postAgentStats
 
     for myKey, myValue in values.items():
         if debugLevel > 1 :
@@ -318,6 +341,22 @@ def JAGatherEnvironmentSpecs( key, values ):
                 if myValue != None:
                     debugLevel = int(myValue)
 
+        elif myKey == 'DaemonMode':
+            if daemonMode == None:
+                if myValue != None:
+                    if myValue == 'False' or myValue == False:
+                        daemonMode = False
+                    if myValue == 'True' or myValue == True:
+                        daemonMode = True
+
+        elif myKey == 'PostAgentStats':
+            if postAgentStats == None:
+                if myValue != None:
+                    if myValue == 'False' or myValue == False:
+                        postAgentStats = False
+                    if myValue == 'True' or myValue == True:
+                        postAgentStats = True
+
         elif myKey == 'RetryDurationInHours':
             if retryDurationInHours == None:
                 if myValue != None:
@@ -371,6 +410,7 @@ def JAPostDataToWebServer(tempOSStatsToPost, useRequests, storeUponFailure):
         print('DEBUG-2 JAPostDataToWebServer() tempOSStatsToPost: {0}'.format(tempOSStatsToPost))
     if debugLevel > 0:
         print('DEBUG-1 JAPostDataToWebServer() size of tempOSStatsToPost: {0}'.format(len(tempOSStatsToPost)))
+    postStartTime = time.time()
     if useRequests == True:
         try:
             # post interval elapsed, post the data to web server
@@ -414,12 +454,24 @@ def JAPostDataToWebServer(tempOSStatsToPost, useRequests, storeUponFailure):
         else:
             OSStatsPostSuccess = False
 
+    ### time taken to post, posted in JAAgent series
+    postLatency = time.time() - postStartTime
+    agentPostLatency[0] += 1
+    agentPostLatency[1] += postLatency
+    if postLatency > agentPostLatency[2]:
+        agentPostLatency[2] = postLatency
     
     if OSStatsPostSuccess == False:
         print(resultText)
         if resultLength > 1 :
             JAGlobalLib.LogMsg(resultText[resultLength-1], JAOSStatsLogFileName, True)
-        if retryOSStatsFileHandleCurrent != None and storeUponFailure == True:
+        if retryDurationInHours > 0 and storeUponFailure == True:
+            ### retry stats are kept in daily file, switch to new file when date changes
+            if fileNameRetryStatsPost != retryOSStatsFileNamePartial + JAGlobalLib.UTCDateForFileName():
+                fileNameRetryStatsPost = retryOSStatsFileNamePartial + JAGlobalLib.UTCDateForFileName()
+                if retryOSStatsFileHandleCurrent != None :
+                    retryOSStatsFileHandleCurrent.close()
+                    retryOSStatsFileHandleCurrent = None
             if retryOSStatsFileHandleCurrent == None :
                 try:
                     retryOSStatsFileHandleCurrent = open( fileNameRetryStatsPost,"a")
@@ -447,6 +499,32 @@ def JAPostDataToWebServer(tempOSStatsToPost, useRequests, storeUponFailure):
         print("INFO JAPostDataToWebServer() posted data to web server successfully")
     return OSStatsPostSuccess
 
+def JAGetAgentStats():
+    """
+    This function returns health of this program in the form 'timeStamp=<timeStamp>,JAAgent_<name>=<value>,...'
+      post latency to web server, retry queue depth, memory RSS and CPU seconds used since last call
+    """
+    global agentCPUSecondsPrev
+    currentTime = time.time()
+    tempStatsParts = [ 'timeStamp=' + JAGlobalLib.UTCDateTime() ]
+    if agentPostLatency[0] > 0:
+        tempStatsParts.append( ',JAAgent_statsPostLatencyMSec_average={0:.2f},JAAgent_statsPostLatencyMSec_max={1:.2f}'.format(
+            agentPostLatency[1] * 1000 / agentPostLatency[0], agentPostLatency[2] * 1000 ) )
+        agentPostLatency[0] = agentPostLatency[1] = agentPostLatency[2] = 0
+
+    if retryDurationInHours > 0:
+        retryQueueRecords, retryQueueBytes = JAGlobalLib.JAGetRetryQueueDepth(
+            retryOSStatsFileNamePartial, currentTime - retryDurationInHours * 3600, debugLevel, thisHostName, OSType )
+        tempStatsParts.append( ',JAAgent_retryQueueRecords={0},JAAgent_retryQueueBytes={1}'.format( retryQueueRecords, retryQueueBytes ) )
+
+    ### children times include sar and other commands run to gather stats
+    tempTimes = os.times()
+    agentCPUSeconds = tempTimes[0] + tempTimes[1] + tempTimes[2] + tempTimes[3]
+    tempStatsParts.append( ',JAAgent_memoryRSS={0},JAAgent_cpuSeconds={1:.3f}'.format(
+        JAGlobalLib.JAGetProcessRSS(), agentCPUSeconds - agentCPUSecondsPrev ) )
+    agentCPUSecondsPrev = agentCPUSeconds
+    return ''.join( tempStatsParts )
+
 def JARetryOSStatsPost(currentTime):
     """
     This function tries to send the retryOSStats to web server
@@ -523,133 +601,157 @@ else:
     psutilModulePresent = False
 
 
-## read default parameters and OS Stats collection spec
-try:
+"""
+JAReadConfigFile()
+Read config file using yaml module if present, else using limited yaml reader
+Returns content of config file in dictionary form
+"""
+def JAReadConfigFile():
     with open(configFile, "r") as file:
 
         ### use limited yaml reader when yaml is not available
         if yamlModulePresent == True:
             try:
                 import yaml
-                JAOSStats = yaml.load(file, Loader=yaml.FullLoader)
+                tempOSStats = yaml.load(file, Loader=yaml.FullLoader)
                 file.close()
             except:
-                JAOSStats = JAGlobalLib.JAYamlLoad( configFile )
+                tempOSStats = JAGlobalLib.JAYamlLoad( configFile )
         else:
-            JAOSStats = JAGlobalLib.JAYamlLoad( configFile )
-        if debugLevel > 1 :
-            print('DEBUG-2 Content of config file: {0}, read to JAStats: {1}'.format(configFile, JAOSStats))
-
+            tempOSStats = JAGlobalLib.JAYamlLoad( configFile )
+    if debugLevel > 1 :
+        print('DEBUG-2 Content of config file: {0}, read to JAStats: {1}'.format(configFile, tempOSStats))
+    return tempOSStats
 
-        if JAOSStatsLogFileName == None:
-            if JAOSStats['LogFileName'] != None:
-                JAOSStatsLogFileName = JAOSStats['LogFileName']
+"""
+JAGatherOSStatsSpecs( osStatsSpecs )
+Parse the spec of each stat type in OSStats section of config file
+Returns { statType: [ fields, fsNames, processOwnerNamesList, processNamesToExcludeList ] }
+"""
+def JAGatherOSStatsSpecs( osStatsSpecs ):
+    tempOSStatsSpec = {}
+    for key, value in osStatsSpecs.items():
+        processOwnerNamesList = []
+        processNamesToExcludeList = []
+        if value.get('Name') != None:
+            statType = value.get('Name')
+
+        if value.get( 'Fields' ) != None:
+            fields =  value.get( 'Fields')
+
+        fsNames = ''
+        if statType == 'filesystem' :
+            if value.get('FileSystemNames') != None:
+                ### file system names will be in CSV format
+                fsNames = value.get('FileSystemNames')
+
+        elif statType == 'process' :
+
+            if value.get('ProcessNames') != None:
+                ### process names will be in CSV format
+                fsNames = value.get('ProcessNames')
+
+            if value.get('ProcessOwnerNames') != None:
+                ### owner names will be in CSV format
+                tempProcessOwnerNames = value.get('ProcessOwnerNames')
             else:
-                JAOSStatsLogFileName = 'JAGatherOSStats.log'
-
-        if JASysStatFilePathName == None:
-            if JAOSStats['SysStatPathName'] != None:
-                JASysStatFilePathName = '{0}'.format(JAOSStats['SysStatPathName'])
-                ### replace any space
-                JASysStatFilePathName = re.sub('\s','', JASysStatFilePathName)
-
-                if JASysStatFilePathName != '':
-                    ### if path does not end with '/', add it.
-                    if JASysStatFilePathName.endswith('/') != True :
-                        JASysStatFilePathName = JASysStatFilePathName + '/'
-
-            if JASysStatFilePathName == None or JASysStatFilePathName == '': 
-                ### for redhat linux and ubuntu, use default path for sar
-                if OSType == 'Linux' :
-                    if OSName == 'rhel' :
-                        JASysStatFilePathName = '/var/log/sa/'
-                    elif OSName == 'ubuntu' :
-                        JASysStatFilePathName = '/var/log/sysstat/'
-
-            ### if the directory or path does not exist, make the name empty
-            if os.path.exists( JASysStatFilePathName) == False:
-                JASysStatFilePathName = None
-
-        for key, value in JAOSStats['Environment'].items():
-            if key == 'All':
-                ### if parameters are not yet defined, read the values from this section
-                ###  values in this section work as default if params are defined for
-                ###  specific environment
-                JAGatherEnvironmentSpecs( key, value )
-            if value.get('HostName') != None:
-                if re.match( value['HostName'], thisHostName):
-                    ### current hostname match the hostname specified for this environment
-                    ###  read all parameters defined for this environment
-                    JAGatherEnvironmentSpecs( key, value )
-                    myEnvironment = key
-
-        for key, value in JAOSStats['OSStats'].items():
-            processOwnerNamesList = []
-            processNamesToExcludeList = []
-            if value.get('Name') != None:
-                statType = value.get('Name')
-
-            if value.get( 'Fields' ) != None:
-                fields =  value.get( 'Fields')
-
-            fsNames = ''
-            if statType == 'filesystem' :
-                if value.get('FileSystemNames') != None:
-                    ### file system names will be in CSV format
-                    fsNames = value.get('FileSystemNames')
-
-            elif statType == 'process' :
-
-                if value.get('ProcessNames') != None:
-                    ### process names will be in CSV format
-                    fsNames = value.get('ProcessNames')
-
-                if value.get('ProcessOwnerNames') != None:
-                    ### owner names will be in CSV format
-                    tempProcessOwnerNames = value.get('ProcessOwnerNames')
+                ### by default, include processes of current user and other standard process possibilities
+                if OSType == 'Windows':
+                    tempProcessOwnerNames = "$USERNAME,oracle,mariadba"
                 else:
-                    ### by default, include processes of current user and other standard process possibilities
-                    if OSType == 'Windows':
-                        tempProcessOwnerNames = "$USERNAME,oracle,mariadba"
-                    else:
-                        tempProcessOwnerNames = "$USER,oracle,mariadba"
-                tempProcessOwnerNamesList = tempProcessOwnerNames.split(',')                
-                for tempOwnerName in tempProcessOwnerNamesList:
-                    ### if parameter has leading $, it is environment variable,
-                    ###    xlate to get the real user name and append to the username regular expression string
-                    try:
-                        if ( tempOwnerName[0] == '$'):
-                            try:
-                                if ( os.environ[tempOwnerName[1:]] != None):
-                                    tempOwnerName = os.environ[tempOwnerName[1:]]
-                            except :
-                                errorMsg = 'ERROR Not able to xlate the username:{0}'.format(tempOwnerName)
-                                JAGlobalLib.LogMsg(errorMsg, JAOSStatsLogFileName, True)
-                                print(errorMsg)
-                                continue
-                                    
-                        processOwnerNamesList.append(tempOwnerName)                            
-                    except OSError as err:
-                        errorMsg = 'ERROR Not able to xlate the username:{0}'.format(tempOwnerName)
-                        JAGlobalLib.LogMsg(errorMsg, JAOSStatsLogFileName, True)
-                        print(errorMsg)
-                        continue
-                if value.get('ProcessNamesToExclude') != None:
-                    ### process names will be in CSV format
-                    tempProcessNamesToExclude = value.get('ProcessNamesToExclude')
-                    ### prepare a process list
-                    tempProcessNamesToExcludeList = tempProcessNamesToExclude.split(',')
-                    for tempProcessName in tempProcessNamesToExcludeList:
-                        processNamesToExcludeList.append(tempProcessName)
+                    tempProcessOwnerNames = "$USER,oracle,mariadba"
+            tempProcessOwnerNamesList = tempProcessOwnerNames.split(',')                
+            for tempOwnerName in tempProcessOwnerNamesList:
+                ### if parameter has leading $, it is environment variable,
+                ###    xlate to get the real user name and append to the username regular expression string
+                try:
+                    if ( tempOwnerName[0] == '$'):
+                        try:
+                            if ( os.environ[tempOwnerName[1:]] != None):
+                                tempOwnerName = os.environ[tempOwnerName[1:]]
+                        except :
+                            errorMsg = 'ERROR Not able to xlate the username:{0}'.format(tempOwnerName)
+                            JAGlobalLib.LogMsg(errorMsg, JAOSStatsLogFileName, True)
+                            print(errorMsg)
+                            continue
 
-            JAOSStatsSpec[statType] = [ fields, fsNames, processOwnerNamesList, processNamesToExcludeList ]
+                    processOwnerNamesList.append(tempOwnerName)                            
+                except OSError as err:
+                    errorMsg = 'ERROR Not able to xlate the username:{0}'.format(tempOwnerName)
+                    JAGlobalLib.LogMsg(errorMsg, JAOSStatsLogFileName, True)
+                    print(errorMsg)
+                    continue
+            if value.get('ProcessNamesToExclude') != None:
+                ### process names will be in CSV format
+                tempProcessNamesToExclude = value.get('ProcessNamesToExclude')
+                ### prepare a process list
+                tempProcessNamesToExcludeList = tempProcessNamesToExclude.split(',')
+                for tempProcessName in tempProcessNamesToExcludeList:
+                    processNamesToExcludeList.append(tempProcessName)
 
-            if debugLevel > 1:
-                print('DEBUG-2 key: {0}, OSStatType: {1}, fields: {2}, fsNames: {3}'.format(key, statType, fields, fsNames ) )
+        tempOSStatsSpec[statType] = [ fields, fsNames, processOwnerNamesList, processNamesToExcludeList ]
+
+        if debugLevel > 1:
+            print('DEBUG-2 key: {0}, OSStatType: {1}, fields: {2}, fsNames: {3}'.format(key, statType, fields, fsNames ) )
+
+    return tempOSStatsSpec
+
+## read default parameters and OS Stats collection spec
+try:
+    JAOSStats = JAReadConfigFile()
+
+    if JAOSStatsLogFileName == None:
+        if JAOSStats['LogFileName'] != None:
+            JAOSStatsLogFileName = JAOSStats['LogFileName']
+        else:
+            JAOSStatsLogFileName = 'JAGatherOSStats.log'
+
+    if JASysStatFilePathName == None:
+        if JAOSStats['SysStatPathName'] != None:
+            JASysStatFilePathName = '{0}'.format(JAOSStats['SysStatPathName'])
+            ### replace any space
+            JASysStatFilePathName = re.sub('\s','', JASysStatFilePathName)
+
+            if JASysStatFilePathName != '':
+                ### if path does not end with '/', add it.
+                if JASysStatFilePathName.endswith('/') != True :
+                    JASysStatFilePathName = JASysStatFilePathName + '/'
+
+        if JASysStatFilePathName == None or JASysStatFilePathName == '': 
+            ### for redhat linux and ubuntu, use default path for sar
+            if OSType == 'Linux' :
+                if OSName == 'rhel' :
+                    JASysStatFilePathName = '/var/log/sa/'
+                elif OSName == 'ubuntu' :
+                    JASysStatFilePathName = '/var/log/sysstat/'
+
+        ### if the directory or path does not exist, make the name empty
+        if os.path.exists( JASysStatFilePathName) == False:
+            JASysStatFilePathName = None
+
+    for key, value in JAOSStats['Environment'].items():
+        if key == 'All':
+            ### if parameters are not yet defined, read the values from this section
+            ###  values in this section work as default if params are defined for
+            ###  specific environment
+            JAGatherEnvironmentSpecs( key, value )
+        if value.get('HostName') != None:
+            if re.match( value['HostName'], thisHostName):
+                ### current hostname match the hostname specified for this environment
+                ###  read all parameters defined for this environment
+                JAGatherEnvironmentSpecs( key, value )
+                myEnvironment = key
+
+    JAOSStatsSpec = JAGatherOSStatsSpecs( JAOSStats['OSStats'] )
 
 except OSError as err:
     JAOSStatsExit('ERROR - Can not open configFile:|{0}|, OS error: {1}\n'.format(configFile,err)) 
 
+if daemonMode == None:
+    daemonMode = False
+if postAgentStats == None:
+    postAgentStats = True
+
 print('INFO  - Parameters after reading configFile:{0}, webServerURL:{1}, dataPostIntervalInSec:{2}, dataCollectDurationInSec:{3}, sysstatPathName: {4}, debugLevel: {5}\n'.format(configFile, webServerURL, dataPostIntervalInSec, dataCollectDurationInSec, JASysStatFilePathName, debugLevel))
 if debugLevel > 0:
     for key, spec in JAOSStatsSpec.items():
@@ -731,7 +833,7 @@ while waitTime > 0:
         break
     
 if waitTime <= 0:
-    JAOSStatsExit('ERROR - another instance of this program is running, exceeded max wait time:{0}, exiting'.format(dataCollectDurationInSec * 2))
+    JAOSStatsExit('ERROR - another instance of this program is running, exceeded max wait time:{0}, exiting'.format(dataCollectDurationInSec * 2), False)
 
 ### Create a file with current time stamp
 JAGlobalLib.JAWriteTimeStamp("JAGatherOSStats.PrevStartTime")
@@ -744,21 +846,26 @@ if retryDurationInHours > 0:
     fileNameRetryStatsPost = retryOSStatsFileNamePartial + JAGlobalLib.UTCDateForFileName()
     retryOSStatsFileHandleCurrent = None
     
-### delete old log files
-if OSType == 'Windows':
-    ### TBD expand this later 
-    logFilesToDelete = None
+"""
+JADeleteOldLogFiles()
+Delete log files of this program older than 7 days
+"""
+def JADeleteOldLogFiles():
+    if OSType == 'Windows':
+        ### TBD expand this later 
+        logFilesToDelete = None
 
-else:
-    tempFileNameToDelete = '{0}*'.format(JAOSStatsLogFileName)
-    result =  subprocess.run(['find', '-name', tempFileNameToDelete, '-mtime', '+7'],stdout=subprocess.PIPE,stderr=subprocess.PIPE) 
-    logFilesToDelete = result.stdout.decode('utf-8').split('\n')
+    else:
+        tempFileNameToDelete = '{0}*'.format(JAOSStatsLogFileName)
+        result =  subprocess.run(['find', '-name', tempFileNameToDelete, '-mtime', '+7'],stdout=subprocess.PIPE,stderr=subprocess.PIPE) 
+        logFilesToDelete = result.stdout.decode('utf-8').split('\n')
 
-if logFilesToDelete != None:
-    for deleteFileName in logFilesToDelete:
-        if deleteFileName != '':
-            os.remove( deleteFileName)
+    if logFilesToDelete != None:
+        for deleteFileName in logFilesToDelete:
+            if deleteFileName != '':
+                os.remove( deleteFileName)
 
+JADeleteOldLogFiles()
 
 returnResult = ''
 OSStatsToPost = {}
@@ -782,39 +889,57 @@ if DBDetails['DBType'] == 'Influxdb' :
 else:
     storeUponFailure = False
 
-### process retryOSStats files if present with time stamp within retryDurationInHours
-if retryDurationInHours > 0 :
-    skipRetry = False 
-    ### read the last time this process was started, 
-    ###   if the time elapsed is less than 24 times dataCollectDurationInSec, 
-    ###   prev instance is still running, get out
-    prevStartTime = JAGlobalLib.JAReadTimeStamp( "JAGatherOSStats.RetryStartTime")
-    if prevStartTime > 0:
-        currentTime = time.time()
-        if ( prevStartTime + 24 * dataCollectDurationInSec) > currentTime:
-            errorMsg = 'INFO - Previous retry operation still in progress'
-            print(errorMsg)
-            JAGlobalLib.LogMsg(errorMsg, JAOSStatsLogFileName, True)
-            skipRetry = True
+"""
+JAStartRetryOSStatsPost( currentTime )
+Process retryOSStats files if present with time stamp within retryDurationInHours, in child process
+"""
+def JAStartRetryOSStatsPost( currentTime ):
+    ### clean up child process of prev retry operation if it is completed
+    if OSType != 'Windows':
+        try:
+            while os.waitpid(-1, os.WNOHANG)[0] > 0:
+                pass
+        except OSError:
+            pass
+
+    if retryDurationInHours > 0 :
+        skipRetry = False 
+        ### read the last time this process was started, 
+        ###   if the time elapsed is less than 24 times dataCollectDurationInSec, 
+        ###   prev instance is still running, get out
+        prevStartTime = JAGlobalLib.JAReadTimeStamp( "JAGatherOSStats.RetryStartTime")
+        if prevStartTime > 0:
+            currentTime = time.time()
+            if ( prevStartTime + 24 * dataCollectDurationInSec) > currentTime:
+                errorMsg = 'INFO - Previous retry operation still in progress'
+                print(errorMsg)
+                JAGlobalLib.LogMsg(errorMsg, JAOSStatsLogFileName, True)
+                skipRetry = True
 
-    if skipRetry == False:
-        ### Create a file with current time stamp
-        JAGlobalLib.JAWriteTimeStamp("JAGatherOSStats.RetryStartTime")
-        if OSType == 'Windows':
-            errorMsg = "ERROR RetryDurationInHours is not suppported on Windows, history data not sent to webserver automatically"
-            print(errorMsg)
-            JAGlobalLib.LogMsg(errorMsg, JAOSStatsLogFileName, True)
-            JAGlobalLib.JAWriteTimeStamp("JAGatherOSStats.RetryStartTime", 0)
-        else:
-            procId = os.fork()
-            if procId == 0:
-                ### child process
-                JARetryOSStatsPost(programStartTime)
-                JAGlobalLib.JAWriteTimeStamp("JAGatherOSStats.RetryStartTime", 0)
-                errorMsg = "INFO Retry operation completed"
+        if skipRetry == False:
+            ### Create a file with current time stamp
+            JAGlobalLib.JAWriteTimeStamp("JAGatherOSStats.RetryStartTime")
+            if OSType == 'Windows':
+                errorMsg = "ERROR RetryDurationInHours is not suppported on Windows, history data not sent to webserver automatically"
                 print(errorMsg)
                 JAGlobalLib.LogMsg(errorMsg, JAOSStatsLogFileName, True)
-                sys.exit(0)
+                JAGlobalLib.JAWriteTimeStamp("JAGatherOSStats.RetryStartTime", 0)
+            else:
+                procId = os.fork()
+                if procId == 0:
+                    ### child process
+                    JARetryOSStatsPost(currentTime)
+                    JAGlobalLib.JAWriteTimeStamp("JAGatherOSStats.RetryStartTime", 0)
+                    errorMsg = "INFO Retry operation completed"
+                    print(errorMsg)
+                    JAGlobalLib.LogMsg(errorMsg, JAOSStatsLogFileName, True)
+                    sys.exit(0)
+
+JAStartRetryOSStatsPost( programStartTime )
+### in daemon mode, retry is started every hour
+retryStartTime = programStartTime
+### in daemon mode, file name posted to web server and old log files are handled when date changes
+currentDate = JAGlobalLib.UTCDateForFileName()
 
 def JACheckProcessForStatCollection( tempCommand, tempOwnerName, tempProcessNames, processOwnerNamesList, processNamesToExcludeList):
     """
@@ -2394,9 +2519,51 @@ else:
     useRequests = False
 
 
+"""
+JAReloadConfig()
+Read config file again and apply the spec of OSStats section in this process
+Previous samples used to compute CPU usage and delta values of disk and network stats are retained
+Parameters of Environment section, log file name and sysstat path name are applied when this program is restarted
+"""
+def JAReloadConfig():
+    global JAOSStatsSpec, reloadConfigRequested
+    reloadConfigRequested = False
+    errorMsg = 'INFO - JAReloadConfig() reloading configFile:{0}'.format(configFile)
+    print(errorMsg)
+    JAGlobalLib.LogMsg(errorMsg, JAOSStatsLogFileName, True)
+    try:
+        tempOSStats = JAReadConfigFile()
+        tempOSStatsSpec = JAGatherOSStatsSpecs( tempOSStats['OSStats'] )
+        ### config file being edited or not in expected format
+        if len(tempOSStatsSpec) == 0:
+            raise ValueError('no stat type in OSStats section')
+    except Exception as err:
+        errorMsg = 'ERROR - JAReloadConfig() Can not read configFile:|{0}|, error:{1}, continuing with current spec'.format(configFile, err)
+        print(errorMsg)
+        JAGlobalLib.LogMsg(errorMsg, JAOSStatsLogFileName, True)
+        return False
+
+    for sectionName in ('Environment', 'LogFileName', 'SysStatPathName'):
+        if tempOSStats.get(sectionName) != JAOSStats.get(sectionName):
+            errorMsg = 'WARN  JAReloadConfig() {0} is changed in configFile:{1}, restart this program to apply it'.format(sectionName, configFile)
+            print(errorMsg)
+            JAGlobalLib.LogMsg(errorMsg, JAOSStatsLogFileName, True)
+
+    ### for stat types added, take first sample so that delta can be computed next time, like at startup
+    if 'disk_io_counters' in tempOSStatsSpec and 'disk_io_counters' not in JAOSStatsSpec:
+        JAGetDiskIOCounters('', False)
+    if 'net_io_counters' in tempOSStatsSpec and 'net_io_counters' not in JAOSStatsSpec:
+        JAGetNetworkIOCounters('', False)
+
+    JAOSStatsSpec = tempOSStatsSpec
+    errorMsg = 'INFO - JAReloadConfig() reloaded configFile:{0}, stat types:{1}'.format(configFile, sorted(JAOSStatsSpec.keys()))
+    print(errorMsg)
+    JAGlobalLib.LogMsg(errorMsg, JAOSStatsLogFileName, True)
+    return True
+
 ### until the end time, keep checking the log file for presence of patterns
 ###   and post the stats per post interval
-while loopStartTimeInSec  <= statsEndTimeInSec :
+while daemonMode == True or loopStartTimeInSec  <= statsEndTimeInSec :
   if debugLevel > 0:
     try:
         if sys.version_info.major >= 3 and sys.version_info.minor >= 3:
@@ -2521,6 +2688,9 @@ while loopStartTimeInSec  <= statsEndTimeInSec :
             ### copy constant data portion
             tempOSStatsToPost = OSStatsToPost.copy()
 
+  if postAgentStats == True:
+    tempOSStatsToPost['JAAgent'] = JAGetAgentStats()
+
   JAPostDataToWebServer(tempOSStatsToPost, useRequests, storeUponFailure)
     
   ### if elapsed time is less than post interval, sleep till post interval elapses
@@ -2535,6 +2705,22 @@ while loopStartTimeInSec  <= statsEndTimeInSec :
   ### take curren time so that processing will start from current time
   loopStartTimeInSec = logFileProcessingStartTime
 
+  if reloadConfigRequested == True:
+    JAReloadConfig()
+
+  if daemonMode == True:
+    ### keep the start time current so that instance started from crontab waits for this instance to end
+    JAGlobalLib.JAWriteTimeStamp("JAGatherOSStats.PrevStartTime")
+
+    if currentDate != JAGlobalLib.UTCDateForFileName():
+        currentDate = JAGlobalLib.UTCDateForFileName()
+        OSStatsToPost['fileName'] = thisHostName + ".OSStats." + currentDate
+        JADeleteOldLogFiles()
+
+    if time.time() - retryStartTime >= 3600:
+        retryStartTime = time.time()
+        JAStartRetryOSStatsPost( retryStartTime )
+
 ### close fileNameRetryStatsPost
 if retryOSStatsFileHandleCurrent != None :
     retryOSStatsFileHandleCurrent.close()
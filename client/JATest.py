@@ -15,6 +15,16 @@ Parameters passed are:
     simulationType - random, predefined (default)
     debugLevel - 0,1,2,3, default 0
 
+Benchmark mode, to catch performance regressions and compare engine options of JAGatherLogStats.py
+    -B sizeInMB - write corpus of this size per corpus type as fast as possible and exit, without sleeps.
+                  Corpus is the same for the same size, lines have timestamps starting from benchmarkStartTime
+                  - JATest.bench.single.log - stats, CSV and trace lines matching JATest.single.log* keys
+                  - JATest.bench.access.log - apache access lines matching /var/log/apache2/access.log* keys
+    -t corpusTypes - single,access (default)
+    -R          - run JAGatherLogStats.py -B on corpus of each type, using the keys of that log file in config file,
+                  report lines/sec, MB/sec, peak RSS and per stage timings
+    -c configFile - config file of JAGatherLogStats.py, default JAGatherLogStats.yml
+
 Author: havembha@gmail.com, 2021/08/01
 
 Note: python interpreter is not mentioned at the start of the script so that it can be run 
@@ -40,6 +50,10 @@ parser = argparse.ArgumentParser()
 parser.add_argument("-D", type=int, help="debug level 0 - None, 1,2,3-highest level")
 parser.add_argument("-d", type=int, help="duration in seconds")
 parser.add_argument("-s", help="simulation type, predefined (default), random")
+parser.add_argument("-B", type=int, help="benchmark, write corpus of this size in MB per corpus type and exit")
+parser.add_argument("-t", help="benchmark corpus types, single,access (default)")
+parser.add_argument("-R", action='store_true', help="run JAGatherLogStats.py benchmark on corpus")
+parser.add_argument("-c", help="config file of JAGatherLogStats.py for benchmark, default JAGatherLogStats.yml")
 
 args = parser.parse_args()
 if args.D:
@@ -56,6 +70,139 @@ def JATestExit(reason):
     print(reason)
     exit()
 
+### benchmark corpus file name and log file name in JAGatherLogStats.yml whose keys are applied to it, per corpus type
+benchmarkCorpus = {
+    'single': ['JATest.bench.single.log', 'JATest.single.log*'],
+    'access': ['JATest.bench.access.log', '/var/log/apache2/access.log*'] }
+### log time of first line in corpus, fixed so that corpus is the same every time
+benchmarkStartTime = datetime.datetime(2022, 12, 27, 0, 0, 0)
+### lines are written in blocks of this size
+benchmarkBlockSize = 4 * 1024 * 1024
+
+def JABenchmarkSingleLines( randomGen, timeStampPrefix, traceId ):
+    """
+    Returns lines of one second, and next traceId, in the form written by test loop below
+    """
+    lines = []
+    for count in range(50):
+        timeStamp = '{0}.{1:06d} '.format( timeStampPrefix, count * 20000 )
+        lines.append( timeStamp + 'TestMsg Pass\n' )
+        if count % 2 > 0:
+            value = randomGen.randint(1, 1000)
+            lines.append( timeStamp + 'TestMsg Fail\n' )
+            lines.append( timeStamp + 'leading text key1 {0} dummy1 key2 {1:.2f} dummy2\n'.format( value, value/2) )
+            lines.append( timeStamp + 'tps key1 {0} dummy1 total key2 {1:.2f} dummy2\n'.format( value, value/2) )
+            lines.append( timeStamp + 'Stats MicroService{0} total key1 {1} dummy1 total key2 {2:.2f} dummy2\n'.format(
+                randomGen.choice(('1', '25', '26', '27')), value, value/2) )
+            lines.append( timeStamp + 'Stats client{0} total key1 {1} dummy1 total key2 {2:.2f} key3 {3:.2f} dummy3\n'.format(
+                count % 3, value, 100 * (count % 3), value/2) )
+            lines.append( timeStamp + 'CSV,client{0},{1},{2:.2f},{3:.2f}\n'.format( count % 2, value + 30, value, (value + 30)/2) )
+            lines.append( timeStamp + 'ValuePair client1{0},key1={1},key2={2},key3={3}\n'.format( count % 3, value, value * 2, value * 3) )
+            lines.append( timeStamp + 'TraceId={0:016x} Service1 status={1} test trace line {2}\n'.format(
+                traceId, randomGen.choice((202, 202, 202, 404)), value) )
+            lines.append( timeStamp + 'TraceId={0:016x} Service2 account=1234 Name=JaaduVision test trace line {1}\n'.format( traceId, value) )
+            lines.append( timeStamp + 'Block1 Service3 test trace line\n' )
+            lines.append( ' 2nd line of block status=404\n 3rd line of block \n 4th line of block {0:016x}\n 5th line of block account=1234 Name=JaaduVision \n 6th line of block \n'.format(traceId) )
+            traceId += 1
+        elif count % 3 > 0:
+            lines.append( timeStamp + 'TestMsg Count\n' )
+    return ''.join(lines), traceId
+
+def JABenchmarkAccessLines( randomGen, timeStampPrefix ):
+    """
+    Returns apache access lines of one second
+    Random values of all lines are picked together, it is faster than picking them per line
+    """
+    numberOfLines = 200
+    paths = randomGen.choices(( '/grafana/api/dashboards/uid/{0}', '/grafana/public/build/app.{0}.js',
+        '/prometheus/api/v1/query?query=up&time={0}', '/cgi-bin/JASaveStats.py', '/JaaduVision/', '/index.html?id={0}' ), k=numberOfLines)
+    statusCodes = randomGen.choices((200, 304, 404, 500), weights=(6, 1, 1, 1), k=numberOfLines)
+    userAgents = randomGen.choices(( 'curl/7.74.0', 'python-requests/2.25.1',
+        'Mozilla/5.0 (X11; Linux x86_64) Gecko/20100101 Firefox/108.0' ), k=numberOfLines)
+    numbers = randomGen.choices( range(1, 100000), k=numberOfLines * 2)
+    lines = []
+    for count in range(numberOfLines):
+        path = paths[count]
+        lines.append( '192.168.{0}.{1} - - [{2} +0000] "{3} {4} HTTP/1.1" {5} {6} "-" "{7}"\n'.format(
+            numbers[count] % 3 + 1, numbers[count] % 254 + 1, timeStampPrefix,
+            'POST' if path == '/cgi-bin/JASaveStats.py' else 'GET', path.format( numbers[count] ),
+            statusCodes[count], numbers[count + numberOfLines] % 20000 + 200, userAgents[count] ) )
+    return ''.join(lines)
+
+def JAWriteBenchmarkCorpus( corpusType, fileName, sizeInBytes ):
+    """
+    Write lines of corpusType to fileName till sizeInBytes, one second of log time at a time
+    Returns number of bytes written
+    """
+    ### same seed so that corpus is the same every time
+    randomGen = Random(1)
+    logTime = benchmarkStartTime
+    oneSecond = datetime.timedelta(seconds=1)
+    traceId = 1
+    bytesWritten = 0
+    tempBlock = []
+    tempBlockSize = 0
+    with open( fileName, 'w') as file:
+        while bytesWritten + tempBlockSize < sizeInBytes:
+            if corpusType == 'single':
+                lines, traceId = JABenchmarkSingleLines( randomGen, logTime.strftime('%Y-%m-%dT%H:%M:%S'), traceId )
+            else:
+                lines = JABenchmarkAccessLines( randomGen, logTime.strftime('%d/%b/%Y:%H:%M:%S') )
+            logTime += oneSecond
+            tempBlock.append( lines )
+            tempBlockSize += len(lines)
+            if tempBlockSize >= benchmarkBlockSize:
+                file.write( ''.join(tempBlock) )
+                bytesWritten += tempBlockSize
+                tempBlock = []
+                tempBlockSize = 0
+        file.write( ''.join(tempBlock) )
+        bytesWritten += tempBlockSize
+    return bytesWritten
+
+def JARunBenchmark( corpusTypes, configFile ):
+    """
+    Run JAGatherLogStats.py -B for corpus of each type, print the results
+    """
+    import os, sys, subprocess
+    gatherLogStatsFileName = os.path.join( os.path.dirname( os.path.abspath(__file__) ), 'JAGatherLogStats.py')
+    for corpusType in corpusTypes:
+        fileName, logFileName = benchmarkCorpus[corpusType]
+        if os.path.exists( fileName ) == False:
+            print('ERROR benchmark corpus:{0} not present, create it using -B <sizeInMB>'.format(fileName))
+            continue
+        result = subprocess.run( [sys.executable, gatherLogStatsFileName, '-c', configFile, '-B', fileName, '-L', logFileName],
+                                 stdout=subprocess.PIPE, stderr=subprocess.STDOUT )
+        resultLines = result.stdout.decode('utf-8', 'replace').splitlines()
+        benchmarkResults = [ line for line in resultLines if 'JARunBenchmark()' in line ]
+        if result.returncode != 0 or len(benchmarkResults) == 0:
+            print('ERROR benchmark of corpus:{0} failed, returncode:{1}, output:{2}'.format( fileName, result.returncode, '\n'.join(resultLines[-20:]) ))
+            continue
+        print('INFO benchmark corpus:{0}, keys of logFileName:{1}'.format( fileName, logFileName))
+        for line in benchmarkResults:
+            print(line)
+
+if args.B or args.R:
+    from random import Random
+    if args.t:
+        corpusTypes = args.t.split(',')
+    else:
+        corpusTypes = ['single', 'access']
+    for corpusType in corpusTypes:
+        if corpusType not in benchmarkCorpus:
+            JATestExit('ERROR invalid corpus type:{0}, expected one of:{1}'.format( corpusType, ','.join(benchmarkCorpus.keys()) ))
+    if args.B:
+        for corpusType in corpusTypes:
+            fileName = benchmarkCorpus[corpusType][0]
+            corpusStartTime = time.time()
+            bytesWritten = JAWriteBenchmarkCorpus( corpusType, fileName, args.B * 1024 * 1024 )
+            elapsedTimeInSec = max( time.time() - corpusStartTime, 0.000001 )
+            print('INFO wrote benchmark corpus:{0}, bytes:{1}, elapsedTimeInSec:{2:.2f}, MB/sec:{3:.2f}'.format(
+                fileName, bytesWritten, elapsedTimeInSec, bytesWritten / 1048576 / elapsedTimeInSec))
+    if args.R:
+        JARunBenchmark( corpusTypes, args.c if args.c else 'JAGatherLogStats.yml' )
+    JATestExit('PASS benchmark')
+
 lastFileTime = startTimeInSec = time.time()
 # seed random number generator
 seed(1)